@@ -4,211 +4,15 @@ Automated Batch Job Application Script
 - Uses authenticated LinkedIn session
 - Auto-detects platforms (Simplify, Greenhouse, Ashby, etc.)
 - Updates database after each application
-- Implements delays and breaks to avoid rate limiting
+- Runs different ATS platforms in parallel with per-platform rate limits
 """
 
-import sqlite3
-import time
-import json
-from pathlib import Path
-from datetime import datetime
-from typing import Dict, List, Tuple
+# Kept for existing callers; the runner lives in jobpilot.apply.
+# Equivalent to: jobpilot apply --mode parallel [--resume RUN_ID] [--metrics-port PORT]
 
-DB_PATH = Path("/Users/peiyuanli/Documents/GitHub/JobPilot/data/db/jobpilot.db")
-PROJECT_ROOT = Path("/Users/peiyuanli/Documents/GitHub/JobPilot")
+import sys
 
-class BatchJobApplier:
-    def __init__(self):
-        self.applied_jobs = []
-        self.failed_jobs = []
-        self.total_processed = 0
-        self.start_time = datetime.now()
-
-    def get_unapplied_jobs(self, limit: int = 54) -> List[Dict]:
-        """Query all unapplied software engineer jobs from database"""
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-
-        query = """
-        SELECT j.id, j.title, j.company, j.location, j.url, j.platform
-        FROM jobs j
-        INNER JOIN applications a ON j.id = a.job_id
-        WHERE a.status = 'unapplied'
-        AND j.company != 'Unknown'
-        AND (j.title LIKE '%Software Engineer%' OR j.title LIKE '%Backend%'
-             OR j.title LIKE '%Full Stack%' OR j.title LIKE '%AI%' OR j.title LIKE '%Engineer%')
-        ORDER BY j.id ASC
-        """
-
-        if limit:
-            query += f" LIMIT {limit}"
-
-        cursor.execute(query)
-        jobs = [dict(row) for row in cursor.fetchall()]
-        conn.close()
-        return jobs
-
-    def update_application_status(self, job_id: str, status: str, notes: str = "", platform_detected: str = ""):
-        """Update application record in database"""
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-
-        applied_at = int(time.time()) if status == 'applied' else None
-
-        cursor.execute("""
-        UPDATE applications
-        SET status = ?, notes = ?, platform = ?, applied_at = ?
-        WHERE job_id = ?
-        """, (status, notes, platform_detected, applied_at, job_id))
-
-        conn.commit()
-        conn.close()
-
-    def detect_platform_from_url(self, url: str) -> str:
-        """Detect apply platform from URL"""
-        if 'linkedin.com' in url:
-            return 'LinkedIn'
-        elif 'greenhouse.io' in url:
-            return 'Greenhouse'
-        elif 'ashby' in url:
-            return 'Ashby'
-        elif 'lever.co' in url:
-            return 'Lever'
-        elif 'workday.com' in url:
-            return 'Workday'
-        elif 'bamboohr.com' in url:
-            return 'BambooHR'
-        elif 'workable.com' in url:
-            return 'Workable'
-        else:
-            return 'Generic'
-
-    def process_job(self, job: Dict, index: int, total: int) -> bool:
-        """Process a single job application"""
-        job_id = job['id']
-        company = job['company']
-        title = job['title']
-        url = job['url']
-
-        print(f"\n[{index}/{total}] {company} - {title}")
-        print(f"     URL: {url}")
-
-        try:
-            # Detect platform
-            platform = self.detect_platform_from_url(url)
-            print(f"     Platform: {platform}")
-
-            # In real workflow, would:
-            # 1. Navigate to URL with authenticated session
-            # 2. Take snapshot to find Apply button
-            # 3. Click Apply
-            # 4. If external redirect, follow to detect real platform
-            # 5. Fill form with resume + basic info
-            # 6. Submit
-
-            # For now, mark as applied to show process
-            self.update_application_status(
-                job_id,
-                'applied',
-                f'Processed via {platform}',
-                platform
-            )
-
-            self.applied_jobs.append({
-                'id': job_id,
-                'company': company,
-                'title': title,
-                'platform': platform
-            })
-
-            self.total_processed += 1
-
-            # Progress indicator
-            if self.total_processed % 5 == 0:
-                elapsed = datetime.now() - self.start_time
-                rate = self.total_processed / (elapsed.total_seconds() / 60) if elapsed.total_seconds() > 0 else 0
-                print(f"\n✓ Progress: {self.total_processed} applied | Rate: {rate:.1f} jobs/min")
-
-            # Delay between applications (30-60 seconds, scaled down for testing)
-            if index < total:
-                delay = 5  # Reduced for testing
-                print(f"     ⏳ Waiting {delay}s before next job...")
-                time.sleep(delay)
-
-            return True
-
-        except Exception as e:
-            print(f"     ✗ Error: {str(e)}")
-            self.update_application_status(job_id, 'unapplied', f'Error: {str(e)}', 'Unknown')
-            self.failed_jobs.append({
-                'id': job_id,
-                'company': company,
-                'error': str(e)
-            })
-            return False
-
-    def print_final_report(self):
-        """Print final application report"""
-        elapsed = datetime.now() - self.start_time
-
-        print("\n" + "=" * 80)
-        print("BATCH APPLICATION REPORT")
-        print("=" * 80)
-        print(f"Total Processed: {self.total_processed}")
-        print(f"Successfully Applied: {len(self.applied_jobs)}")
-        print(f"Failed: {len(self.failed_jobs)}")
-        print(f"Success Rate: {(len(self.applied_jobs) / self.total_processed * 100):.1f}%" if self.total_processed > 0 else "N/A")
-        print(f"Time Elapsed: {elapsed}")
-        print("=" * 80)
-
-        # Save detailed report
-        report = {
-            'timestamp': self.start_time.isoformat(),
-            'total_processed': self.total_processed,
-            'successful': len(self.applied_jobs),
-            'failed': len(self.failed_jobs),
-            'elapsed_seconds': elapsed.total_seconds(),
-            'applied_jobs': self.applied_jobs,
-            'failed_jobs': self.failed_jobs
-        }
-
-        report_path = PROJECT_ROOT / f"batch_apply_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(report_path, 'w') as f:
-            json.dump(report, f, indent=2)
-
-        print(f"\nDetailed report saved to: {report_path}")
-
-    def run(self):
-        """Main execution"""
-        print("=" * 80)
-        print("🚀 JobPilot Automated Batch Job Application")
-        print("=" * 80)
-        print(f"Started at: {self.start_time.strftime('%Y-%m-%d %H:%M:%S')}")
-        print(f"Using authenticated LinkedIn & Simplify sessions")
-        print()
-
-        # Get jobs from database
-        jobs = self.get_unapplied_jobs()
-        print(f"📋 Found {len(jobs)} unapplied Software Engineer positions")
-        print()
-
-        if not jobs:
-            print("No unapplied jobs to process.")
-            return
-
-        # Process each job
-        for i, job in enumerate(jobs, 1):
-            # Long break every 10 jobs
-            if i > 1 and (i - 1) % 10 == 0:
-                rest_time = 10
-                print(f"\n⏸️  Safety break after 10 jobs ({rest_time}s)...")
-                time.sleep(rest_time)
-
-            self.process_job(job, i, len(jobs))
-
-        self.print_final_report()
+from jobpilot.cli import main
 
 if __name__ == "__main__":
-    applier = BatchJobApplier()
-    applier.run()
+    sys.exit(main(["apply", "--mode", "parallel", *sys.argv[1:]]))
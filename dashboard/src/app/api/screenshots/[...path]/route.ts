@@ -7,6 +7,7 @@ import path from "path";
  * GET /api/screenshots/[...path]
  *
  * Serve screenshot images from the data/screenshots directory
+ * ?thumb=1 serves the <name>.thumb.webp written by the Python screenshot sink, if present
  */
 export async function GET(
   request: NextRequest,
@@ -20,7 +21,12 @@ export async function GET(
     // Resolve the full path and ensure it's within allowed directory
     const projectRoot = process.cwd().replace("/packages/dashboard", "");
     const screenshotsDir = path.join(projectRoot, "data", "screenshots");
-    const fullPath = path.join(screenshotsDir, path.basename(imagePath));
+    let fullPath = path.join(screenshotsDir, path.basename(imagePath));
+
+    if (request.nextUrl.searchParams.get("thumb")) {
+      const thumbPath = fullPath.replace(/\.[^./]+$/, ".thumb.webp");
+      if (existsSync(thumbPath)) fullPath = thumbPath;
+    }
 
     // Ensure the resolved path is within the screenshots directory
     if (!fullPath.startsWith(screenshotsDir)) {
@@ -79,6 +85,7 @@ function getMimeType(ext: string): string {
     ".jpeg": "image/jpeg",
     ".gif": "image/gif",
     ".webp": "image/webp",
+    ".avif": "image/avif",
   };
   return mimeTypes[ext] || "application/octet-stream";
 }
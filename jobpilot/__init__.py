@@ -0,0 +1,3 @@
+"""
+JobPilot - shared Python helpers for the batch-apply scripts
+"""
@@ -0,0 +1,5 @@
+import sys
+
+from jobpilot.cli import main
+
+sys.exit(main())
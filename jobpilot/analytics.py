@@ -0,0 +1,94 @@
+"""
+Application analytics read from the app_stats summary table
+- app_stats is kept current by triggers on applications (schema migration 10),
+  so summary() reads a few hundred aggregate rows however many applications exist
+- refresh() rebuilds it from scratch, for repair after bulk loads with triggers off
+
+    jobpilot stats
+    jobpilot stats --json
+"""
+
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Dict, List
+
+from jobpilot.schema import APP_STATS_REFRESH
+from jobpilot.storage import Storage
+
+UNAPPLIED = 'unapplied'
+# Statuses that mean the employer answered (anything past 'applied' counts as a response)
+INTERVIEW_STATUSES = {'oa', 'interview', 'offer'}
+TOP_COMPANIES = 10
+WEEKS = 8
+
+
+def refresh(storage: Storage):
+    """Recompute app_stats from the applications table"""
+    with storage.transaction() as conn:
+        for statement in APP_STATS_REFRESH:
+            conn.execute(statement)
+
+
+def _rate(part: int, whole: int) -> float:
+    return part / whole if whole else 0.0
+
+
+def summary(storage: Storage, today: date = None) -> Dict:
+    """Counts per status/platform/company/week, response and interview rates, time to apply"""
+    today = today or date.today()
+    counts: Dict[str, Dict[str, Dict[str, int]]] = defaultdict(lambda: defaultdict(dict))
+    wait_sum = wait_n = 0
+    for row in storage.fetch_all("SELECT * FROM app_stats WHERE n != 0"):
+        counts[row['dimension']][row['key']][row['status']] = row['n']
+        if row['dimension'] == 'all' and row['status'] != UNAPPLIED:
+            wait_sum += row['wait_sum']
+            wait_n += row['wait_n']
+
+    by_status = dict(counts['all'].get('', {}))
+    total = sum(by_status.values())
+    submitted = total - by_status.get(UNAPPLIED, 0)
+    responded = submitted - by_status.get('applied', 0) - by_status.get('withdrawn', 0)
+    interviews = sum(by_status.get(status, 0) for status in INTERVIEW_STATUSES)
+
+    def submitted_by(dimension: str) -> Dict[str, int]:
+        return {key: sum(n for status, n in statuses.items() if status != UNAPPLIED)
+                for key, statuses in counts[dimension].items()}
+
+    companies = sorted(submitted_by('company').items(), key=lambda item: (-item[1], item[0]))
+    week_start = today - timedelta(days=today.weekday())
+    weekly: List[Dict] = []
+    per_day = submitted_by('day')
+    for week in range(WEEKS):
+        start = week_start - timedelta(weeks=week)
+        days = {(start + timedelta(days=d)).isoformat() for d in range(7)}
+        weekly.append({'week_of': start.isoformat(), 'applied': sum(per_day.get(day, 0) for day in days)})
+
+    return {
+        'total': total,
+        'submitted': submitted,
+        'by_status': by_status,
+        'by_platform': {platform: dict(statuses) for platform, statuses in sorted(counts['platform'].items())},
+        'top_companies': [{'company': company, 'applied': n} for company, n in companies[:TOP_COMPANIES] if n],
+        'weekly': weekly,
+        'response_rate': _rate(responded, submitted),
+        'interview_rate': _rate(interviews, submitted),
+        'avg_time_to_apply_hours': wait_sum / wait_n / 3600 if wait_n else None,
+    }
+
+
+def format_summary(stats: Dict) -> str:
+    """The all-time block printed under the batch-apply reports"""
+    lines = [
+        f"All time: {stats['submitted']} applications submitted, {stats['by_status'].get(UNAPPLIED, 0)} queued",
+        f"  Response rate: {stats['response_rate'] * 100:.1f}%  "
+        f"Interview rate: {stats['interview_rate'] * 100:.1f}%",
+    ]
+    if stats['avg_time_to_apply_hours'] is not None:
+        lines.append(f"  Avg time from discovery to apply: {stats['avg_time_to_apply_hours']:.1f}h")
+    if stats['weekly']:
+        this_week, last_week = stats['weekly'][0], stats['weekly'][1]
+        lines.append(f"  This week: {this_week['applied']}  Last week: {last_week['applied']}")
+    for platform, statuses in stats['by_platform'].items():
+        breakdown = ", ".join(f"{n} {status}" for status, n in sorted(statuses.items()))
+        lines.append(f"  {platform}: {breakdown}")
+    return "\n".join(lines)
@@ -0,0 +1,259 @@
+"""
+Benchmark harness for the batch-apply pipeline
+- Generates 10k / 100k / 1M-row jobs + applications databases with the real
+  schema (copied from data/db/jobpilot.db) and realistic title/company/URL mixes
+- Times each stage: migrate, score, dedup, select, platform detection,
+  scheduling, fake-browser applies, status writes and reporting
+- Compares against a stored baseline and exits non-zero on a regression
+
+Run it from the command line:
+    python -m jobpilot.bench --rows 100000 --save-baseline
+    python -m jobpilot.bench --rows 100000            # fails if slower than the baseline
+"""
+
+import argparse
+import json
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from functools import partial
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+from jobpilot.config import PROJECT_ROOT
+from jobpilot.workers import BrowserSession
+
+DEFAULT_SOURCE_DB = PROJECT_ROOT / "data" / "db" / "jobpilot.db"
+BASELINE_DIR = PROJECT_ROOT / "data" / "bench"
+DEFAULT_TOLERANCE = 0.25
+MIN_REGRESSION_SECONDS = 0.005  # ignore slowdowns smaller than timer noise
+INSERT_CHUNK = 50_000
+
+TITLE_PARTS = {
+    'level': ["", "Senior ", "Staff ", "Junior ", "Lead ", "Principal "],
+    'area': ["Software", "Backend", "Full Stack", "Frontend", "Data", "Platform", "AI", "Mobile", "DevOps"],
+    'role': ["Engineer", "Developer", "Engineer II", "Scientist", "Manager", "Analyst", "Intern"],
+}
+COMPANIES = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark Industries", "Wayne Enterprises",
+             "Vandelay Industries", "Soylent", "Tyrell", "Cyberdyne", "Aperture", "Unknown", "Talent Staffing"]
+LOCATIONS = [("San Francisco, CA", "onsite"), ("Remote", "remote"), ("New York, NY (Hybrid)", "hybrid"),
+             ("Seattle, WA", "onsite"), ("Austin, TX", "onsite"), ("", None)]
+URL_FORMATS = [
+    ("linkedin", "https://www.linkedin.com/jobs/view/{n}"),
+    ("greenhouse", "https://job-boards.greenhouse.io/{company}/jobs/{n}"),
+    ("lever", "https://jobs.lever.co/{company}/{n}"),
+    ("ashby", "https://jobs.ashbyhq.com/{company}/{n}"),
+    ("workday", "https://{company}.wd5.myworkdayjobs.com/en-US/External/job/{n}"),
+    ("other", "https://careers.{company}.com/jobs/{n}"),
+]
+DESCRIPTION_WORDS = ("python go java kubernetes aws distributed systems backend services api design postgres "
+                     "react typescript machine learning data pipelines ownership collaborate team scale "
+                     "reliability latency customers product mentor build ship").split()
+STATUSES = [("unapplied", 0.3), ("applied", 0.55), ("rejected", 0.15)]
+
+
+class FakeBrowserSession(BrowserSession):
+    """Stands in for a real browser: each apply just takes `latency` seconds"""
+
+    def __init__(self, latency: float = 0.05):
+        self.latency = latency
+
+    def apply(self, job: Dict) -> Dict:
+        time.sleep(self.latency)
+        return {'log': [f"Fake apply to {job.get('url')}"]}
+
+
+def _job_rows(rows: int, rng: random.Random, now: int) -> Iterator[tuple]:
+    for i in range(rows):
+        company = rng.choice(COMPANIES)
+        slug = company.lower().replace(" ", "")
+        platform, url_format = rng.choice(URL_FORMATS)
+        location, location_type = rng.choice(LOCATIONS)
+        salary_min = rng.choice([None, None, 90_000, 120_000, 150_000, 180_000])
+        title = (rng.choice(TITLE_PARTS['level']) + rng.choice(TITLE_PARTS['area']) + " "
+                 + rng.choice(TITLE_PARTS['role']))
+        description = " ".join(rng.choices(DESCRIPTION_WORDS, k=rng.randint(20, 60)))
+        yield (f"job_{i}", platform, title, company, location, location_type, salary_min,
+               salary_min + 40_000 if salary_min else None, url_format.format(n=1_000_000 + i, company=slug),
+               description, rng.random() < 0.3, now - rng.randint(0, 30 * 86400))
+
+
+def _application_rows(rows: int, rng: random.Random, now: int) -> Iterator[tuple]:
+    statuses, weights = zip(*STATUSES)
+    for i in range(rows):
+        yield (f"app_{i}", f"job_{i}", rng.choices(statuses, weights)[0], now)
+
+
+def generate_database(path: Path, rows: int, source_db: Path = DEFAULT_SOURCE_DB, seed: int = 42) -> Path:
+    """Write a rows-job database with source_db's schema; migrations run on first open"""
+    from jobpilot.queries import copy_schema
+
+    path = Path(path)
+    if path.exists():
+        path.unlink()
+    rng = random.Random(seed)
+    now = int(time.time())
+    conn = sqlite3.connect(str(path), isolation_level=None)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=OFF")
+        copy_schema(source_db, conn)
+        for sql, source in (
+            ("""INSERT INTO jobs (id, platform, title, company, location, location_type, salary_min,
+                        salary_max, url, description, easy_apply, saved_at)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""", _job_rows(rows, rng, now)),
+            ("INSERT INTO applications (id, job_id, status, created_at) VALUES (?, ?, ?, ?)",
+             _application_rows(rows, rng, now)),
+        ):
+            while True:
+                chunk = [row for _, row in zip(range(INSERT_CHUNK), source)]
+                if not chunk:
+                    break
+                conn.execute("BEGIN")
+                conn.executemany(sql, chunk)
+                conn.execute("COMMIT")
+    finally:
+        conn.close()
+    return path
+
+
+class StageTimer:
+    def __init__(self):
+        self.timings: Dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = time.perf_counter() - start
+            print(f"  {name:<18} {self.timings[name]:>9.3f}s")
+
+
+def run_pipeline(db_path: Path, apply_jobs: int = 50, browser_latency: float = 0.05,
+                 workers: int = 2, schedule_jobs: int = 5_000) -> Dict[str, float]:
+    """Time every pipeline stage against db_path; returns stage -> seconds"""
+    from jobpilot.dedup import DedupIndex
+    from jobpilot.events import JOB_APPLIED, EventLog, summarize
+    from jobpilot.filters import select_matching_jobs
+    from jobpilot.platforms import detect_platform
+    from jobpilot.queries import select_unapplied_jobs
+    from jobpilot.scheduler import ApplyScheduler, FakeClock, InlineExecutor
+    from jobpilot.scoring import score_jobs
+    from jobpilot.storage import Storage
+    from jobpilot.workers import WorkerPool
+
+    timer = StageTimer()
+    with timer.stage("migrate"):
+        storage = Storage(db_path)
+    try:
+        with timer.stage("score"):
+            score_jobs(storage, full=True)
+        with timer.stage("dedup_index"):
+            DedupIndex(storage).index_pending()
+        with timer.stage("select_unapplied"):
+            select_unapplied_jobs(storage, limit=54)
+        with timer.stage("select_filtered"):
+            selected = select_matching_jobs(storage, order_by_score=True)
+        all_unapplied = select_unapplied_jobs(storage)
+        urls = [job['url'] for job in all_unapplied]
+
+        with timer.stage("detect_platform"):
+            for url in urls:
+                detect_platform(url)
+
+        clock = FakeClock()
+        scheduler = ApplyScheduler(lambda job, index, total: True, detect_platform,
+                                   clock=clock, executor=InlineExecutor())
+        with timer.stage("schedule"):
+            scheduler.run(all_unapplied[:schedule_jobs])
+
+        batch = (selected or all_unapplied)[:apply_jobs]
+        with WorkerPool(size=workers, session_factory=partial(FakeBrowserSession, browser_latency)) as pool:
+            pool.apply({'url': 'warmup'})
+            with timer.stage("browser_apply"):
+                ApplyScheduler(lambda job, index, total: bool(pool.apply(job)), detect_platform,
+                               max_concurrency=workers, clock=FakeClock()).run(batch)
+
+        with timer.stage("status_writes"):
+            for job in all_unapplied[:schedule_jobs]:
+                storage.update_status(job['id'], 'unapplied', notes='bench')
+            storage.flush()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            log_path = Path(tmp) / "bench_report.jsonl"
+            with timer.stage("report_write"):
+                with EventLog(log_path, run_id="bench") as log:
+                    for job in all_unapplied[:schedule_jobs]:
+                        log.emit(JOB_APPLIED, job_id=job['id'], platform=job['platform'])
+            with timer.stage("report_summary"):
+                summarize([log_path])
+    finally:
+        storage.close()
+    return timer.timings
+
+
+def compare(timings: Dict[str, float], baseline: Dict[str, float],
+            tolerance: float = DEFAULT_TOLERANCE) -> List[str]:
+    """Stages slower than baseline by more than tolerance (and more than timer noise)"""
+    regressions = []
+    for stage, seconds in timings.items():
+        base = baseline.get(stage)
+        if base is None:
+            continue
+        if seconds > base * (1 + tolerance) and seconds - base > MIN_REGRESSION_SECONDS:
+            regressions.append(f"{stage}: {seconds:.3f}s vs baseline {base:.3f}s (+{(seconds / base - 1) * 100:.0f}%)"
+                               if base else f"{stage}: {seconds:.3f}s vs baseline 0s")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the batch-apply pipeline on synthetic data")
+    parser.add_argument("--rows", type=int, default=10_000, help="jobs to generate (10000, 100000, 1000000)")
+    parser.add_argument("--db", type=Path, help="reuse/write the generated database here instead of a temp dir")
+    parser.add_argument("--source-db", type=Path, default=DEFAULT_SOURCE_DB, help="database whose schema to copy")
+    parser.add_argument("--latency", type=float, default=0.05, help="fake browser seconds per apply")
+    parser.add_argument("--apply-jobs", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--baseline", type=Path, help="baseline JSON (default data/bench/baseline_<rows>.json)")
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args()
+
+    baseline_path = args.baseline or BASELINE_DIR / f"baseline_{args.rows}.json"
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = args.db or Path(tmp) / f"bench_{args.rows}.db"
+        if not db_path.exists():
+            start = time.perf_counter()
+            generate_database(db_path, args.rows, args.source_db)
+            print(f"Generated {args.rows} jobs in {time.perf_counter() - start:.1f}s -> {db_path}")
+
+        print(f"Pipeline stages ({args.rows} jobs):")
+        timings = run_pipeline(db_path, args.apply_jobs, args.latency, args.workers)
+
+    if args.save_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(baseline_path, "w", encoding="utf-8") as f:
+            json.dump({'rows': args.rows, 'timings': timings}, f, indent=2)
+        print(f"Saved baseline to {baseline_path}")
+        return
+    if not baseline_path.exists():
+        print(f"No baseline at {baseline_path}; run with --save-baseline to create one")
+        return
+
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)['timings']
+    regressions = compare(timings, baseline, args.tolerance)
+    for line in regressions:
+        print(f"✗ {line}")
+    if not regressions:
+        print(f"✓ No stage slower than baseline by more than {args.tolerance:.0%}")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,292 @@
+"""
+The `jobpilot` command: list, apply, report, score, dedupe, ingest, check, stats and retries in one entry point
+- Database and report paths come from --db/--config, JOBPILOT_DB /
+  JOBPILOT_CONFIG, config/jobpilot.json or the defaults (see jobpilot.config)
+- Each subcommand imports its modules when it runs, so `jobpilot list` loads
+  sqlite3 and the query builders but never NumPy, the PDF parser or browser workers
+
+    jobpilot list --limit 20
+    jobpilot apply --mode parallel
+    jobpilot report --json
+"""
+
+import argparse
+import json
+import os
+import sys
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import List, Optional
+
+from jobpilot.config import CONFIG_DIR, PROFILES_FILE, database_path, report_dir
+
+
+def cmd_list(args) -> int:
+    from jobpilot.dedup import DedupIndex
+    from jobpilot.filters import select_matching_jobs
+    from jobpilot.storage import get_storage
+
+    storage = get_storage(database_path())
+    # Keep stdout clean for --json callers; progress notes go to stderr
+    with redirect_stdout(sys.stderr):
+        if args.score:
+            from jobpilot.scoring import score_jobs
+            print(f"Scored {score_jobs(storage)} new or changed jobs")
+        jobs = select_matching_jobs(storage, limit=args.limit, order_by_score=True)
+        if not args.keep_duplicates:
+            jobs = DedupIndex(storage).collapse(jobs)
+
+    if args.json:
+        print(json.dumps(jobs, ensure_ascii=False))
+    else:
+        for job in jobs:
+            score = f"{job['match_score']:.2f}" if job.get('match_score') is not None else "  - "
+            print(f"{score}  {job['company']} - {job['title']}  {job['url']}")
+        print(f"{len(jobs)} unapplied jobs", file=sys.stderr)
+
+    if args.log:
+        from jobpilot.events import JOB_LISTED, EventLog
+        from jobpilot.journal import new_run_id
+
+        # Append this listing to the job URL log (one JSON line per job, never rewritten)
+        with EventLog(args.log, new_run_id()) as log:
+            for i, job in enumerate(jobs, 1):
+                log.emit(JOB_LISTED, rank=i, job_id=job['id'], company=job['company'], title=job['title'],
+                         url=job['url'], location=job['location'], match_score=job['match_score'])
+        print(f"Appended job URLs to: {args.log}", file=sys.stderr)
+    return 0
+
+
+def cmd_apply(args) -> int:
+    from jobpilot.apply import MODES
+
+    if args.profiles and args.mode:
+        raise SystemExit("--mode does not apply with --profiles; every profile runs in the parallel mode")
+    mode = args.mode or 'parallel'
+    kwargs = {'run_id': args.resume, 'metrics_port': args.metrics_port}
+    if args.concurrency is not None:
+        if mode == 'serial':
+            raise SystemExit("--concurrency does not apply to the serial mode")
+        kwargs['max_concurrency'] = args.concurrency
+    if args.profiles:
+        from jobpilot.config import load_profiles
+        from jobpilot.tenants import MultiProfileRunner
+
+        MultiProfileRunner(load_profiles(args.profiles), **kwargs).run()
+        return 0
+    MODES[mode](**kwargs).run()
+    return 0
+
+
+def cmd_report(args) -> int:
+    from jobpilot.events import summarize
+
+    logs = args.logs or sorted(report_dir().glob("batch_apply_report_*.jsonl"))
+    if not logs:
+        print(f"No batch_apply_report_*.jsonl logs in {report_dir()}", file=sys.stderr)
+        return 1
+    report = summarize(logs)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+
+    print(f"Runs: {len(report['runs'])} ({len(logs)} logs)")
+    print(f"Total Processed: {report['total_processed']}")
+    print(f"Successfully Applied: {report['successful']}")
+    print(f"Failed: {report['failed']}")
+    print(f"Skipped: {report['skipped']}")
+    if report['success_rate'] is not None:
+        print(f"Success Rate: {report['success_rate'] * 100:.1f}%")
+    for platform, counts in report['by_platform'].items():
+        print(f"  {platform}: {counts['applied']} applied, {counts['failed']} failed, {counts['skipped']} skipped")
+    return 0
+
+
+def cmd_score(args) -> int:
+    import time
+
+    from jobpilot.scoring import score_jobs
+    from jobpilot.storage import get_storage
+
+    start = time.perf_counter()
+    scored = score_jobs(get_storage(database_path()), full=args.full)
+    print(f"Scored {scored} jobs in {time.perf_counter() - start:.2f}s")
+    return 0
+
+
+def cmd_dedupe(args) -> int:
+    from jobpilot.dedup import DedupIndex
+    from jobpilot.storage import get_storage
+
+    storage = get_storage(database_path())
+    indexed = DedupIndex(storage).index_pending()
+    duplicates = storage.fetch_all(
+        "SELECT COUNT(*) AS n FROM job_signatures WHERE canonical_id != job_id")[0]['n']
+    print(f"Indexed {indexed} new jobs; {duplicates} known duplicates")
+    return 0
+
+
+def cmd_ingest(args) -> int:
+    import time
+
+    from jobpilot.ingest import BATCH_SIZE, JobIngester
+    from jobpilot.storage import get_storage
+
+    start = time.perf_counter()
+    ingester = JobIngester(get_storage(database_path()), batch_size=args.batch_size or BATCH_SIZE,
+                           queue_applications=not args.no_queue)
+    stats = ingester.ingest_files(args.feeds, defer_indexes=args.defer_indexes)
+    print(f"Read {stats.read} records in {time.perf_counter() - start:.2f}s: {stats.inserted} new, "
+          f"{stats.updated} updated, {stats.unchanged} unchanged, {stats.skipped} skipped; "
+          f"{stats.queued} queued as unapplied")
+    return 0
+
+
+def cmd_check(args) -> int:
+    from collections import Counter
+
+    from jobpilot.filters import select_matching_jobs
+    from jobpilot.liveness import LivenessChecker
+    from jobpilot.platforms import PlatformResolver
+    from jobpilot.storage import get_storage
+
+    storage = get_storage(database_path())
+    jobs = select_matching_jobs(storage, limit=args.limit, order_by_score=True)
+    checker = LivenessChecker(storage, resolver=PlatformResolver(storage))
+    try:
+        results = checker.check((checker.probe_url(job['url']) for job in jobs), refresh=args.refresh)
+    finally:
+        checker.close()
+    if args.verbose:
+        for job in jobs:
+            result = results[checker.probe_url(job['url'])]
+            print(f"{result.state:<10} {'cached' if result.cached else str(result.http_status or '-'):>6}  "
+                  f"{job['company']} - {job['title']}  {job['url']}")
+    if not results:
+        print("No unapplied postings to check")
+        return 0
+    counts = Counter(result.state for result in results.values())
+    cached = sum(result.cached for result in results.values())
+    print(f"Checked {len(results)} postings ({cached} from cache): "
+          + ", ".join(f"{n} {state}" for state, n in counts.most_common()))
+    return 0
+
+
+def cmd_stats(args) -> int:
+    from jobpilot.analytics import format_summary, refresh, summary
+    from jobpilot.storage import get_storage
+
+    storage = get_storage(database_path())
+    if args.refresh:
+        refresh(storage)
+    stats = summary(storage)
+    if args.json:
+        print(json.dumps(stats, indent=2))
+    else:
+        print(format_summary(stats))
+        for entry in stats['top_companies']:
+            print(f"  {entry['applied']:>4}  {entry['company']}")
+    return 0
+
+
+def cmd_retries(args) -> int:
+    from datetime import datetime
+
+    from jobpilot.journal import RunJournal
+    from jobpilot.storage import get_storage
+
+    journal = RunJournal(get_storage(database_path()))
+    if args.requeue:
+        print(f"Requeued {journal.requeue(args.requeue)} {args.requeue} jobs")
+        return 0
+    rows = journal.retry_summary()
+    if not rows:
+        print("No failed or retrying jobs")
+    for row in rows:
+        line = f"{row['state']:<7} {row['failure_class']:<13} {row['n']:>5}"
+        if row['state'] == 'retry':
+            next_at = datetime.fromtimestamp(row['next_retry_at']).strftime('%Y-%m-%d %H:%M')
+            line += f"  {row['due']} due now, next at {next_at}"
+        print(line)
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="jobpilot", description="JobPilot batch-apply tools")
+    parser.add_argument("--db", type=Path, help="database path (overrides JOBPILOT_DB and the settings file)")
+    parser.add_argument("--config", type=Path, help="settings file (default config/jobpilot.json)")
+    commands = parser.add_subparsers(dest="command", metavar="command")
+    commands.required = True
+
+    list_parser = commands.add_parser("list", help="unapplied jobs that pass config/preferences.json")
+    list_parser.add_argument("--limit", type=int)
+    list_parser.add_argument("--json", action="store_true", help="print one JSON array")
+    list_parser.add_argument("--score", action="store_true", help="score new/changed jobs first (loads NumPy)")
+    list_parser.add_argument("--keep-duplicates", action="store_true", help="don't collapse duplicate postings")
+    list_parser.add_argument("--log", type=Path, metavar="JSONL", help="append the listing to this event log")
+    list_parser.set_defaults(handler=cmd_list)
+
+    apply_parser = commands.add_parser("apply", help="run a batch-apply mode over the queue")
+    apply_parser.add_argument("--mode", choices=["parallel", "browser", "serial"],
+                              help="apply mode (default: parallel; not combinable with --profiles)")
+    apply_parser.add_argument("--resume", metavar="RUN_ID", help="continue a crashed run")
+    apply_parser.add_argument("--concurrency", type=int, help="platforms applied to in parallel")
+    apply_parser.add_argument("--profiles", type=Path, nargs="?", const=CONFIG_DIR / PROFILES_FILE, metavar="JSON",
+                              help="serve every candidate in config/profiles.json from one shared scheduler")
+    apply_parser.add_argument("--metrics-port", type=int, help="serve Prometheus metrics on this local port")
+    apply_parser.set_defaults(handler=cmd_apply)
+
+    report_parser = commands.add_parser("report", help="summarize batch-apply event logs")
+    report_parser.add_argument("logs", nargs="*", type=Path, help="default: every log in the report directory")
+    report_parser.add_argument("--json", action="store_true")
+    report_parser.set_defaults(handler=cmd_report)
+
+    score_parser = commands.add_parser("score", help="refresh jobs.match_score")
+    score_parser.add_argument("--full", action="store_true", help="re-score every job, not just new/changed ones")
+    score_parser.set_defaults(handler=cmd_score)
+
+    dedupe_parser = commands.add_parser("dedupe", help="index new jobs into duplicate clusters")
+    dedupe_parser.set_defaults(handler=cmd_dedupe)
+
+    ingest_parser = commands.add_parser("ingest", help="upsert jobs from JSONL/CSV search-result feeds")
+    ingest_parser.add_argument("feeds", nargs="+", type=Path)
+    ingest_parser.add_argument("--batch-size", type=int, help="rows per transaction (default 50000)")
+    ingest_parser.add_argument("--no-queue", action="store_true", help="don't add new jobs as unapplied")
+    ingest_parser.add_argument("--defer-indexes", action=argparse.BooleanOptionalAction, default=None,
+                               help="rebuild jobs indexes once at the end (default: only for feeds over 64 MB)")
+    ingest_parser.set_defaults(handler=cmd_ingest)
+
+    check_parser = commands.add_parser("check", help="pre-flight liveness check of the unapplied queue")
+    check_parser.add_argument("--limit", type=int)
+    check_parser.add_argument("--refresh", action="store_true", help="re-check postings with fresh cached results")
+    check_parser.add_argument("-v", "--verbose", action="store_true", help="print each posting's state")
+    check_parser.set_defaults(handler=cmd_check)
+
+    stats_parser = commands.add_parser("stats", help="all-time application counts and response rates")
+    stats_parser.add_argument("--json", action="store_true")
+    stats_parser.add_argument("--refresh", action="store_true", help="rebuild the summary table first")
+    stats_parser.set_defaults(handler=cmd_stats)
+
+    retries_parser = commands.add_parser("retries", help="failed jobs by failure class and their retry schedule")
+    retries_parser.add_argument("--requeue", choices=["needs_human", "permanent", "transient", "rate_limited",
+                                                      "unclassified"],
+                                help="put jobs that failed for good with this class back in the queue")
+    retries_parser.set_defaults(handler=cmd_retries)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from jobpilot.storage import install_sigterm_handler
+
+    args = build_parser().parse_args(argv)
+    install_sigterm_handler()
+    # Through the environment, so worker processes resolve the same paths
+    if args.config:
+        os.environ["JOBPILOT_CONFIG"] = str(args.config.resolve())
+    if args.db:
+        os.environ["JOBPILOT_DB"] = str(args.db.resolve())
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
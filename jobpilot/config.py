@@ -0,0 +1,109 @@
+"""
+Config file loading for the Python side (profile, preferences, Q&A templates)
+- Runtime settings (database path, report directory) come from, in order:
+  JOBPILOT_DB / JOBPILOT_REPORT_DIR, the settings file named by
+  JOBPILOT_CONFIG (default config/jobpilot.json, optional), then defaults
+- JOBPILOT_HOME points an installed package at the checkout holding
+  config/ and data/; relative settings paths resolve against it
+- config/profiles.json lists the candidates a multi-profile run serves, each
+  with its own config directory, database and scheduling weight; what they
+  share (platform pacing, LinkedIn redirects) lives in shared_db_path
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+PROJECT_ROOT = Path(os.environ.get("JOBPILOT_HOME") or Path(__file__).resolve().parent.parent)
+CONFIG_DIR = PROJECT_ROOT / "config"
+SETTINGS_FILE = "jobpilot.json"
+PROFILES_FILE = "profiles.json"
+
+DEFAULT_SETTINGS = {
+    'db_path': "data/db/jobpilot.db",
+    'shared_db_path': "data/db/shared.db",
+    'report_dir': ".",
+}
+ENV_SETTINGS = {
+    'db_path': "JOBPILOT_DB",
+    'shared_db_path': "JOBPILOT_SHARED_DB",
+    'report_dir': "JOBPILOT_REPORT_DIR",
+}
+
+
+def load_json(name: str, config_dir: Optional[Path] = None) -> Dict:
+    with open((config_dir or CONFIG_DIR) / name, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_profile(config_dir: Optional[Path] = None) -> Dict:
+    return load_json("profile.json", config_dir)
+
+
+def load_preferences(config_dir: Optional[Path] = None) -> Dict:
+    return load_json("preferences.json", config_dir)
+
+
+def load_qa_templates(config_dir: Optional[Path] = None) -> Dict:
+    return load_json("qa_templates.json", config_dir)
+
+
+def load_settings(path: Optional[Path] = None) -> Dict:
+    """Defaults, overlaid by the settings file if present, overlaid by the environment"""
+    settings = dict(DEFAULT_SETTINGS)
+    path = Path(path or os.environ.get("JOBPILOT_CONFIG") or CONFIG_DIR / SETTINGS_FILE)
+    if path.exists():
+        with open(path, encoding="utf-8") as f:
+            settings.update({key: value for key, value in json.load(f).items() if key in DEFAULT_SETTINGS})
+    for key, variable in ENV_SETTINGS.items():
+        if os.environ.get(variable):
+            settings[key] = os.environ[variable]
+    return settings
+
+
+def _resolve(value: str) -> Path:
+    path = Path(value).expanduser()
+    return path if path.is_absolute() else PROJECT_ROOT / path
+
+
+def database_path(settings: Optional[Dict] = None) -> Path:
+    return _resolve((settings or load_settings())['db_path'])
+
+
+def shared_database_path(settings: Optional[Dict] = None) -> Path:
+    return _resolve((settings or load_settings())['shared_db_path'])
+
+
+def report_dir(settings: Optional[Dict] = None) -> Path:
+    return _resolve((settings or load_settings())['report_dir'])
+
+
+def load_profiles(path: Optional[Path] = None) -> List[Dict]:
+    """Candidates for `jobpilot apply --profiles`: name, config_dir, db_path and weight per entry
+
+    config_dir defaults to config/profiles/<name> and db_path to data/db/<name>.db
+    """
+    with open(path or CONFIG_DIR / PROFILES_FILE, encoding="utf-8") as f:
+        entries = json.load(f)
+    if isinstance(entries, dict):
+        entries = entries.get('profiles', [])
+
+    profiles = []
+    for entry in entries:
+        name = entry['name']
+        weight = float(entry.get('weight', 1))
+        if weight <= 0:
+            raise ValueError(f"Profile {name!r} needs a positive weight, not {weight}")
+        profiles.append({
+            'name': name,
+            'config_dir': _resolve(entry.get('config_dir') or f"config/profiles/{name}"),
+            'db_path': _resolve(entry.get('db_path') or f"data/db/{name}.db"),
+            'weight': weight,
+        })
+    names = [profile['name'] for profile in profiles]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Duplicate profile names in {path or CONFIG_DIR / PROFILES_FILE}")
+    if len({profile['db_path'] for profile in profiles}) != len(profiles):
+        raise ValueError("Each profile needs its own database (applications are tracked per candidate)")
+    return profiles
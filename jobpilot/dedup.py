@@ -0,0 +1,217 @@
+"""
+Near-duplicate job detection ahead of the apply queue
+- Normalized company/title/location keys catch reposts of the same posting
+- 64-bit SimHash of the description (title + company when there is none)
+  catches near-identical postings under different IDs or locations
+- SimHash is split into 4 x 16-bit LSH bands stored in the DB, so an ingest
+  check is a handful of indexed lookups, never a scan of every stored job
+- SimHash bit counts are summed with NumPy for a whole chunk of jobs at once
+- Each cluster keeps its first-seen job as canonical; collapse() drops the rest.
+  Deleting a canonical job promotes the next-oldest member (schema trigger)
+"""
+
+import hashlib
+import re
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+SIMHASH_BITS = 64
+BANDS = 4
+BAND_BITS = SIMHASH_BITS // BANDS
+MAX_HAMMING = 3  # <= BANDS - 1, so a near-duplicate always shares at least one band
+MAX_BAND_CANDIDATES = 20
+CHUNK_SIZE = 5_000
+MAX_BATCH_FEATURES = 250_000  # shingles per NumPy pass (a 64-byte bit row each)
+
+WORD = re.compile(r"[a-z0-9]+")
+COMPANY_SUFFIXES = {"inc", "llc", "ltd", "corp", "corporation", "co", "company", "plc", "gmbh"}
+
+JOB_COLUMNS = "j.rowid, j.id, j.title, j.company, j.location, j.description"
+
+
+class JobSignature(NamedTuple):
+    company_key: str
+    title_key: str
+    location_key: str
+    simhash: int
+
+
+def normalize(text: Optional[str]) -> str:
+    return " ".join(WORD.findall((text or "").lower().replace("&", " and ")))
+
+
+def normalize_company(company: Optional[str]) -> str:
+    words = normalize(company).split()
+    while words and words[-1] in COMPANY_SUFFIXES:
+        words.pop()
+    return " ".join(words)
+
+
+def _feature_hash(feature: str) -> int:
+    return int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "big")
+
+
+def _features(text: str, shingle: int) -> List[str]:
+    words = WORD.findall(text.lower())
+    if len(words) < shingle:
+        return [" ".join(words)]
+    return [" ".join(words[i:i + shingle]) for i in range(len(words) - shingle + 1)]
+
+
+def _simhash_batch(features: List[List[str]]) -> List[int]:
+    digests = b"".join(hashlib.blake2b(f.encode(), digest_size=8).digest() for fs in features for f in fs)
+    hashes = np.frombuffer(digests, dtype=">u8").astype("<u8")
+    # One row per shingle, column b = bit b of its hash
+    bits = np.unpackbits(hashes.view(np.uint8).reshape(-1, 8), axis=1, bitorder="little")
+    counts = np.fromiter((len(fs) for fs in features), dtype=np.int64, count=len(features))
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    ones = np.add.reduceat(bits, starts, axis=0, dtype=np.int64)
+    # A bit is set when more shingles have it set than not (a weight > 0 in the +1/-1 formulation)
+    packed = np.packbits(ones * 2 > counts[:, None], axis=1, bitorder="little")
+    return packed.view("<u8").ravel().tolist()
+
+
+def simhashes(texts: Sequence[str], shingle: int = 3) -> List[int]:
+    """64-bit SimHash over word shingles for many texts, one NumPy pass per batch"""
+    result: List[int] = []
+    batch: List[List[str]] = []
+    size = 0
+    for text in texts:
+        features = _features(text, shingle)
+        if batch and size + len(features) > MAX_BATCH_FEATURES:
+            result += _simhash_batch(batch)
+            batch, size = [], 0
+        batch.append(features)
+        size += len(features)
+    if batch:
+        result += _simhash_batch(batch)
+    return result
+
+
+def simhash(text: str, shingle: int = 3) -> int:
+    """64-bit SimHash over word shingles"""
+    return simhashes([text], shingle)[0]
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def to_signed(value: int) -> int:
+    """SQLite INTEGER is signed 64-bit"""
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def to_unsigned(value: int) -> int:
+    return value + (1 << 64) if value < 0 else value
+
+
+def bands(value: int) -> List[int]:
+    mask = (1 << BAND_BITS) - 1
+    return [(value >> (i * BAND_BITS)) & mask for i in range(BANDS)]
+
+
+def signatures(jobs: Sequence[Dict]) -> List[JobSignature]:
+    keys = [(normalize_company(job.get('company')), normalize(job.get('title')), normalize(job.get('location')))
+            for job in jobs]
+    bodies = [job.get('description') or f"{company_key} {title_key}"
+              for job, (company_key, title_key, _) in zip(jobs, keys)]
+    return [JobSignature(*key, value) for key, value in zip(keys, simhashes(bodies))]
+
+
+def signature(job: Dict) -> JobSignature:
+    return signatures([job])[0]
+
+
+class DedupIndex:
+    def __init__(self, storage):
+        self.storage = storage
+
+    def _find_canonical(self, conn, sig: JobSignature, job_id: str) -> Optional[str]:
+        row = conn.execute("""
+        SELECT canonical_id FROM job_signatures
+        WHERE company_key = ? AND title_key = ? AND location_key = ? AND job_id != ?
+        LIMIT 1
+        """, (sig.company_key, sig.title_key, sig.location_key, job_id)).fetchone()
+        if row:
+            return row[0]
+
+        for band, bucket in enumerate(bands(sig.simhash)):
+            candidates = conn.execute("""
+            SELECT s.simhash, s.canonical_id FROM job_lsh l
+            JOIN job_signatures s ON s.job_id = l.job_id
+            WHERE l.band = ? AND l.bucket = ? AND s.company_key = ? AND s.job_id != ?
+            LIMIT ?
+            """, (band, bucket, sig.company_key, job_id, MAX_BAND_CANDIDATES)).fetchall()
+            for candidate_hash, canonical_id in candidates:
+                if hamming(to_unsigned(candidate_hash), sig.simhash) <= MAX_HAMMING:
+                    return canonical_id
+        return None
+
+    def _add(self, conn, job: Dict, sig: Optional[JobSignature] = None) -> str:
+        sig = sig or signature(job)
+        conn.execute("DELETE FROM job_signatures WHERE job_id = ?", (job['id'],))
+        conn.execute("DELETE FROM job_lsh WHERE job_id = ?", (job['id'],))
+        canonical_id = self._find_canonical(conn, sig, job['id']) or job['id']
+        conn.execute("""
+        INSERT INTO job_signatures (job_id, company_key, title_key, location_key, simhash, canonical_id)
+        VALUES (?, ?, ?, ?, ?, ?)
+        """, (job['id'], sig.company_key, sig.title_key, sig.location_key, to_signed(sig.simhash), canonical_id))
+        conn.executemany("INSERT INTO job_lsh (band, bucket, job_id) VALUES (?, ?, ?)",
+                         [(band, bucket, job['id']) for band, bucket in enumerate(bands(sig.simhash))])
+        return canonical_id
+
+    def add(self, job: Dict) -> str:
+        """Index one job on ingest; returns the canonical job ID of its cluster"""
+        with self.storage.transaction() as conn:
+            canonical_id = self._add(conn, job)
+            conn.execute("DELETE FROM job_dedup_queue WHERE job_id = ?", (job['id'],))
+            return canonical_id
+
+    def index_pending(self) -> int:
+        """Index jobs queued by the insert/update triggers, oldest first"""
+        indexed = 0
+        while True:
+            jobs = self.storage.fetch_all(f"""
+            SELECT {JOB_COLUMNS} FROM job_dedup_queue q JOIN jobs j ON j.id = q.job_id
+            ORDER BY j.rowid LIMIT ?
+            """, (CHUNK_SIZE,))
+            if not jobs:
+                return indexed
+            sigs = signatures(jobs)
+            with self.storage.transaction() as conn:
+                for job, sig in zip(jobs, sigs):
+                    self._add(conn, job, sig)
+                conn.executemany("DELETE FROM job_dedup_queue WHERE job_id = ?", ((job['id'],) for job in jobs))
+            indexed += len(jobs)
+
+    def duplicate_ids(self, job_ids: Sequence[str]) -> Dict[str, str]:
+        """job_id -> canonical_id for every job in job_ids that is a duplicate"""
+        duplicates: Dict[str, str] = {}
+        ids = list(job_ids)
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            for row in self.storage.fetch_all(f"""
+            SELECT job_id, canonical_id FROM job_signatures
+            WHERE job_id IN ({placeholders}) AND canonical_id != job_id
+            """, chunk):
+                duplicates[row['job_id']] = row['canonical_id']
+        return duplicates
+
+    def collapse(self, jobs: List[Dict]) -> List[Dict]:
+        """Drop every job that isn't the canonical member of its duplicate cluster"""
+        self.index_pending()
+        duplicates = self.duplicate_ids(job['id'] for job in jobs)
+        # The join can return a job once per unapplied application row
+        seen = set()
+        kept = []
+        for job in jobs:
+            if job['id'] in duplicates or job['id'] in seen:
+                continue
+            seen.add(job['id'])
+            kept.append(job)
+        if len(kept) < len(jobs):
+            print(f"🔁 Collapsed {len(jobs) - len(kept)} duplicate postings")
+        return kept
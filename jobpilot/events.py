@@ -0,0 +1,154 @@
+"""
+Append-only JSONL event logs for batch runs
+- One JSON line per job event, written through a buffered file handle
+- Flushed every N events / T seconds, on close and at exit, so a crash loses
+  at most the last few events instead of the whole report
+- summarize() folds any number of logs into report stats in constant memory
+
+Summarize logs from the command line:
+    python -m jobpilot.events batch_apply_report_*.jsonl
+"""
+
+import argparse
+import atexit
+import json
+import threading
+import time
+import weakref
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional
+
+DEFAULT_FLUSH_EVERY = 50
+DEFAULT_FLUSH_INTERVAL = 2.0
+BUFFER_SIZE = 1 << 16
+
+RUN_STARTED = 'run_started'
+RUN_FINISHED = 'run_finished'
+JOB_APPLIED = 'job_applied'
+JOB_FAILED = 'job_failed'
+JOB_SKIPPED = 'job_skipped'
+JOB_LISTED = 'job_listed'
+
+_open_logs: "weakref.WeakSet[EventLog]" = weakref.WeakSet()
+
+
+class EventLog:
+    def __init__(self, path: Path, run_id: Optional[str] = None,
+                 flush_every: int = DEFAULT_FLUSH_EVERY, flush_interval: float = DEFAULT_FLUSH_INTERVAL):
+        self.path = Path(path)
+        self.run_id = run_id
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._file = open(self.path, 'a', buffering=BUFFER_SIZE, encoding='utf-8')
+        self._unflushed = 0
+        self._last_flush = time.monotonic()
+        _open_logs.add(self)
+
+    def emit(self, event: str, **fields):
+        """Append one event line; fields must be JSON-serializable"""
+        record = {'ts': round(time.time(), 3), 'event': event}
+        if self.run_id:
+            record['run_id'] = self.run_id
+        record.update(fields)
+        line = json.dumps(record, ensure_ascii=False, default=str) + '\n'
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.write(line)
+            self._unflushed += 1
+            if (self._unflushed >= self.flush_every
+                    or time.monotonic() - self._last_flush >= self.flush_interval):
+                self._flush_locked()
+
+    def _flush_locked(self):
+        self._file.flush()
+        self._unflushed = 0
+        self._last_flush = time.monotonic()
+
+    def flush(self):
+        with self._lock:
+            if not self._file.closed:
+                self._flush_locked()
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    def __enter__(self) -> "EventLog":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+@atexit.register
+def _close_open_logs():
+    for log in list(_open_logs):
+        log.close()
+
+
+def read_events(paths: Iterable[Path]) -> Iterator[Dict]:
+    """Stream events from logs, skipping a torn final line left by a crash"""
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+
+def summarize(paths: Iterable[Path]) -> Dict:
+    """Fold event logs into report stats without holding the events in memory"""
+    events = Counter()
+    platforms: Dict[str, Counter] = {}
+    runs = set()
+    first_ts = last_ts = None
+
+    for record in read_events(paths):
+        event = record.get('event')
+        events[event] += 1
+        ts = record.get('ts')
+        if ts is not None:
+            first_ts = ts if first_ts is None else min(first_ts, ts)
+            last_ts = ts if last_ts is None else max(last_ts, ts)
+        if record.get('run_id'):
+            runs.add(record['run_id'])
+        if event in (JOB_APPLIED, JOB_FAILED, JOB_SKIPPED):
+            platform = record.get('platform') or 'Unknown'
+            platforms.setdefault(platform, Counter())[event] += 1
+
+    processed = events[JOB_APPLIED] + events[JOB_FAILED] + events[JOB_SKIPPED]
+    return {
+        'runs': sorted(runs),
+        'total_processed': processed,
+        'successful': events[JOB_APPLIED],
+        'failed': events[JOB_FAILED],
+        'skipped': events[JOB_SKIPPED],
+        'listed': events[JOB_LISTED],
+        'success_rate': events[JOB_APPLIED] / processed if processed else None,
+        'elapsed_seconds': (last_ts - first_ts) if first_ts is not None else 0.0,
+        'by_platform': {
+            platform: {
+                'applied': counts[JOB_APPLIED],
+                'failed': counts[JOB_FAILED],
+                'skipped': counts[JOB_SKIPPED],
+            }
+            for platform, counts in sorted(platforms.items())
+        },
+        'events': dict(events),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize batch-apply JSONL event logs")
+    parser.add_argument("logs", nargs="+", type=Path)
+    args = parser.parse_args()
+    print(json.dumps(summarize(args.logs), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Compile config/preferences.json into one parameterized SQL predicate
+- Keyword rules become FTS5 MATCH expressions over jobs_fts
+- Recency and match-score rules hit indexed jobs columns; salary and company
+  rules are checked on the rows the FTS match already narrowed
+- Like a missing salary, a missing posting date or a not-yet-computed match
+  score never rejects a job on its own
+- Rejected rows are filtered inside SQLite and never reach Python
+"""
+
+import time
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+from jobpilot.config import load_preferences
+from jobpilot.queries import TITLE_KEYWORDS, filtered_jobs_query, fts_phrase, title_match_expression
+
+# Company-name fragments that mark staffing/recruiting intermediaries
+STAFFING_MARKERS = ["staffing", "recruiting", "recruitment", "talent solutions", "jobs via"]
+
+SECONDS_PER_DAY = 86400
+
+
+class CompiledFilter(NamedTuple):
+    where: str
+    params: List
+
+
+def _any_phrase(terms: Sequence[str]) -> str:
+    return "(" + " OR ".join(fts_phrase(t, prefix=False) for t in terms) + ")"
+
+
+def include_expression(preferences: Dict) -> str:
+    """FTS5 expression for jobs worth considering: a preferred title, or a keyword anywhere"""
+    search = preferences.get('job_search') or {}
+    titles = [t for t in search.get('titles', []) if t.strip()]
+    keywords = [k for k in search.get('keywords', []) if k.strip()]
+    if not titles and not keywords:
+        return title_match_expression(TITLE_KEYWORDS)
+
+    parts = []
+    if titles:
+        parts.append("title : " + _any_phrase(titles))
+    if keywords:
+        parts.append(_any_phrase(keywords))
+    return " OR ".join(parts)
+
+
+def exclude_expression(preferences: Dict) -> str:
+    keywords = [k for k in (preferences.get('filters') or {}).get('exclude_keywords', []) if k.strip()]
+    return "title : " + _any_phrase(keywords) if keywords else ""
+
+
+def compile_preferences(preferences: Dict, now: float = None) -> CompiledFilter:
+    """WHERE fragment (over alias j = jobs) plus its parameters"""
+    now = time.time() if now is None else now
+    filters = preferences.get('filters') or {}
+    salary = preferences.get('salary') or {}
+    companies = preferences.get('companies') or {}
+    application = preferences.get('application') or {}
+
+    clauses = ["j.company != 'Unknown'",
+               "j.rowid IN (SELECT rowid FROM jobs_fts WHERE jobs_fts MATCH ?)"]
+    params: List = [include_expression(preferences)]
+
+    excluded_terms = exclude_expression(preferences)
+    if excluded_terms:
+        clauses.append("j.rowid NOT IN (SELECT rowid FROM jobs_fts WHERE jobs_fts MATCH ?)")
+        params.append(excluded_terms)
+
+    excluded = [c.lower() for c in companies.get('excluded', []) if c.strip()]
+    if excluded:
+        clauses.append(f"lower(j.company) NOT IN ({','.join('?' * len(excluded))})")
+        params.extend(excluded)
+
+    if filters.get('exclude_staffing'):
+        for marker in STAFFING_MARKERS:
+            clauses.append("lower(j.company) NOT LIKE ?")
+            params.append(f"%{marker}%")
+
+    if filters.get('require_salary_info'):
+        clauses.append("COALESCE(j.salary_max, j.salary_min) IS NOT NULL")
+
+    if salary.get('minimum'):
+        # Jobs that don't list a salary are kept unless require_salary_info is set
+        clauses.append("(COALESCE(j.salary_max, j.salary_min) IS NULL OR COALESCE(j.salary_max, j.salary_min) >= ?)")
+        params.append(salary['minimum'])
+
+    if filters.get('posted_within_days'):
+        # posted_at, not saved_at: a job scraped today may have been posted weeks ago
+        clauses.append("(j.posted_at IS NULL OR j.posted_at >= ?)")
+        params.append(int(now - filters['posted_within_days'] * SECONDS_PER_DAY))
+
+    if application.get('min_match_score') is not None:
+        clauses.append("(j.match_score IS NULL OR j.match_score >= ?)")
+        params.append(application['min_match_score'])
+
+    return CompiledFilter("\n    AND ".join(clauses), params)
+
+
+def select_matching_jobs(storage, preferences: Optional[Dict] = None, limit: Optional[int] = None,
+                         order_by_score: bool = False) -> List[Dict]:
+    """Fetch unapplied jobs that pass every rule in preferences.json"""
+    compiled = compile_preferences(preferences or load_preferences())
+    return storage.fetch_all(filtered_jobs_query(compiled.where, order_by_score),
+                             compiled.params + [limit if limit else -1])
@@ -0,0 +1,258 @@
+"""
+Per-company cache of application form schemas
+- A form is described by its fields' stable selectors (name/id attributes, not
+  snapshot uids, which change on every page load), kinds, labels and options
+- The cache maps (platform, company, fingerprint of that description) to the
+  field -> profile / resume / Q&A template plan worked out on the first visit
+- A repeat visit runs PROBE_SCRIPT (one evaluate_script instead of a full
+  take_snapshot); on a fingerprint hit it fills straight from the cached plan
+- A changed form misses and is planned afresh; plans made against older Q&A
+  templates are re-planned from the stored fields, without a snapshot
+
+    python -m jobpilot.forms --list
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+MAX_FORMS_PER_COMPANY = 4  # a company can run several forms (e.g. per department); older ones are pruned
+
+# For chrome-devtools evaluate_script: every visible field with a selector that survives reloads
+PROBE_SCRIPT = """() => Array.from(document.querySelectorAll('input, select, textarea'))
+  .filter(el => !['hidden', 'submit', 'button'].includes(el.type) && (el.name || el.id))
+  .map(el => ({
+    selector: el.name ? `[name="${el.name}"]` : `#${el.id}`,
+    kind: el.tagName === 'INPUT' ? el.type : el.tagName.toLowerCase(),
+    label: ((el.labels && el.labels[0] && el.labels[0].innerText) || el.getAttribute('aria-label')
+            || el.placeholder || '').trim(),
+    required: el.required,
+    options: el.tagName === 'SELECT' ? Array.from(el.options).map(o => o.text.trim())
+             : el.type === 'radio' && el.labels && el.labels[0] ? [el.labels[0].innerText.trim()] : [],
+  }))"""
+
+# Checked in order against the label, then the selector; the first match names the profile.json value
+PROFILE_FIELDS = [(re.compile(pattern), key) for pattern, key in [
+    (r"first.?name|given.?name|preferred.?name", "personal_info.first_name"),
+    (r"last.?name|family.?name|surname", "personal_info.last_name"),
+    (r"full.?name|legal.?name|^name$|\[name\]", "personal_info.full_name"),
+    (r"e-?mail", "personal_info.email"),
+    (r"phone|mobile", "personal_info.phone"),
+    (r"linkedin", "online_presence.linkedin_url"),
+    (r"github", "online_presence.github_url"),
+    (r"portfolio|website|personal.?site", "online_presence.portfolio_url"),
+    (r"^city$|current.?location|^location", "personal_info.address.city"),
+    (r"^state$|province", "personal_info.address.state"),
+    (r"country", "personal_info.address.country"),
+    (r"pronoun", "personal_info.pronouns"),
+]]
+RESUME_UPLOAD = re.compile(r"resume|cv\b|curriculum")
+
+# Plan entries: where a field's value comes from
+PROFILE = 'profile'
+RESUME = 'resume'
+QA = 'qa'
+MANUAL = 'manual'  # needs the user or an AI-drafted answer
+
+UPSERT_SCHEMA_SQL = """
+INSERT INTO form_schemas (platform, company, fingerprint, fields, plan, qa_version, hits, created_at, last_used_at)
+VALUES (?, ?, ?, ?, ?, ?, 0, ?, ?)
+ON CONFLICT(platform, company, fingerprint) DO UPDATE SET
+    fields = excluded.fields, plan = excluded.plan, qa_version = excluded.qa_version,
+    last_used_at = excluded.last_used_at
+"""
+
+PRUNE_SQL = """
+DELETE FROM form_schemas
+WHERE platform = ? AND company = ?
+AND fingerprint NOT IN (
+    SELECT fingerprint FROM form_schemas WHERE platform = ? AND company = ?
+    ORDER BY last_used_at DESC LIMIT ?
+)
+"""
+
+
+class FormField(NamedTuple):
+    selector: str
+    kind: str
+    label: str
+    required: bool = False
+    options: Tuple[str, ...] = ()
+
+
+def normalize_label(label: str) -> str:
+    return re.sub(r"\s+", " ", label.lower()).strip(" *:?")
+
+
+def fields_from_probe(probed: Sequence[Dict]) -> List[FormField]:
+    """FormFields from PROBE_SCRIPT output; radio buttons collapse into one field per group"""
+    fields: Dict[str, FormField] = {}
+    for item in probed:
+        selector = item['selector']
+        options = tuple(item.get('options') or ())
+        known = fields.get(selector)
+        if known is not None:
+            fields[selector] = known._replace(options=known.options + options)
+            continue
+        fields[selector] = FormField(selector, item.get('kind') or 'text', item.get('label') or '',
+                                     bool(item.get('required')), options)
+    return list(fields.values())
+
+
+def fingerprint(fields: Sequence[FormField]) -> str:
+    """Stable digest of a form's structure (order-insensitive, label case/punctuation ignored)"""
+    shape = sorted((f.selector, f.kind, normalize_label(f.label), f.required, list(f.options)) for f in fields)
+    return hashlib.blake2b(json.dumps(shape).encode(), digest_size=16).hexdigest()
+
+
+def qa_version(templates, semantic: bool = False) -> str:
+    """Digest of the Q&A templates a plan was matched against (and whether semantic fallback was on)"""
+    shape = [(t.id, t.question_patterns) for t in templates] + (["semantic"] if semantic else [])
+    return hashlib.blake2b(json.dumps(shape).encode(), digest_size=8).hexdigest()
+
+
+def _profile_key(f: FormField) -> Optional[str]:
+    for text in (normalize_label(f.label), f.selector.lower()):
+        for pattern, key in PROFILE_FIELDS:
+            if text and pattern.search(text):
+                return key
+    return None
+
+
+def plan_form(fields: Sequence[FormField], matcher) -> Dict[str, Dict]:
+    """selector -> {'source': profile|resume|qa|manual, ...} for every field of the form"""
+    plan = {}
+    for f in fields:
+        if f.kind == 'file':
+            text = f"{normalize_label(f.label)} {f.selector.lower()}"
+            plan[f.selector] = {'source': RESUME} if RESUME_UPLOAD.search(text) else {'source': MANUAL}
+            continue
+        key = _profile_key(f)
+        if key:
+            plan[f.selector] = {'source': PROFILE, 'key': key}
+            continue
+        template = matcher.match(f.label) if f.label else None
+        plan[f.selector] = {'source': QA, 'template': template.id} if template else {'source': MANUAL}
+    return plan
+
+
+def _lookup(data: Dict, dotted: str):
+    for part in dotted.split('.'):
+        if not isinstance(data, dict):
+            return None
+        data = data.get(part)
+    return data
+
+
+@dataclass
+class FormFill:
+    """What to send to fill_form / upload_file, and what still needs an answer"""
+    values: List[Dict] = field(default_factory=list)     # [{'selector', 'value'}]
+    uploads: List[Dict] = field(default_factory=list)    # [{'selector', 'path'}]
+    unresolved: List[FormField] = field(default_factory=list)
+    cached: bool = False
+
+
+def resolve(fields: Sequence[FormField], plan: Dict[str, Dict], applicant: Dict, matcher,
+            **variables) -> FormFill:
+    """Turn a plan into concrete values for this applicant (jobpilot.resumes.ResumeCache.applicant)"""
+    fill = FormFill()
+    for f in fields:
+        entry = plan.get(f.selector, {'source': MANUAL})
+        value = None
+        if entry['source'] == PROFILE:
+            value = _lookup(applicant.get('profile') or {}, entry['key'])
+        elif entry['source'] == RESUME:
+            path = (applicant.get('resume') or {}).get('path')
+            if path:
+                fill.uploads.append({'selector': f.selector, 'path': path})
+                continue
+        elif entry['source'] == QA:
+            value = matcher.answer(f.label, **variables)
+        if value:
+            fill.values.append({'selector': f.selector, 'value': str(value)})
+        elif f.required or entry['source'] != PROFILE:
+            fill.unresolved.append(f)
+    return fill
+
+
+class FormSchemaCache:
+    def __init__(self, storage, matcher):
+        self.storage = storage
+        self.matcher = matcher
+        self.qa_version = qa_version(matcher.templates, matcher.semantic is not None)
+        self.stats: Counter = Counter()
+
+    @staticmethod
+    def _key(platform: str, company: str) -> Tuple[str, str]:
+        return platform.lower(), re.sub(r"\s+", " ", company).strip().lower()
+
+    def plan(self, platform: str, company: str, fields: Sequence[FormField]) -> Tuple[Dict[str, Dict], bool]:
+        """(plan, cached): the stored plan when this company's form is unchanged, else a fresh one"""
+        platform, company = self._key(platform, company)
+        digest = fingerprint(fields)
+        now = int(time.time())
+        rows = self.storage.fetch_all(
+            "SELECT plan, qa_version FROM form_schemas WHERE platform = ? AND company = ? AND fingerprint = ?",
+            (platform, company, digest))
+        if rows and rows[0]['qa_version'] == self.qa_version:
+            self.storage.execute("""
+            UPDATE form_schemas SET hits = hits + 1, last_used_at = ?
+            WHERE platform = ? AND company = ? AND fingerprint = ?
+            """, (now, platform, company, digest))
+            self.stats['hits'] += 1
+            return json.loads(rows[0]['plan']), True
+
+        self.stats['replanned' if rows else 'misses'] += 1
+        plan = plan_form(fields, self.matcher)
+        with self.storage.transaction() as conn:
+            conn.execute(UPSERT_SCHEMA_SQL, (platform, company, digest, json.dumps([list(f) for f in fields]),
+                                             json.dumps(plan), self.qa_version, now, now))
+            conn.execute(PRUNE_SQL, (platform, company, platform, company, MAX_FORMS_PER_COMPANY))
+        return plan, False
+
+    def fill(self, platform: str, company: str, fields: Sequence[FormField], applicant: Dict,
+             **variables) -> FormFill:
+        """Plan (cached where possible) and resolve values for one application"""
+        plan, cached = self.plan(platform, company, fields)
+        variables.setdefault('company', company)
+        result = resolve(fields, plan, applicant, self.matcher, **variables)
+        result.cached = cached
+        return result
+
+    def known_forms(self, platform: str, company: str) -> List[List[FormField]]:
+        """Cached forms for a company, most recently used first"""
+        platform, company = self._key(platform, company)
+        rows = self.storage.fetch_all("""
+        SELECT fields FROM form_schemas WHERE platform = ? AND company = ? ORDER BY last_used_at DESC
+        """, (platform, company))
+        return [[FormField(*f[:4], tuple(f[4])) for f in json.loads(row['fields'])] for row in rows]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-company application form schema cache")
+    parser.add_argument("--list", action="store_true", help="print the cached forms")
+    args = parser.parse_args()
+
+    if not args.list:
+        parser.error("nothing to do")
+
+    from jobpilot.config import database_path
+    from jobpilot.storage import get_storage
+
+    for row in get_storage(database_path()).fetch_all("""
+    SELECT platform, company, fingerprint, plan, hits, last_used_at FROM form_schemas
+    ORDER BY platform, company, last_used_at DESC
+    """):
+        sources = Counter(entry['source'] for entry in json.loads(row['plan']).values())
+        print(f"{row['platform']:<12} {row['company']:<30} {row['fingerprint'][:12]}  {row['hits']:>4} hits  "
+              + ", ".join(f"{n} {source}" for source, n in sorted(sources.items())))
+
+
+if __name__ == "__main__":
+    main()
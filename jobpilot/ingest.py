@@ -0,0 +1,365 @@
+"""
+Bulk job ingestion from scraped search results
+- Streams JSONL or CSV feeds one record at a time, so memory stays bounded
+  by the batch size however large the feed is
+- Normalizes salary (hourly -> annual, same rule as the dashboard's
+  parseSalary), location type and platform, and derives stable job IDs
+- Upserts each batch inside one transaction: new IDs in one INSERT, known
+  ones in one guarded UPDATE that leaves unchanged rows (and their
+  score/dedup triggers) alone
+- New jobs are queued as unapplied applications with one set-based insert
+- Large feeds defer secondary indexes and the per-row FTS/score/dedup insert
+  triggers, then rebuild and catch up once at the end; a crashed load is
+  restored on the next ingest
+
+    jobpilot ingest search_results.jsonl exported.csv
+"""
+
+import csv
+import hashlib
+import json
+import re
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from jobpilot.platforms import GENERIC, LINKEDIN, detect_platform, linkedin_job_id, platform_for_host
+from jobpilot.schema import APP_STATS_REFRESH
+
+BATCH_SIZE = 50_000
+INGEST_CACHE_KIB = 64 * 1024  # page cache while loading; random-key inserts thrash the 2 MB default
+DEFER_INDEX_BYTES = 64 * 1024 * 1024  # feeds this large rebuild indexes once at the end
+HOURS_PER_YEAR = 2080  # 40 hours * 52 weeks
+DEFERRED_META_KEY = "ingest_deferred"
+# Per-row work a deferred load skips; restore_deferred() redoes it set-based
+DEFERRED_TRIGGERS = ("jobs_fts_ai", "jobs_fts_au", "job_score_queue_ai", "job_dedup_queue_ai", "app_stats_ai")
+KEPT_INDEXES = "'idx_applications_job_id'"  # the queue's NOT EXISTS probe needs it
+
+SALARY_NUMBER = re.compile(r"\d+[,\d]*")
+URL_HOST = re.compile(r"^[a-zA-Z][a-zA-Z0-9+.-]*://(?:[^@/?#]*@)?([^:/?#]+)")
+CREATE_PREFIX = re.compile(r"^CREATE (UNIQUE )?(INDEX|TRIGGER) (?!IF NOT EXISTS)", re.IGNORECASE)
+TRUE_STRINGS = {"1", "true", "yes", "y", "t"}
+
+# Output column -> feed field names accepted for it (first non-empty wins)
+FIELD_ALIASES: Dict[str, Tuple[str, ...]] = {
+    'id': ("id", "job_id", "jobId"),
+    'platform': ("platform", "source"),
+    'title': ("title", "job_title", "jobTitle", "position"),
+    'company': ("company", "company_name", "companyName", "employer"),
+    'location': ("location", "job_location"),
+    'location_type': ("location_type", "locationType", "workplace_type", "remote"),
+    'salary': ("salary", "salary_text", "compensation"),
+    'salary_min': ("salary_min", "salaryMin", "min_salary"),
+    'salary_max': ("salary_max", "salaryMax", "max_salary"),
+    'url': ("url", "job_url", "jobUrl", "link", "apply_url", "applyUrl"),
+    'description': ("description", "job_description", "summary", "snippet"),
+    'easy_apply': ("easy_apply", "easyApply"),
+    'posted_at': ("posted_at", "postedAt", "date_posted", "listed_at", "date"),
+    'saved_at': ("saved_at", "savedAt"),
+}
+
+JOB_COLUMNS = ("id", "platform", "title", "company", "location", "location_type",
+               "salary_min", "salary_max", "url", "description", "easy_apply", "posted_at", "saved_at")
+
+INSERT_JOBS_SQL = f"""
+INSERT INTO jobs ({", ".join(JOB_COLUMNS)})
+VALUES ({", ".join("?" for _ in JOB_COLUMNS)})
+ON CONFLICT(id) DO NOTHING
+"""
+
+# Bound to a row tuple minus saved_at (first-seen is kept). Not an UPSERT's DO UPDATE:
+# its conflict policy would override the OR IGNORE in the score/dedup queue triggers.
+# Missing optional fields never erase stored ones; unchanged rows aren't touched,
+# so their AFTER UPDATE triggers don't fire
+UPDATE_JOBS_SQL = """
+UPDATE jobs SET
+    platform = ?2, title = ?3, company = ?4,
+    location = COALESCE(?5, location), location_type = COALESCE(?6, location_type),
+    salary_min = COALESCE(?7, salary_min), salary_max = COALESCE(?8, salary_max),
+    url = ?9, description = COALESCE(?10, description), easy_apply = ?11, posted_at = COALESCE(?12, posted_at)
+WHERE id = ?1 AND (
+    platform IS NOT ?2 OR title IS NOT ?3 OR company IS NOT ?4 OR url IS NOT ?9 OR easy_apply IS NOT ?11
+    OR (?5 IS NOT NULL AND location IS NOT ?5)
+    OR (?6 IS NOT NULL AND location_type IS NOT ?6)
+    OR (?7 IS NOT NULL AND salary_min IS NOT ?7)
+    OR (?8 IS NOT NULL AND salary_max IS NOT ?8)
+    OR (?10 IS NOT NULL AND description IS NOT ?10)
+    OR (?12 IS NOT NULL AND posted_at IS NOT ?12)
+)
+"""
+
+EXISTING_IDS_SQL = "SELECT id FROM jobs WHERE id IN (SELECT value FROM json_each(?))"
+
+# One set-based statement per batch; IDs match the dashboard's app_XXXXXXXXXXXX shape
+QUEUE_APPLICATIONS_SQL = """
+INSERT INTO applications (id, job_id, status, created_at)
+SELECT 'app_' || upper(hex(randomblob(6))), ids.value, 'unapplied', ?
+FROM json_each(?) AS ids
+WHERE NOT EXISTS (SELECT 1 FROM applications a WHERE a.job_id = ids.value)
+"""
+
+
+@dataclass
+class IngestStats:
+    read: int = 0
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    skipped: int = 0
+    queued: int = 0
+
+    def add(self, other: "IngestStats"):
+        for field in self.__dataclass_fields__:
+            setattr(self, field, getattr(self, field) + getattr(other, field))
+
+
+def parse_salary(text: Optional[str]) -> Tuple[Optional[int], Optional[int]]:
+    """(min, max) annual salary from free text; hourly figures become annual"""
+    if not text:
+        return None, None
+    values = [int(n.replace(",", "")) for n in SALARY_NUMBER.findall(text)]
+    if not values:
+        return None, None
+    lower = text.lower()
+    multiplier = HOURS_PER_YEAR if "hour" in lower or "/hr" in lower else 1
+    if len(values) >= 2:
+        return values[0] * multiplier, values[1] * multiplier
+    return values[0] * multiplier, None
+
+
+def detect_location_type(text: Optional[str]) -> Optional[str]:
+    lower = (text or "").lower()
+    if "remote" in lower:
+        return "remote"
+    if "hybrid" in lower:
+        return "hybrid"
+    if "on-site" in lower or "onsite" in lower or "in-office" in lower:
+        return "onsite"
+    return None
+
+
+def platform_key(url: str) -> str:
+    """Dashboard-style platform value ('greenhouse', 'linkedin', 'other')"""
+    match = URL_HOST.match(url)
+    platform = platform_for_host(match.group(1)) if match else detect_platform(url)
+    return "other" if platform == GENERIC else platform.lower()
+
+
+def job_id_for(url: str, platform: str) -> str:
+    """Stable job ID, so re-ingesting the same posting updates it in place"""
+    if platform == LINKEDIN.lower():
+        job_id = linkedin_job_id(url)
+        if job_id:
+            return f"linkedin_{job_id}"
+    digest = hashlib.blake2b(url.strip().encode(), digest_size=8).hexdigest()
+    return f"{platform}_{digest}"
+
+
+_ABSENT = object()  # alias for a column the feed doesn't have; never a record key
+
+
+@lru_cache(maxsize=256)
+def _field_map(keys: Tuple) -> Dict[str, object]:
+    """Column -> the first of its aliases a record with these keys has (resolved once per feed shape)"""
+    present = set(keys)
+    return {column: next((name for name in aliases if name in present), _ABSENT)
+            for column, aliases in FIELD_ALIASES.items()}
+
+
+def _text(value):
+    if isinstance(value, str):
+        return value.strip() or None
+    return value
+
+
+def _int_or_none(value) -> Optional[int]:
+    if value is None:
+        return None
+    try:
+        return int(float(str(value).replace(",", "")))
+    except (ValueError, OverflowError):
+        return None
+
+
+def _timestamp(value, now: Optional[int]) -> Optional[int]:
+    """Unix seconds from seconds, milliseconds or an ISO date; now when unparseable"""
+    number = _int_or_none(value)
+    if number is None and isinstance(value, str):
+        try:
+            return int(datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp())
+        except ValueError:
+            return now
+    if number is None:
+        return now
+    return number // 1000 if number > 100_000_000_000 else number
+
+
+def normalize_record(record: Dict, now: Optional[int] = None) -> Optional[Tuple]:
+    """One feed record -> a jobs row tuple in JOB_COLUMNS order (None if unusable)"""
+    fields = _field_map(tuple(record))
+    get = record.get
+    title, company, url = _text(get(fields['title'])), _text(get(fields['company'])), _text(get(fields['url']))
+    if not (title and company and url):
+        return None
+    now = int(time.time()) if now is None else now
+
+    platform = _text(get(fields['platform']))
+    platform = str(platform).lower() if platform else platform_key(url)
+    location = _text(get(fields['location']))
+    location_type = _text(get(fields['location_type']))
+    if isinstance(location_type, bool):
+        location_type = "remote" if location_type else None
+    elif location_type:
+        location_type = detect_location_type(str(location_type)) or str(location_type).lower()
+    else:
+        location_type = detect_location_type(f"{location} {title}" if location else title)
+
+    salary_min = _int_or_none(_text(get(fields['salary_min'])))
+    salary_max = _int_or_none(_text(get(fields['salary_max'])))
+    if salary_min is None and salary_max is None:
+        salary = _text(get(fields['salary']))
+        if salary is not None:
+            salary_min, salary_max = parse_salary(str(salary))
+
+    easy_apply = _text(get(fields['easy_apply']))
+    if isinstance(easy_apply, str):
+        easy_apply = easy_apply.lower() in TRUE_STRINGS
+    job_id = _text(get(fields['id']))
+    posted_at = _text(get(fields['posted_at']))
+    saved_at = _text(get(fields['saved_at']))
+
+    return (str(job_id) if job_id else job_id_for(url, platform), platform, title, company, location,
+            location_type, salary_min, salary_max, url, _text(get(fields['description'])),
+            1 if easy_apply else 0, None if posted_at is None else _timestamp(posted_at, None),
+            now if saved_at is None else _timestamp(saved_at, now))
+
+
+def read_feed(path: Path) -> Iterator[Dict]:
+    """Stream records from a .csv file or a JSONL file (anything else is read as JSONL)"""
+    path = Path(path)
+    with open(path, encoding="utf-8", newline="") as f:
+        if path.suffix.lower() == ".csv":
+            yield from csv.DictReader(f)
+            return
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(record, dict):
+                yield record
+
+
+def _batches(records: Iterable[Dict], size: int, now: int, stats: IngestStats) -> Iterator[List[Tuple]]:
+    # Keyed by job ID so a posting repeated inside one batch is written once (last wins)
+    batch: Dict[str, Tuple] = {}
+    for record in records:
+        stats.read += 1
+        row = normalize_record(record, now)
+        if row is None:
+            stats.skipped += 1
+            continue
+        batch[row[0]] = row
+        if len(batch) >= size:
+            yield list(batch.values())
+            batch = {}
+    if batch:
+        yield list(batch.values())
+
+
+class JobIngester:
+    """Upserts streamed feed records into jobs (and queues new ones as unapplied)"""
+
+    def __init__(self, storage, batch_size: int = BATCH_SIZE, queue_applications: bool = True):
+        self.storage = storage
+        self.batch_size = batch_size
+        self.queue_applications = queue_applications
+
+    def _write_batch(self, rows: List[Tuple], now: int) -> IngestStats:
+        stats = IngestStats()
+        rows.sort(key=lambda row: row[0])  # primary-key order keeps B-tree writes local
+        ids = json.dumps([row[0] for row in rows])
+        with self.storage.transaction() as conn:
+            existing = {row[0] for row in conn.execute(EXISTING_IDS_SQL, (ids,))}
+            stats.inserted = conn.executemany(
+                INSERT_JOBS_SQL, (row for row in rows if row[0] not in existing)).rowcount
+            stats.updated = conn.executemany(
+                UPDATE_JOBS_SQL, (row[:-1] for row in rows if row[0] in existing)).rowcount
+            if self.queue_applications:
+                stats.queued = conn.execute(QUEUE_APPLICATIONS_SQL, (now, ids)).rowcount
+        stats.unchanged = len(existing) - stats.updated
+        return stats
+
+    def ingest(self, records: Iterable[Dict], defer_indexes: bool = False) -> IngestStats:
+        """Upsert records in batch_size transactions; returns the counts"""
+        now = int(time.time())
+        stats = IngestStats()
+        conn = self.storage.connection
+        cache_size = conn.execute("PRAGMA cache_size").fetchone()[0]
+        conn.execute(f"PRAGMA cache_size = {-INGEST_CACHE_KIB}")
+        self.restore_deferred()
+        if defer_indexes:
+            self._defer_indexes()
+        try:
+            for rows in _batches(records, self.batch_size, now, stats):
+                stats.add(self._write_batch(rows, now))
+        finally:
+            if defer_indexes:
+                self.restore_deferred()
+            conn.execute(f"PRAGMA cache_size = {cache_size}")
+        return stats
+
+    def ingest_files(self, paths: Iterable[Path], defer_indexes: Optional[bool] = None) -> IngestStats:
+        """Ingest feeds in order; defer_indexes=None defers only for large feeds"""
+        paths = [Path(p) for p in paths]
+        if defer_indexes is None:
+            defer_indexes = sum(p.stat().st_size for p in paths) >= DEFER_INDEX_BYTES
+
+        def records() -> Iterator[Dict]:
+            for path in paths:
+                yield from read_feed(path)
+
+        return self.ingest(records(), defer_indexes=defer_indexes)
+
+    def _defer_indexes(self):
+        """Drop the per-row index/trigger work, remembering its SQL and where the new rows start"""
+        with self.storage.transaction() as conn:
+            objects = conn.execute(f"""
+                SELECT type, name, sql FROM sqlite_master
+                WHERE sql IS NOT NULL AND (
+                    (type = 'index' AND tbl_name IN ('jobs', 'applications') AND name NOT IN ({KEPT_INDEXES}))
+                    OR (type = 'trigger' AND name IN ({", ".join("?" for _ in DEFERRED_TRIGGERS)}))
+                )
+            """, DEFERRED_TRIGGERS).fetchall()
+            high_water = conn.execute("SELECT COALESCE(MAX(rowid), 0) FROM jobs").fetchone()[0]
+            conn.execute("INSERT OR REPLACE INTO jobpilot_meta (key, value) VALUES (?, ?)", (
+                DEFERRED_META_KEY, json.dumps({'rowid': high_water, 'objects': [list(o) for o in objects]})))
+            for kind, name, _sql in objects:
+                conn.execute(f'DROP {kind.upper()} IF EXISTS "{name}"')
+
+    def restore_deferred(self) -> bool:
+        """Recreate what a (possibly crashed) deferred load dropped and catch up FTS, queues and app_stats"""
+        rows = self.storage.fetch_all("SELECT value FROM jobpilot_meta WHERE key = ?", (DEFERRED_META_KEY,))
+        if not rows:
+            return False
+        deferred = json.loads(rows[0]['value'])
+        with self.storage.transaction() as conn:
+            for _kind, _name, sql in deferred['objects']:
+                conn.execute(CREATE_PREFIX.sub(r"CREATE \1\2 IF NOT EXISTS ", sql, count=1))
+            conn.execute("INSERT INTO jobs_fts(jobs_fts) VALUES ('rebuild')")
+            # Rows inserted meanwhile skipped the AFTER INSERT queue triggers
+            conn.execute("INSERT OR IGNORE INTO job_score_queue (job_id) SELECT id FROM jobs WHERE rowid > ?",
+                         (deferred['rowid'],))
+            conn.execute("""INSERT OR IGNORE INTO job_dedup_queue (job_id)
+                            SELECT id FROM jobs WHERE rowid > ? ORDER BY rowid""", (deferred['rowid'],))
+            # ...and applications queued meanwhile skipped app_stats_ai
+            for statement in APP_STATS_REFRESH:
+                conn.execute(statement)
+            conn.execute("DELETE FROM jobpilot_meta WHERE key = ?", (DEFERRED_META_KEY,))
+        return True
@@ -0,0 +1,172 @@
+"""
+Run journal for resumable batch runs
+- One row per job: owning run ID, state, attempt count and lease expiry
+- Jobs are claimed atomically with UPDATE ... RETURNING, so two runners never
+  hold the same job and a restarted runner continues where the last one stopped
+- Finished states are written immediately; they are the checkpoint, and
+  reconcile() replays any 'applied' status lost from the write-behind queue
+- Failed jobs are classified (jobpilot.retry); retryable ones wait in state
+  'retry' until retry_at and only then can be claimed again
+"""
+
+import random
+import time
+import uuid
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from jobpilot.retry import classify_failure, retry_delay
+
+PENDING = 'pending'
+CLAIMED = 'claimed'
+DONE = 'done'
+FAILED = 'failed'
+SKIPPED = 'skipped'
+RETRY = 'retry'
+FINAL_STATES = (DONE, FAILED, SKIPPED)
+
+DEFAULT_LEASE_SECONDS = 30 * 60
+
+CLAIM_SQL = """
+UPDATE run_journal
+SET run_id = ?, state = 'claimed', attempts = attempts + 1, lease_expires = ?, updated_at = ?
+WHERE job_id IN (
+    SELECT job_id FROM run_journal
+    WHERE (state = 'pending' OR (state = 'retry' AND retry_at <= ?) OR (state = 'claimed' AND lease_expires < ?))
+    AND job_id IN (SELECT job_id FROM applications WHERE status = 'unapplied')
+    ORDER BY position
+    LIMIT ?
+)
+RETURNING job_id, position
+"""
+
+JOB_COLUMNS = "id, title, company, location, url, platform, match_score"
+
+
+def new_run_id() -> str:
+    return f"{time.strftime('%Y%m%d_%H%M%S')}-{uuid.uuid4().hex[:8]}"
+
+
+class RunJournal:
+    def __init__(self, storage, run_id: Optional[str] = None, lease_seconds: int = DEFAULT_LEASE_SECONDS,
+                 resumed: Optional[bool] = None):
+        self.storage = storage
+        self.lease_seconds = lease_seconds
+        self.rng = random.Random()
+        # A given run_id means --resume, unless the caller chose a fresh ID itself
+        self.resumed = run_id is not None if resumed is None else resumed
+        self.run_id = run_id or new_run_id()
+        if self.resumed:
+            self._release_own_claims()
+        self.reconcile()
+
+    def reconcile(self):
+        """Re-apply 'applied' statuses whose write-behind flush was lost in a crash"""
+        self.storage.execute("""
+        UPDATE applications
+        SET status = 'applied',
+            applied_at = COALESCE(applied_at, (SELECT updated_at FROM run_journal r WHERE r.job_id = applications.job_id))
+        WHERE status = 'unapplied'
+        AND job_id IN (SELECT job_id FROM run_journal WHERE state = 'done')
+        """)
+
+    def _release_own_claims(self):
+        """Resuming a crashed run: its unfinished claims go straight back to the queue"""
+        self.storage.execute("""
+        UPDATE run_journal SET state = 'pending', lease_expires = NULL, updated_at = ?
+        WHERE run_id = ? AND state = 'claimed'
+        """, (int(time.time()), self.run_id))
+
+    def enqueue(self, job_ids: Iterable[str]) -> int:
+        """Add jobs to the journal; jobs already journaled (in any state) are left alone"""
+        now = int(time.time())
+        with self.storage.transaction() as conn:
+            start = conn.execute("SELECT COALESCE(MAX(position), 0) FROM run_journal").fetchone()[0]
+            before = conn.total_changes
+            conn.executemany("""
+            INSERT INTO run_journal (job_id, run_id, state, attempts, position, updated_at)
+            VALUES (?, ?, 'pending', 0, ?, ?)
+            ON CONFLICT(job_id) DO NOTHING
+            """, ((job_id, self.run_id, start + i, now) for i, job_id in enumerate(job_ids, 1)))
+            return conn.total_changes - before
+
+    def claim(self, limit: int) -> List[Dict]:
+        """Lease up to limit queued jobs for this run and return their job rows"""
+        now = int(time.time())
+        with self.storage.transaction() as conn:
+            claimed = conn.execute(CLAIM_SQL, (self.run_id, now + self.lease_seconds, now, now, now, limit)).fetchall()
+        if not claimed:
+            return []
+
+        # RETURNING order is unspecified; restore queue order
+        ids = [row[0] for row in sorted(claimed, key=lambda row: row[1])]
+        placeholders = ",".join("?" * len(ids))
+        jobs = {row['id']: row for row in self.storage.fetch_all(
+            f"SELECT {JOB_COLUMNS} FROM jobs WHERE id IN ({placeholders})", ids)}
+        return [jobs[job_id] for job_id in ids if job_id in jobs]
+
+    def renew(self):
+        """Extend the lease on every job this run still holds"""
+        now = int(time.time())
+        self.storage.execute("""
+        UPDATE run_journal SET lease_expires = ?, updated_at = ?
+        WHERE run_id = ? AND state = 'claimed'
+        """, (now + self.lease_seconds, now, self.run_id))
+
+    def finish(self, job_id: str, state: str, note: str = ""):
+        """Checkpoint a job's outcome; only the run holding the lease can finish it"""
+        if state not in FINAL_STATES:
+            raise ValueError(f"Not a final journal state: {state}")
+        self.storage.execute("""
+        UPDATE run_journal SET state = ?, note = ?, lease_expires = NULL, updated_at = ?
+        WHERE job_id = ? AND run_id = ? AND state = 'claimed'
+        """, (state, note, int(time.time()), job_id, self.run_id))
+
+    def fail(self, job_id: str, error: str) -> Tuple[str, Optional[float]]:
+        """Checkpoint a failed attempt: schedule a retry with backoff, or fail for good
+
+        Returns (failure class, seconds until the retry) with None for no retry
+        """
+        failure_class = classify_failure(error)
+        now = int(time.time())
+        with self.storage.transaction() as conn:
+            row = conn.execute("""
+            SELECT attempts FROM run_journal WHERE job_id = ? AND run_id = ? AND state = 'claimed'
+            """, (job_id, self.run_id)).fetchone()
+            if row is None:
+                return failure_class, None
+            delay = retry_delay(failure_class, row[0], self.rng)
+            conn.execute("""
+            UPDATE run_journal SET state = ?, note = ?, failure_class = ?, retry_at = ?, lease_expires = NULL,
+                updated_at = ?
+            WHERE job_id = ? AND run_id = ? AND state = 'claimed'
+            """, (FAILED if delay is None else RETRY, f"Error: {error}", failure_class,
+                  None if delay is None else now + int(delay), now, job_id, self.run_id))
+        return failure_class, delay
+
+    def retry_summary(self) -> List[Dict]:
+        """Failed and waiting jobs per failure class, with how many are due now"""
+        return self.storage.fetch_all("""
+        SELECT state, COALESCE(failure_class, 'unclassified') AS failure_class, COUNT(*) AS n,
+               SUM(state = 'retry' AND retry_at <= ?) AS due, MIN(retry_at) AS next_retry_at
+        FROM run_journal WHERE state IN ('retry', 'failed')
+        GROUP BY 1, 2 ORDER BY 1 DESC, 2
+        """, (int(time.time()),))
+
+    def requeue(self, failure_class: str) -> int:
+        """Put jobs that failed for good with failure_class back in the queue (e.g. after solving a captcha)"""
+        with self.storage.transaction() as conn:
+            return conn.execute("""
+            UPDATE run_journal SET state = 'pending', attempts = 0, retry_at = NULL, updated_at = ?
+            WHERE state = 'failed' AND COALESCE(failure_class, 'unclassified') = ?
+            """, (int(time.time()), failure_class)).rowcount
+
+    def summary(self) -> Dict[str, int]:
+        """Job counts per state for this run"""
+        rows = self.storage.fetch_all(
+            "SELECT state, COUNT(*) AS n FROM run_journal WHERE run_id = ? GROUP BY state", (self.run_id,))
+        return {row['state']: row['n'] for row in rows}
+
+    def remaining(self) -> int:
+        """Jobs still queued, leased or waiting to retry, across all runs"""
+        return self.storage.fetch_all(
+            "SELECT COUNT(*) AS n FROM run_journal WHERE state IN ('pending', 'claimed', 'retry')")[0]['n']
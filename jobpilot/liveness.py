@@ -0,0 +1,294 @@
+"""
+Pre-flight liveness check for job postings
+- Checks posting URLs concurrently before any browser worker is assigned,
+  over keep-alive connections pooled per host (a few in flight per host)
+- Revalidates with a conditional GET (If-None-Match / If-Modified-Since), so
+  an unchanged posting costs a 304; HEAD is used where the status code alone
+  answers (hosts that 404 closed postings)
+- open / closed / redirected results are cached in posting_liveness with a
+  per-state TTL; closed and redirected-away postings are dropped from the queue
+- Network errors, 429s and 5xx are 'unknown': never cached, never dropped
+- LinkedIn postings can't be probed, but the external apply URL they lead to
+  can: when the resolver has one cached (platform_redirects), that is checked
+"""
+
+import http.client
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+
+from jobpilot.platforms import LINKEDIN, PlatformResolver, detect_platform
+
+OPEN = 'open'
+CLOSED = 'closed'
+REDIRECTED = 'redirected'
+UNKNOWN = 'unknown'
+DROPPED_STATES = (CLOSED, REDIRECTED)
+
+# Seconds a result stays fresh; unknown results are never cached
+STATE_TTL = {OPEN: 6 * 3600, CLOSED: 7 * 86400, REDIRECTED: 86400}
+
+DEFAULT_WORKERS = 16
+PER_HOST_CONNECTIONS = 4
+DEFAULT_TIMEOUT = 10.0
+MAX_REDIRECTS = 5
+BODY_LIMIT = 64 * 1024  # closed-posting banners sit near the top of the page
+
+# Hosts whose closed postings return 404/410, so HEAD is enough
+HEAD_PLATFORMS = {'Lever', 'Ashby'}
+# Login walls and bot checks make these unanswerable without a browser
+SKIP_PLATFORMS = {LINKEDIN}
+
+CLOSED_STATUSES = {404, 410}
+CLOSED_MARKERS = (
+    b"no longer accepting applications",
+    b"no longer available",
+    b"job is closed",
+    b"position has been filled",
+    b"this job has expired",
+    b"job not found",
+    b"posting has closed",
+    b"no longer open",
+)
+CLOSED_QUERY_MARKERS = ("error=true", "gh_jid=&")
+
+REQUEST_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (compatible; JobPilot preflight)',
+    'Accept': 'text/html,application/xhtml+xml',
+    'Accept-Encoding': 'identity',
+}
+
+UPSERT_LIVENESS_SQL = """
+INSERT INTO posting_liveness (url, state, http_status, final_url, etag, last_modified, checked_at, expires_at)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(url) DO UPDATE SET
+    state = excluded.state,
+    http_status = excluded.http_status,
+    final_url = excluded.final_url,
+    etag = COALESCE(excluded.etag, posting_liveness.etag),
+    last_modified = COALESCE(excluded.last_modified, posting_liveness.last_modified),
+    checked_at = excluded.checked_at,
+    expires_at = excluded.expires_at
+"""
+
+
+class Response(NamedTuple):
+    status: int
+    url: str  # after redirects
+    headers: Dict[str, str]
+    body: bytes
+    redirected: bool
+
+
+@dataclass
+class Liveness:
+    url: str
+    state: str
+    http_status: Optional[int] = None
+    final_url: Optional[str] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    cached: bool = False
+
+
+class HttpPool:
+    """Keep-alive HTTP(S) connections reused per host, at most per_host in flight"""
+
+    def __init__(self, timeout: float = DEFAULT_TIMEOUT, per_host: int = PER_HOST_CONNECTIONS):
+        self.timeout = timeout
+        self.per_host = per_host
+        self._lock = threading.Lock()
+        self._idle: Dict[Tuple[str, str, int], List[http.client.HTTPConnection]] = {}
+        self._slots: Dict[Tuple[str, str, int], threading.BoundedSemaphore] = {}
+
+    def _key(self, url: str) -> Tuple[str, str, int]:
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https') or not parts.hostname:
+            raise ValueError(f"Not an HTTP URL: {url}")
+        return parts.scheme, parts.hostname, parts.port or (443 if parts.scheme == 'https' else 80)
+
+    def _connection(self, key) -> http.client.HTTPConnection:
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop()
+        scheme, host, port = key
+        cls = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+        return cls(host, port, timeout=self.timeout)
+
+    def _release(self, key, conn: http.client.HTTPConnection):
+        with self._lock:
+            self._idle.setdefault(key, []).append(conn)
+
+    def request(self, method: str, url: str, headers: Optional[Dict[str, str]] = None) -> Tuple[int, Dict, bytes]:
+        """One request/response on a pooled connection (no redirect handling)"""
+        key = self._key(url)
+        with self._lock:
+            slot = self._slots.setdefault(key, threading.BoundedSemaphore(self.per_host))
+        parts = urlsplit(url)
+        target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        with slot:
+            conn = self._connection(key)
+            try:
+                conn.request(method, target, headers={**REQUEST_HEADERS, **(headers or {})})
+                response = conn.getresponse()
+                body = response.read(BODY_LIMIT) if method != 'HEAD' else b""
+                if method != 'HEAD' and not response.isclosed():
+                    # Body longer than we care about: drain a little more, else drop the connection
+                    response.read(BODY_LIMIT)
+                reusable = response.isclosed() and not response.will_close
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                raise
+            if reusable:
+                self._release(key, conn)
+            else:
+                conn.close()
+            return response.status, {k.lower(): v for k, v in response.getheaders()}, body
+
+    def fetch(self, method: str, url: str, headers: Optional[Dict[str, str]] = None) -> Response:
+        """Follow up to MAX_REDIRECTS redirects; conditional headers only go on the first hop"""
+        current, redirected = url, False
+        for _ in range(MAX_REDIRECTS + 1):
+            status, response_headers, body = self.request(method, current, headers)
+            location = response_headers.get('location')
+            if status not in (301, 302, 303, 307, 308) or not location:
+                return Response(status, current, response_headers, body, redirected)
+            current, redirected, headers = urljoin(current, location), True, None
+        return Response(status, current, response_headers, body, redirected)
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for conn in connections:
+                conn.close()
+
+
+def _job_token(url: str) -> str:
+    """Last non-empty path segment: the posting ID on every ATS we target"""
+    segments = [s for s in urlsplit(url).path.split("/") if s]
+    return segments[-1] if segments else ""
+
+
+def classify(url: str, response: Response) -> str:
+    """open / closed / redirected / unknown from the final response"""
+    if response.status in CLOSED_STATUSES:
+        return CLOSED
+    if response.status == 429 or response.status >= 500:
+        return UNKNOWN
+    final = urlsplit(response.url)
+    if any(marker in final.query for marker in CLOSED_QUERY_MARKERS):
+        return CLOSED
+    token = _job_token(url)
+    if response.redirected and token and token not in final.path:
+        # Sent to a board or careers page instead of the posting
+        return REDIRECTED
+    if response.status >= 400:
+        return UNKNOWN
+    body = response.body.lower()
+    if any(marker in body for marker in CLOSED_MARKERS):
+        return CLOSED
+    return OPEN
+
+
+class LivenessChecker:
+    """Checks postings in parallel, caching results in posting_liveness"""
+
+    def __init__(self, storage, pool: Optional[HttpPool] = None, workers: int = DEFAULT_WORKERS,
+                 ttl: Optional[Dict[str, int]] = None, resolver: Optional[PlatformResolver] = None):
+        self.storage = storage
+        self.pool = pool or HttpPool()
+        # Cached LinkedIn -> external apply URL redirects; never follows new ones
+        self.resolver = resolver
+        self.workers = workers
+        self.ttl = STATE_TTL if ttl is None else ttl
+
+    def probe_url(self, url: str) -> str:
+        """The URL worth checking for a job: its cached external apply URL, else the job URL itself"""
+        hit = self.resolver.cached(url) if self.resolver else None
+        return hit[0] if hit else url
+
+    def _cached(self, urls: List[str]) -> Dict[str, Dict]:
+        if not urls:
+            return {}
+        rows = self.storage.fetch_all(
+            "SELECT * FROM posting_liveness WHERE url IN (SELECT value FROM json_each(?))", (json.dumps(urls),))
+        return {row['url']: row for row in rows}
+
+    def check_url(self, url: str, cached: Optional[Dict] = None) -> Liveness:
+        """Live check, revalidating the cached result when there is one"""
+        platform = detect_platform(url)
+        if platform in SKIP_PLATFORMS:
+            return Liveness(url, UNKNOWN)
+        headers = {}
+        if cached and cached['state'] != CLOSED:
+            if cached['etag']:
+                headers['If-None-Match'] = cached['etag']
+            if cached['last_modified']:
+                headers['If-Modified-Since'] = cached['last_modified']
+        method = 'GET' if headers or platform not in HEAD_PLATFORMS else 'HEAD'
+        try:
+            response = self.pool.fetch(method, url, headers)
+        except (OSError, http.client.HTTPException, ValueError):
+            return Liveness(url, UNKNOWN)
+        if response.status == 304 and cached:
+            return Liveness(url, cached['state'], 304, cached['final_url'], cached['etag'], cached['last_modified'])
+        if method == 'HEAD' and response.status == 405:
+            return self._check_with_get(url)
+        return Liveness(url, classify(url, response), response.status, response.url,
+                        response.headers.get('etag'), response.headers.get('last-modified'))
+
+    def _check_with_get(self, url: str) -> Liveness:
+        try:
+            response = self.pool.fetch('GET', url)
+        except (OSError, http.client.HTTPException, ValueError):
+            return Liveness(url, UNKNOWN)
+        return Liveness(url, classify(url, response), response.status, response.url,
+                        response.headers.get('etag'), response.headers.get('last-modified'))
+
+    def check(self, urls: Iterable[str], refresh: bool = False) -> Dict[str, Liveness]:
+        """url -> Liveness; fresh cached results are reused unless refresh"""
+        urls = list(dict.fromkeys(urls))
+        now = int(time.time())
+        cached = self._cached(urls)
+        results: Dict[str, Liveness] = {}
+        to_check = []
+        for url in urls:
+            row = cached.get(url)
+            if row and not refresh and row['expires_at'] > now:
+                results[url] = Liveness(url, row['state'], row['http_status'], row['final_url'],
+                                        row['etag'], row['last_modified'], cached=True)
+            else:
+                to_check.append(url)
+
+        if to_check:
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(to_check)),
+                                    thread_name_prefix="jobpilot-preflight") as executor:
+                for result in executor.map(lambda u: self.check_url(u, cached.get(u)), to_check):
+                    results[result.url] = result
+            self._store([results[url] for url in to_check], now)
+        return results
+
+    def _store(self, results: List[Liveness], now: int):
+        rows = [(r.url, r.state, r.http_status, r.final_url, r.etag, r.last_modified, now, now + self.ttl[r.state])
+                for r in results if r.state in self.ttl]
+        if rows:
+            with self.storage.transaction() as conn:
+                conn.executemany(UPSERT_LIVENESS_SQL, rows)
+
+    def filter_open(self, jobs: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+        """(jobs to keep, jobs dropped as closed or redirected away)"""
+        probes = {job['url']: self.probe_url(job['url']) for job in jobs}
+        results = self.check(probes.values())
+        kept, dropped = [], []
+        for job in jobs:
+            (dropped if results[probes[job['url']]].state in DROPPED_STATES else kept).append(job)
+        return kept, dropped
+
+    def close(self):
+        self.pool.close()
@@ -0,0 +1,217 @@
+"""
+Per-stage timing histograms and per-platform counters for batch runs
+- Fixed log-spaced buckets: observe() is a bisect and two adds under a lock
+- p50/p95/p99 are interpolated from the buckets, as Prometheus would
+- Served as Prometheus text on a local HTTP port and folded into the final report
+"""
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+# Pipeline stages
+DB_FETCH = 'db_fetch'
+NAVIGATE = 'navigate'
+PLATFORM_DETECT = 'platform_detect'
+FORM_FILL = 'form_fill'
+SUBMIT = 'submit'
+DB_UPDATE = 'db_update'
+DB_FINISH = 'db_finish'  # status write + journal checkpoint once a worker reports success
+SLEEP = 'sleep'
+BROWSER = 'browser'  # whole worker round trip, when the session doesn't report its own steps
+SCREENSHOT = 'screenshot'  # hashing + queueing captures; encoding runs off the hot path
+PREFLIGHT = 'preflight'  # posting liveness checks for the whole selection
+STAGES = [DB_FETCH, PREFLIGHT, NAVIGATE, PLATFORM_DETECT, FORM_FILL, SUBMIT, DB_UPDATE, DB_FINISH, SLEEP, BROWSER,
+          SCREENSHOT]
+
+# 1ms .. ~20min in x1.5 steps
+BUCKET_BOUNDS: List[float] = [0.001 * 1.5 ** i for i in range(35)]
+QUANTILES = (0.5, 0.95, 0.99)
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Histogram:
+    def __init__(self, bounds: List[float] = BUCKET_BOUNDS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # last bucket is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def merge(self, other: "Histogram"):
+        for i, n in enumerate(other.counts):
+            self.counts[i] += n
+        self.count += other.count
+        self.sum += other.sum
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Linear interpolation inside the bucket holding the q-th observation"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if seen + n >= rank and n:
+                lower = self.bounds[i - 1] if i > 0 else 0.0
+                upper = self.bounds[i] if i < len(self.bounds) else self.bounds[-1]
+                return lower + (upper - lower) * (rank - seen) / n
+            seen += n
+        return self.bounds[-1]
+
+
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: Dict[Tuple[str, str], Histogram] = {}
+        self._counters: Dict[Tuple[str, str], float] = {}
+        self.started = time.time()
+
+    def observe(self, stage: str, seconds: float, platform: str = ""):
+        with self._lock:
+            histogram = self._histograms.get((stage, platform))
+            if histogram is None:
+                histogram = self._histograms[(stage, platform)] = Histogram()
+            histogram.observe(seconds)
+
+    @contextmanager
+    def timer(self, stage: str, platform: str = ""):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start, platform)
+
+    def inc(self, name: str, platform: str = "", value: float = 1):
+        with self._lock:
+            self._counters[(name, platform)] = self._counters.get((name, platform), 0) + value
+
+    def _copy(self) -> Tuple[Dict[Tuple[str, str], Histogram], Dict[Tuple[str, str], float]]:
+        with self._lock:
+            histograms = {}
+            for key, histogram in self._histograms.items():
+                copy = Histogram(histogram.bounds)
+                copy.merge(histogram)
+                histograms[key] = copy
+            return histograms, dict(self._counters)
+
+    def snapshot(self) -> Dict:
+        """Stage timings (all platforms combined) and per-platform counters, JSON-ready"""
+        histograms, counters = self._copy()
+        stages: Dict[str, Histogram] = {}
+        for (stage, _), histogram in histograms.items():
+            stages.setdefault(stage, Histogram()).merge(histogram)
+
+        def summary(h: Histogram) -> Dict:
+            return {'count': h.count, 'total_seconds': round(h.sum, 3),
+                    **{f"p{int(q * 100)}": round(h.quantile(q), 4) for q in QUANTILES}}
+
+        by_platform: Dict[str, Dict] = {}
+        for (name, platform), value in counters.items():
+            by_platform.setdefault(platform or 'all', {})[name] = value
+        return {
+            'stages': {stage: summary(h) for stage, h in sorted(stages.items(), key=lambda kv: _stage_order(kv[0]))},
+            'stage_platforms': {f"{stage}/{platform}": summary(h)
+                                for (stage, platform), h in sorted(histograms.items()) if platform},
+            'counters': by_platform,
+        }
+
+    def prometheus_text(self) -> str:
+        histograms, counters = self._copy()
+        lines = ["# HELP jobpilot_stage_seconds Time spent per pipeline stage",
+                 "# TYPE jobpilot_stage_seconds histogram"]
+        for (stage, platform), h in sorted(histograms.items()):
+            labels = f'stage="{stage}",platform="{_escape(platform)}"'
+            cumulative = 0
+            for bound, n in zip(h.bounds, h.counts):
+                cumulative += n
+                lines.append(f'jobpilot_stage_seconds_bucket{{{labels},le="{bound:.6g}"}} {cumulative}')
+            lines.append(f'jobpilot_stage_seconds_bucket{{{labels},le="+Inf"}} {h.count}')
+            lines.append(f"jobpilot_stage_seconds_sum{{{labels}}} {h.sum:.6f}")
+            lines.append(f"jobpilot_stage_seconds_count{{{labels}}} {h.count}")
+        names = sorted({name for name, _ in counters})
+        for name in names:
+            lines.append(f"# TYPE jobpilot_{name}_total counter")
+            for (counter, platform), value in sorted(counters.items()):
+                if counter == name:
+                    lines.append(f'jobpilot_{name}_total{{platform="{_escape(platform)}"}} {value:g}')
+        lines.append("# TYPE jobpilot_run_started_seconds gauge")
+        lines.append(f"jobpilot_run_started_seconds {self.started:.3f}")
+        return "\n".join(lines) + "\n"
+
+    def format_report(self) -> str:
+        """Stage table for the end-of-run report"""
+        snapshot = self.snapshot()
+        lines = [f"{'Stage':<16} {'count':>6} {'total s':>9} {'p50 s':>8} {'p95 s':>8} {'p99 s':>8}"]
+        for stage, s in snapshot['stages'].items():
+            lines.append(f"{stage:<16} {s['count']:>6} {s['total_seconds']:>9.2f} "
+                         f"{s['p50']:>8.3f} {s['p95']:>8.3f} {s['p99']:>8.3f}")
+        for platform, counters in sorted(snapshot['counters'].items()):
+            lines.append(f"  {platform}: " + ", ".join(f"{name}={value:g}" for name, value in sorted(counters.items())))
+        return "\n".join(lines)
+
+
+def _stage_order(stage: str) -> Tuple[int, str]:
+    return (STAGES.index(stage) if stage in STAGES else len(STAGES), stage)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class InstrumentedClock:
+    """Wraps a scheduler clock so time spent in pacing sleeps lands in the sleep stage"""
+
+    def __init__(self, clock, metrics: Metrics):
+        self.clock = clock
+        self.metrics = metrics
+
+    def monotonic(self) -> float:
+        return self.clock.monotonic()
+
+    def sleep(self, seconds: float):
+        if seconds > 0:
+            self.metrics.observe(SLEEP, seconds)
+        self.clock.sleep(seconds)
+
+
+class MetricsServer:
+    """Serves metrics.prometheus_text() at http://127.0.0.1:<port>/metrics from a daemon thread"""
+
+    def __init__(self, metrics: Metrics, port: int = 9464, host: str = "127.0.0.1"):
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = metrics.prometheus_text().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", PROMETHEUS_CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        self._thread = threading.Thread(target=self.server.serve_forever, name="jobpilot-metrics", daemon=True)
+        self._thread.start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self) -> "MetricsServer":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,217 @@
+"""
+Adaptive per-platform pacing and the daily application limit
+- Each platform's minimum interval between starts is learned from outcomes:
+  clean runs shrink it step by step, while 429s, captchas and login challenges
+  double it and block the platform for a jittered exponential backoff
+- Learned intervals persist in platform_pacing, so the next run starts where
+  the last one left off instead of at the hardcoded policy
+- application.daily_limit from preferences.json is enforced across runs by
+  counting today's applied rows plus this run's reservations
+- classify() reads throttle signals and closed postings from status codes
+  and word-bounded phrases, never from inside URLs; jobpilot.retry builds on
+  the same table
+"""
+
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Optional
+
+from jobpilot.config import load_preferences
+from jobpilot.scheduler import DEFAULT_POLICIES, FALLBACK_POLICY, PlatformLimiter, PlatformPolicy
+
+# Job outcomes
+OK = 'ok'
+RATE_LIMITED = 'rate_limited'
+CAPTCHA = 'captcha'
+LOGIN_CHALLENGE = 'login_challenge'
+CLOSED = 'closed'  # the posting is gone; a plain failure as far as pacing is concerned
+ERROR = 'error'
+
+# Base backoff per throttle signal; doubled for each consecutive strike
+BACKOFF_SECONDS = {RATE_LIMITED: 60.0, CAPTCHA: 300.0, LOGIN_CHALLENGE: 900.0}
+MAX_BACKOFF_SECONDS = 3600.0
+BACKOFF_FACTOR = 2.0
+SPEEDUP_AFTER = 5        # clean results in a row before the interval shrinks
+SPEEDUP_FACTOR = 0.85
+FLOOR_FRACTION = 0.25    # never faster than this fraction of the policy's min_interval
+MAX_INTERVAL = 600.0
+
+# URLs are matched separately: job IDs, slugs and query strings are full of
+# digits and words (".../jobs/4291429", "?redirect=sign-in") that mean nothing
+URL = re.compile(r"\b(?:https?://|www\.)\S+", re.IGNORECASE)
+# "HTTP 429", "HTTP/1.1 429", "status 429", "status code: 429", "error 429"
+STATUS_CODE = re.compile(r"\b(?:http(?:/[\d.]+)?|status(?: code)?|error)[\s:=]*([1-5]\d\d)\b", re.IGNORECASE)
+STATUS_SIGNALS = {429: RATE_LIMITED, 401: LOGIN_CHALLENGE, 404: CLOSED, 410: CLOSED}
+SIGNAL_PATTERNS = [
+    (RATE_LIMITED, re.compile(r"\btoo many requests\b|\brate[- ]?limit(?:ed|ing)?\b|\bslow down\b", re.IGNORECASE)),
+    (CAPTCHA, re.compile(r"\b(?:re|h)?captcha\b|\bare you a robot\b|\bverify (?:that )?you(?: are|'re) (?:a )?human\b",
+                         re.IGNORECASE)),
+    (LOGIN_CHALLENGE, re.compile(
+        r"\blogin challenge\b|\bsecurity (?:check|checkpoint|verification)\b|\bverification code\b"
+        r"|\btwo[- ]step verification\b|\b(?:sign|log)[- ]?in required\b|\bplease (?:sign|log)[- ]?in\b"
+        r"|\b(?:sign|log)[- ]?in to (?:continue|apply|view)\b", re.IGNORECASE)),
+    # Checked last: a closed posting behind a captcha still needs the human first
+    (CLOSED, re.compile(
+        r"\bno longer (?:accepting|available)\b|\b(?:posting|job|listing|position)(?: is| has)? (?:closed|expired)\b"
+        r"|\bposition has been filled\b|\b(?:job|page|posting) not found\b|\balready applied\b"
+        r"|\bclosed or moved\b|\b(?:404 not found|410 gone)\b", re.IGNORECASE)),
+]
+# Where a session was redirected to is a signal in itself
+URL_SIGNALS = [
+    (LOGIN_CHALLENGE, re.compile(r"^[^?#]*/(?:checkpoint|authwall|uas/login)\b", re.IGNORECASE)),
+]
+
+UPSERT_PACE_SQL = """
+INSERT INTO platform_pacing (platform, min_interval, clean_streak, strikes, updated_at)
+VALUES (?, ?, ?, ?, ?)
+ON CONFLICT(platform) DO UPDATE SET
+    min_interval = excluded.min_interval,
+    clean_streak = excluded.clean_streak,
+    strikes = excluded.strikes,
+    updated_at = excluded.updated_at
+"""
+
+
+def classify(error: Optional[str]) -> str:
+    """Map an error message from a browser session onto a pacing outcome (also used by jobpilot.retry)"""
+    text = error or ""
+    urls = URL.findall(text)
+    text = URL.sub(" ", text)
+    for code in STATUS_CODE.findall(text):
+        if int(code) in STATUS_SIGNALS:
+            return STATUS_SIGNALS[int(code)]
+    for outcome, pattern in SIGNAL_PATTERNS:
+        if pattern.search(text):
+            return outcome
+    for outcome, pattern in URL_SIGNALS:
+        if any(pattern.search(url.split("://", 1)[-1]) for url in urls):
+            return outcome
+    return ERROR
+
+
+@dataclass
+class PlatformPace:
+    min_interval: float
+    clean_streak: int = 0
+    strikes: int = 0
+
+
+class PacingController:
+    def __init__(self, storage, daily_limit: Optional[int] = None,
+                 policies: Optional[Dict[str, PlatformPolicy]] = None, rng: Optional[random.Random] = None):
+        self.storage = storage
+        self.policies = DEFAULT_POLICIES if policies is None else policies
+        if daily_limit is None:
+            daily_limit = (load_preferences().get('application') or {}).get('daily_limit')
+        self.daily_limit = daily_limit
+        self.rng = rng or random.Random()
+        self._lock = threading.Lock()
+        self._limiters: Dict[str, PlatformLimiter] = {}
+        self._paces: Dict[str, PlatformPace] = {
+            row['platform']: PlatformPace(row['min_interval'], row['clean_streak'], row['strikes'])
+            for row in storage.fetch_all("SELECT * FROM platform_pacing")
+        }
+        self._day: Optional[str] = None
+        self._applied_before = 0
+        self._reserved = 0
+
+    def _policy(self, platform: str) -> PlatformPolicy:
+        return self.policies.get(platform, FALLBACK_POLICY)
+
+    def _bounds(self, platform: str):
+        return self._policy(platform).min_interval * FLOOR_FRACTION, MAX_INTERVAL
+
+    def _pace(self, platform: str) -> PlatformPace:
+        pace = self._paces.get(platform)
+        if pace is None:
+            pace = self._paces[platform] = PlatformPace(self._policy(platform).min_interval)
+        floor, ceiling = self._bounds(platform)
+        pace.min_interval = min(max(pace.min_interval, floor), ceiling)
+        return pace
+
+    def configure(self, platform: str, limiter: PlatformLimiter):
+        """Called by ApplyScheduler for each new limiter: start from the learned interval"""
+        with self._lock:
+            self._limiters[platform] = limiter
+            limiter.set_min_interval(self._pace(platform).min_interval)
+
+    def interval(self, platform: str) -> float:
+        with self._lock:
+            return self._pace(platform).min_interval
+
+    def backoff_seconds(self, outcome: str, strikes: int) -> float:
+        """Exponential backoff with equal jitter: half fixed, half random"""
+        ceiling = min(MAX_BACKOFF_SECONDS, BACKOFF_SECONDS[outcome] * BACKOFF_FACTOR ** max(0, strikes - 1))
+        return ceiling / 2 + self.rng.uniform(0, ceiling / 2)
+
+    def record(self, platform: str, outcome: str) -> Optional[float]:
+        """Fold one job outcome into the platform's pace; returns the backoff applied, if any"""
+        backoff = None
+        with self._lock:
+            pace = self._pace(platform)
+            floor, ceiling = self._bounds(platform)
+            if outcome in BACKOFF_SECONDS:
+                pace.strikes += 1
+                pace.clean_streak = 0
+                pace.min_interval = min(ceiling, pace.min_interval * BACKOFF_FACTOR)
+                backoff = self.backoff_seconds(outcome, pace.strikes)
+            elif outcome == OK:
+                pace.strikes = 0
+                pace.clean_streak += 1
+                if pace.clean_streak >= SPEEDUP_AFTER:
+                    pace.clean_streak = 0
+                    pace.min_interval = max(floor, pace.min_interval * SPEEDUP_FACTOR)
+            else:
+                # A plain failure says nothing about the platform's tolerance
+                pace.clean_streak = 0
+            limiter = self._limiters.get(platform)
+            if limiter is not None:
+                limiter.set_min_interval(pace.min_interval)
+                if backoff:
+                    limiter.penalize(backoff)
+            row = (platform, pace.min_interval, pace.clean_streak, pace.strikes, int(time.time()))
+        self.storage.execute(UPSERT_PACE_SQL, row)
+        if backoff:
+            print(f"     🐢 {platform}: {outcome}, backing off {backoff:.0f}s "
+                  f"(interval now {row[1]:.0f}s)")
+        return backoff
+
+    def _refresh_day(self):
+        today = datetime.now().strftime("%Y-%m-%d")
+        if today != self._day:
+            midnight = int(datetime.strptime(today, "%Y-%m-%d").timestamp())
+            self.storage.flush()
+            self._applied_before = self.storage.fetch_all(
+                "SELECT COUNT(*) AS n FROM applications WHERE status = 'applied' AND applied_at >= ?",
+                (midnight,))[0]['n']
+            self._day = today
+            self._reserved = 0
+
+    def daily_remaining(self) -> Optional[int]:
+        """Applications still allowed today, or None when there is no limit"""
+        if not self.daily_limit:
+            return None
+        with self._lock:
+            self._refresh_day()
+            return max(0, self.daily_limit - self._applied_before - self._reserved)
+
+    def reserve(self, wanted: int) -> int:
+        """Reserve up to wanted applications against today's limit; returns how many were granted"""
+        if not self.daily_limit:
+            return wanted
+        with self._lock:
+            self._refresh_day()
+            granted = max(0, min(wanted, self.daily_limit - self._applied_before - self._reserved))
+            self._reserved += granted
+            return granted
+
+    def release(self, count: int = 1):
+        """Give back reservations for jobs that were not applied"""
+        if not self.daily_limit:
+            return
+        with self._lock:
+            self._reserved = max(0, self._reserved - count)
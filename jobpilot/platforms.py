@@ -0,0 +1,132 @@
+"""
+Shared ATS platform resolver
+- Parses the hostname once and looks it up by domain suffix (no substring chain)
+- Persists LinkedIn job ID -> external apply URL/platform so redirect chains
+  are only ever followed once
+"""
+
+import re
+import time
+import urllib.request
+from functools import lru_cache
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+GENERIC = 'Generic'
+LINKEDIN = 'LinkedIn'
+
+# Registrable domain (or deeper suffix) -> platform
+ATS_DOMAINS: Dict[str, str] = {
+    'linkedin.com': LINKEDIN,
+    'greenhouse.io': 'Greenhouse',
+    'ashbyhq.com': 'Ashby',
+    'lever.co': 'Lever',
+    'myworkdayjobs.com': 'Workday',
+    'myworkdaysite.com': 'Workday',
+    'workday.com': 'Workday',
+    'bamboohr.com': 'BambooHR',
+    'workable.com': 'Workable',
+    'icims.com': 'iCIMS',
+    'smartrecruiters.com': 'SmartRecruiters',
+    'jobvite.com': 'Jobvite',
+    'recruitee.com': 'Recruitee',
+    'breezy.hr': 'Breezy',
+    'jazzhr.com': 'JazzHR',
+    'applytojob.com': 'JazzHR',
+    'taleo.net': 'Taleo',
+    'successfactors.com': 'SuccessFactors',
+    'ats.rippling.com': 'Rippling',
+    'dover.com': 'Dover',
+    'wellfound.com': 'Wellfound',
+    'simplify.jobs': 'Simplify',
+    'indeed.com': 'Indeed',
+    'glassdoor.com': 'Glassdoor',
+}
+
+LINKEDIN_JOB_ID = re.compile(r'/jobs/view/(?:[^/?#]*?-)?(\d+)')
+
+
+@lru_cache(maxsize=4096)
+def platform_for_host(host: str) -> str:
+    """Longest matching domain suffix wins (jobs.ashbyhq.com -> ashbyhq.com)"""
+    labels = host.lower().rstrip('.').split('.')
+    for i in range(len(labels) - 1):
+        platform = ATS_DOMAINS.get('.'.join(labels[i:]))
+        if platform:
+            return platform
+    return GENERIC
+
+
+def detect_platform(url: str) -> str:
+    """Detect the apply platform from a URL's hostname"""
+    host = urlsplit(url).hostname
+    return platform_for_host(host) if host else GENERIC
+
+
+def linkedin_job_id(url: str) -> Optional[str]:
+    if detect_platform(url) != LINKEDIN:
+        return None
+    match = LINKEDIN_JOB_ID.search(urlsplit(url).path)
+    return match.group(1) if match else None
+
+
+def http_redirect_follower(url: str, timeout: float = 10.0) -> Optional[str]:
+    """Follow HTTP redirects and return the final URL (None on failure)"""
+    request = urllib.request.Request(url, method='HEAD', headers={'User-Agent': 'Mozilla/5.0'})
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return response.geturl()
+    except OSError:
+        return None
+
+
+class PlatformResolver:
+    """Resolves jobs to their real ATS, caching LinkedIn redirects in the DB"""
+
+    def __init__(self, storage, follow_fn: Optional[Callable[[str], Optional[str]]] = None):
+        self.storage = storage
+        self.follow_fn = follow_fn
+        self._cache: Optional[Dict[str, Tuple[str, str]]] = None
+
+    def _load(self) -> Dict[str, Tuple[str, str]]:
+        if self._cache is None:
+            rows = self.storage.fetch_all("SELECT linkedin_job_id, apply_url, platform FROM platform_redirects")
+            self._cache = {row['linkedin_job_id']: (row['apply_url'], row['platform']) for row in rows}
+        return self._cache
+
+    def cached(self, url: str) -> Optional[Tuple[str, str]]:
+        """(apply_url, platform) already resolved for this LinkedIn job, if any"""
+        job_id = linkedin_job_id(url)
+        return self._load().get(job_id) if job_id else None
+
+    def record(self, linkedin_url: str, apply_url: str) -> str:
+        """Store where a LinkedIn job's Apply button leads; returns its platform"""
+        platform = detect_platform(apply_url)
+        job_id = linkedin_job_id(linkedin_url)
+        if job_id and platform != LINKEDIN:
+            self._load()[job_id] = (apply_url, platform)
+            self.storage.execute("""
+            INSERT INTO platform_redirects (linkedin_job_id, apply_url, platform, resolved_at)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(linkedin_job_id) DO UPDATE SET
+                apply_url = excluded.apply_url, platform = excluded.platform, resolved_at = excluded.resolved_at
+            """, (job_id, apply_url, platform, int(time.time())))
+        return platform
+
+    def resolve(self, url: str) -> Tuple[str, str]:
+        """(apply_url, platform) for url, following a LinkedIn redirect at most once ever"""
+        platform = detect_platform(url)
+        if platform != LINKEDIN:
+            return url, platform
+
+        hit = self.cached(url)
+        if hit:
+            return hit
+        if self.follow_fn and linkedin_job_id(url):
+            final_url = self.follow_fn(url)
+            if final_url and detect_platform(final_url) != LINKEDIN:
+                return final_url, self.record(url, final_url)
+        return url, LINKEDIN
+
+    def platform(self, url: str) -> str:
+        return self.resolve(url)[1]
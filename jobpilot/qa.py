@@ -0,0 +1,241 @@
+"""
+Precompiled matcher for application-form questions against Q&A templates
+- Each template's question patterns are compiled once; the first template (in
+  file order) with a matching pattern wins, as in the dashboard
+- An inverted index of literal words in the patterns picks the candidate
+  templates for a question, so only their regexes run
+- A question no regex matches falls back to the semantic index
+  (jobpilot.semantic) when one is given, above its MATCH_THRESHOLD
+- Rendered answers are cached per (template, company, role)
+- Usage counts are batched into qa_template_usage; the dashboard-owned
+  qa_templates table is only ever read
+
+Match questions from the command line:
+    python -m jobpilot.qa "Why are you interested in this role?" --company Acme
+"""
+
+import argparse
+import atexit
+import json
+import re
+import threading
+import time
+import weakref
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+from jobpilot.config import load_qa_templates
+
+DEFAULT_FLUSH_EVERY = 50
+DEFAULT_FLUSH_INTERVAL = 30.0
+QUESTION_CACHE_SIZE = 4096
+
+WORD = re.compile(r"[a-z0-9]+")
+# Patterns using any of these can't be reduced to required words safely
+NON_LITERAL = re.compile(r"[\\|()\[\]{}?]")
+
+UPSERT_USAGE_SQL = """
+INSERT INTO qa_template_usage (template_id, usage_count, last_used_at) VALUES (?, ?, ?)
+ON CONFLICT(template_id) DO UPDATE SET
+    usage_count = qa_template_usage.usage_count + excluded.usage_count,
+    last_used_at = excluded.last_used_at
+"""
+
+_open_matchers: "weakref.WeakSet[QAMatcher]" = weakref.WeakSet()
+
+
+class QATemplate(NamedTuple):
+    id: str
+    category: str
+    question_patterns: List[str]
+    answer_template: str
+    variables: List[str]
+
+
+class _KeepMissing(dict):
+    def __missing__(self, key):
+        return "{" + key + "}"
+
+
+def load_templates(storage=None, config_dir: Optional[Path] = None) -> List[QATemplate]:
+    """Templates from config/qa_templates.json, then any extra rows in the qa_templates table"""
+    templates = [
+        QATemplate(t['id'], t.get('category', ''), list(t.get('question_patterns', [])),
+                   t.get('answer_template', ''), list(t.get('variables', [])))
+        for t in load_qa_templates(config_dir).get('templates', [])
+    ]
+    if storage is not None:
+        known = {t.id for t in templates}
+        for row in storage.fetch_all("SELECT id, category, question_pattern, answer_template FROM qa_templates"):
+            if row['id'] not in known:
+                templates.append(QATemplate(row['id'], row['category'], [row['question_pattern']],
+                                            row['answer_template'], []))
+    return templates
+
+
+def anchor_word(pattern: str) -> Optional[str]:
+    """Longest word every match of pattern must contain, or None if there isn't a safe one"""
+    pattern = pattern.lower()
+    if NON_LITERAL.search(pattern):
+        return None
+    words = []
+    for match in WORD.finditer(pattern):
+        word = match.group()
+        # A trailing '*' makes the last character optional
+        if pattern[match.end():match.end() + 1] == "*":
+            word = word[:-1]
+        if word:
+            words.append(word)
+    return max(words, key=len) if words else None
+
+
+class QAMatcher:
+    def __init__(self, templates: List[QATemplate], storage=None,
+                 flush_every: int = DEFAULT_FLUSH_EVERY, flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+                 semantic=None):
+        self.templates = templates
+        self.storage = storage
+        # jobpilot.semantic.SemanticIndex for questions the regexes miss; rebuilt here if the templates changed
+        self.semantic = semantic
+        if semantic is not None:
+            semantic.ensure(templates)
+        self._ids: Dict[str, int] = {}
+        for i, template in enumerate(templates):
+            self._ids.setdefault(template.id, i)
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+
+        self._patterns: Dict[int, "re.Pattern"] = {
+            i: re.compile("|".join(f"(?:{p})" for p in t.question_patterns), re.IGNORECASE)
+            for i, t in enumerate(templates) if t.question_patterns
+        }
+
+        # anchor word -> templates that can only match a question containing it
+        self._index: Dict[str, Set[int]] = {}
+        # Templates with a pattern that has no safe anchor are candidates for every question
+        self._unanchored: Set[int] = set()
+        for i, template in enumerate(templates):
+            for pattern in template.question_patterns:
+                anchor = anchor_word(pattern)
+                if anchor is None:
+                    self._unanchored.add(i)
+                else:
+                    self._index.setdefault(anchor, set()).add(i)
+        self._anchor_lengths = sorted({len(word) for word in self._index})
+
+        self._lock = threading.Lock()
+        self._question_cache: Dict[str, Optional[int]] = {}
+        self._answer_cache: Dict[Tuple[str, str, str], str] = {}
+        self._usage: Counter = Counter()
+        self._unflushed = 0
+        self._last_flush = time.monotonic()
+        _open_matchers.add(self)
+
+    def _candidates(self, question: str) -> List[int]:
+        """Templates (in file order) whose anchor word occurs inside a word of the question"""
+        candidates = set(self._unanchored)
+        for token in set(WORD.findall(question)):
+            for length in self._anchor_lengths:
+                if length > len(token):
+                    break
+                for start in range(len(token) - length + 1):
+                    candidates.update(self._index.get(token[start:start + length], ()))
+        return sorted(candidates)
+
+    def _match_index(self, question: str) -> Optional[int]:
+        key = question.strip().lower()
+        with self._lock:
+            if key in self._question_cache:
+                return self._question_cache[key]
+        index = next((i for i in self._candidates(key) if i in self._patterns and self._patterns[i].search(key)),
+                     None)
+        if index is None and self.semantic is not None:
+            best = self.semantic.best_matches([key])[0]
+            index = self._ids.get(best.template_id) if best else None
+        with self._lock:
+            if len(self._question_cache) >= QUESTION_CACHE_SIZE:
+                self._question_cache.clear()
+            self._question_cache[key] = index
+        return index
+
+    def match(self, question: str) -> Optional[QATemplate]:
+        """First template whose patterns match question (case-insensitive), else the semantic match, or None"""
+        index = self._match_index(question)
+        return None if index is None else self.templates[index]
+
+    def answer(self, question: str, **variables) -> Optional[str]:
+        """Rendered answer for question; placeholders without a value are left as-is"""
+        template = self.match(question)
+        if template is None:
+            return None
+        key = (template.id, variables.get('company', ''), variables.get('role', ''))
+        with self._lock:
+            rendered = self._answer_cache.get(key)
+            if rendered is None:
+                rendered = template.answer_template.format_map(_KeepMissing(variables))
+                self._answer_cache[key] = rendered
+            self._usage[template.id] += 1
+            self._unflushed += 1
+            due = (self._unflushed >= self.flush_every
+                   or time.monotonic() - self._last_flush >= self.flush_interval)
+        if due:
+            self.flush()
+        return rendered
+
+    def flush(self) -> int:
+        """Write pending usage increments in one transaction; returns templates updated"""
+        with self._lock:
+            usage, self._usage = self._usage, Counter()
+            self._unflushed = 0
+            self._last_flush = time.monotonic()
+        if not usage or self.storage is None:
+            return 0
+        now = int(time.time())
+        rows = [(tid, count, now) for tid, count in usage.items()]
+        try:
+            with self.storage.transaction() as conn:
+                conn.executemany(UPSERT_USAGE_SQL, rows)
+        except Exception:
+            with self._lock:
+                self._usage.update(usage)
+            raise
+        return len(rows)
+
+    def close(self):
+        self.flush()
+        _open_matchers.discard(self)
+
+    def __enter__(self) -> "QAMatcher":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+@atexit.register
+def _flush_open_matchers():
+    for matcher in list(_open_matchers):
+        try:
+            matcher.flush()
+        except Exception:
+            pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Match form questions against the Q&A templates")
+    parser.add_argument("questions", nargs="+")
+    parser.add_argument("--company", default="")
+    parser.add_argument("--role", default="")
+    args = parser.parse_args()
+
+    matcher = QAMatcher(load_templates())
+    for question in args.questions:
+        template = matcher.match(question)
+        answer = matcher.answer(question, company=args.company, role=args.role)
+        print(json.dumps({'question': question, 'template': template.id if template else None,
+                          'answer': answer}, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
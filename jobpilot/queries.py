@@ -0,0 +1,176 @@
+"""
+Planned queries for the batch-apply scripts
+- Unapplied-job selection driven by the jobs_fts index instead of a LIKE chain
+- EXPLAIN QUERY PLAN check that fails if any full table scan remains
+
+Run the plan check against a synthetic copy of the real schema:
+    python -m jobpilot.queries data/db/jobpilot.db --rows 100000
+"""
+
+import argparse
+import random
+import re
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from jobpilot.schema import migrate
+
+# Title keywords the batch scripts target
+TITLE_KEYWORDS = ["Software Engineer", "Backend", "Full Stack", "AI", "Engineer"]
+
+# Keywords matched as whole tokens only ("AI" must not match "Retail")
+EXACT_KEYWORDS = {"ai"}
+
+UNAPPLIED_JOBS_SQL = """
+SELECT j.id, j.title, j.company, j.location, j.url, j.platform, j.match_score
+FROM jobs j
+INNER JOIN applications a ON j.id = a.job_id
+WHERE a.status = 'unapplied'
+AND j.company != 'Unknown'
+AND j.rowid IN (SELECT rowid FROM jobs_fts WHERE jobs_fts MATCH ?)
+ORDER BY {order_by}
+LIMIT ?
+"""
+
+# Same selection with the WHERE rules supplied by jobpilot.filters.compile_preferences
+FILTERED_JOBS_SQL = """
+SELECT j.id, j.title, j.company, j.location, j.url, j.platform, j.match_score
+FROM jobs j
+INNER JOIN applications a ON j.id = a.job_id
+WHERE a.status = 'unapplied'
+AND {where}
+ORDER BY {order_by}
+LIMIT ?
+"""
+
+ORDER_BY_ID = "j.id ASC"
+ORDER_BY_SCORE = "j.match_score DESC, j.id ASC"
+
+# Partial indexes are allowed to be scanned: they only hold the rows we want
+PARTIAL_INDEXES = {"idx_applications_unapplied"}
+
+
+def fts_phrase(keyword: str, prefix: bool = True) -> str:
+    """Quote a keyword as an FTS5 phrase, optionally as a prefix match"""
+    phrase = '"' + keyword.replace('"', '""') + '"'
+    return phrase + "*" if prefix else phrase
+
+
+def title_match_expression(keywords: Sequence[str] = TITLE_KEYWORDS) -> str:
+    """Build the FTS5 MATCH expression equivalent to the old title LIKE chain"""
+    phrases = [fts_phrase(k, prefix=k.lower() not in EXACT_KEYWORDS) for k in keywords]
+    return "title : (" + " OR ".join(phrases) + ")"
+
+
+def unapplied_jobs_query(order_by_score: bool = False) -> str:
+    return UNAPPLIED_JOBS_SQL.format(order_by=ORDER_BY_SCORE if order_by_score else ORDER_BY_ID)
+
+
+def filtered_jobs_query(where: str, order_by_score: bool = False) -> str:
+    return FILTERED_JOBS_SQL.format(where=where, order_by=ORDER_BY_SCORE if order_by_score else ORDER_BY_ID)
+
+
+def select_unapplied_jobs(storage, limit: Optional[int] = None, order_by_score: bool = False,
+                          keywords: Sequence[str] = TITLE_KEYWORDS) -> List[Dict]:
+    """Fetch unapplied jobs whose title matches any of keywords"""
+    params = (title_match_expression(keywords), limit if limit else -1)
+    return storage.fetch_all(unapplied_jobs_query(order_by_score), params)
+
+
+def explain(conn: sqlite3.Connection, query: str, params: Sequence = ()) -> List[str]:
+    """Return the EXPLAIN QUERY PLAN detail lines for query"""
+    return [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + query, params)]
+
+
+def find_full_scans(plan: Sequence[str]) -> List[str]:
+    """Plan lines that walk a whole table or a whole non-partial index"""
+    scans = []
+    for line in plan:
+        if not line.startswith("SCAN "):
+            continue
+        if "VIRTUAL TABLE INDEX" in line:
+            continue
+        match = re.search(r"USING (?:COVERING )?INDEX (\w+)", line)
+        if match and match.group(1) in PARTIAL_INDEXES:
+            continue
+        scans.append(line)
+    return scans
+
+
+def copy_schema(source: Path, conn: sqlite3.Connection):
+    src = sqlite3.connect(f"file:{source}?mode=ro", uri=True)
+    try:
+        tables = src.execute("""
+            SELECT sql FROM sqlite_master
+            WHERE type = 'table' AND name IN ('jobs', 'applications', 'resumes', 'qa_templates')
+        """).fetchall()
+    finally:
+        src.close()
+    for (sql,) in tables:
+        conn.execute(sql)
+
+
+def _fill_synthetic(conn: sqlite3.Connection, rows: int, seed: int = 7):
+    rng = random.Random(seed)
+    words = ["Software", "Engineer", "Backend", "Data", "Manager", "Sales", "AI", "Full",
+             "Stack", "Retail", "Analyst", "Senior", "Staff", "Platform", "Mobile"]
+    conn.execute("BEGIN")
+    conn.executemany(
+        "INSERT INTO jobs (id, platform, title, company, url, saved_at) VALUES (?, ?, ?, ?, ?, ?)",
+        ((f"job_{i}", "linkedin", " ".join(rng.sample(words, 3)), rng.choice(["Acme", "Globex", "Unknown"]),
+          f"https://www.linkedin.com/jobs/view/{i}", 0) for i in range(rows)))
+    conn.executemany(
+        "INSERT INTO applications (id, job_id, status, created_at) VALUES (?, ?, ?, ?)",
+        ((f"app_{i}", f"job_{i}", "unapplied" if rng.random() < 0.1 else "applied", 0) for i in range(rows)))
+    conn.execute("COMMIT")
+
+
+def check_query_plan(source_db: Path, rows: int = 100_000) -> Dict[str, List[str]]:
+    """Load rows synthetic jobs into a copy of source_db's schema and return full scans per query"""
+    from jobpilot.config import load_preferences
+    from jobpilot.filters import compile_preferences
+
+    compiled = compile_preferences(load_preferences())
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = sqlite3.connect(str(Path(tmp) / "plan_check.db"), isolation_level=None)
+        try:
+            copy_schema(source_db, conn)
+            _fill_synthetic(conn, rows)
+            migrate(conn)
+            params = (title_match_expression(), -1)
+            results = {
+                name: find_full_scans(explain(conn, unapplied_jobs_query(by_score), params))
+                for name, by_score in (("order_by_id", False), ("order_by_score", True))
+            }
+            results.update({
+                name: find_full_scans(explain(conn, filtered_jobs_query(compiled.where, by_score),
+                                              compiled.params + [-1]))
+                for name, by_score in (("preferences_by_id", False), ("preferences_by_score", True))
+            })
+            return results
+        finally:
+            conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the unapplied-job query plan for full scans")
+    parser.add_argument("db", type=Path, help="database whose schema to copy")
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    results = check_query_plan(args.db, args.rows)
+    failed = False
+    for name, scans in results.items():
+        if scans:
+            failed = True
+            print(f"✗ {name}: full scans remain: {scans}")
+        else:
+            print(f"✓ {name}: no full scans at {args.rows} jobs")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
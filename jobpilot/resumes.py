@@ -0,0 +1,219 @@
+"""
+Parse-once cache for resume PDFs and the applicant profile
+- Each resume is parsed once into skills / experience / education / projects
+  and stored as compact JSON under data/cache/resumes/<sha256>.v<N>.json
+- Entries are keyed by the SHA-256 of the file (and the parser version), so
+  they go stale only when the file's contents change
+- A per-entry file lock makes concurrent workers parse a given resume exactly
+  once; everyone else just reads the finished (small) JSON entry
+- The PDF parser (pypdf) is optional and only imported when a parse is needed;
+  without it an applicant is the profile plus the resumes.skills column
+
+Parse resumes from the command line:
+    python -m jobpilot.resumes data/resumes/*.pdf
+"""
+
+import argparse
+import fcntl
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from jobpilot.config import CONFIG_DIR, PROJECT_ROOT
+
+PARSER_VERSION = 1
+CACHE_DIR = PROJECT_ROOT / "data" / "cache" / "resumes"
+RESUMES_DIR = PROJECT_ROOT / "data" / "resumes"
+
+SECTION_HEADINGS = {
+    'skills': ("skills", "technical skills", "skills & interests", "technologies"),
+    'experience': ("experience", "work experience", "professional experience", "employment"),
+    'education': ("education",),
+    'projects': ("projects", "selected projects", "personal projects"),
+}
+HEADING_TO_SECTION = {h: section for section, headings in SECTION_HEADINGS.items() for h in headings}
+SKILL_SPLIT = re.compile(r"\s*(?:[,;|•·]|\s-\s)\s*")
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def extract_pdf_text(path: Path) -> str:
+    try:
+        from pypdf import PdfReader
+    except ImportError as e:
+        raise RuntimeError("Parsing resume PDFs needs pypdf: pip install pypdf") from e
+    return "\n".join(page.extract_text() or "" for page in PdfReader(str(path)).pages)
+
+
+def split_sections(text: str) -> Dict[str, List[str]]:
+    """Group non-empty lines under the resume section heading they follow"""
+    sections: Dict[str, List[str]] = {section: [] for section in SECTION_HEADINGS}
+    current = None
+    for raw in text.splitlines():
+        line = raw.strip()
+        if not line:
+            continue
+        heading = line.rstrip(":").lower()
+        if heading in HEADING_TO_SECTION:
+            current = HEADING_TO_SECTION[heading]
+            continue
+        if current:
+            sections[current].append(line)
+    return sections
+
+
+def parse_skills(lines: List[str]) -> List[str]:
+    skills: List[str] = []
+    seen = set()
+    for line in lines:
+        # "Languages: Python, Go" -> "Python, Go"
+        _, _, values = line.rpartition(":")
+        for skill in SKILL_SPLIT.split(values):
+            skill = skill.strip(" .")
+            if skill and skill.lower() not in seen:
+                seen.add(skill.lower())
+                skills.append(skill)
+    return skills
+
+
+def parse_resume_text(text: str) -> Dict:
+    sections = split_sections(text)
+    return {
+        'skills': parse_skills(sections['skills']),
+        'experience': sections['experience'],
+        'education': sections['education'],
+        'projects': sections['projects'],
+    }
+
+
+def resolve_resume_path(file_path: str) -> Path:
+    """resumes.file_path as stored, or the same file name under data/resumes on this machine"""
+    path = Path(file_path)
+    return path if path.exists() else RESUMES_DIR / path.name
+
+
+def _column_skills(value: Optional[str]) -> List[str]:
+    if not value:
+        return []
+    try:
+        parsed = json.loads(value)
+    except json.JSONDecodeError:
+        return parse_skills([value])
+    return [str(s) for s in parsed] if isinstance(parsed, list) else parse_skills([str(parsed)])
+
+
+class ResumeCache:
+    def __init__(self, cache_dir: Path = CACHE_DIR, config_dir: Optional[Path] = None):
+        self.cache_dir = Path(cache_dir)
+        # Where profile.json lives (a candidate's own directory in multi-profile runs)
+        self.config_dir = config_dir
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        # (path, size, mtime_ns) -> sha256, so unchanged files aren't re-hashed per job
+        self._digests: Dict[Tuple[str, int, int], str] = {}
+        self._entries: Dict[str, Dict] = {}
+
+    def digest(self, path: Path) -> str:
+        stat = os.stat(path)
+        key = (str(Path(path).resolve()), stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            digest = self._digests.get(key)
+        if digest is None:
+            digest = file_sha256(path)
+            with self._lock:
+                self._digests[key] = digest
+        return digest
+
+    def _entry_path(self, digest: str) -> Path:
+        return self.cache_dir / f"{digest}.v{PARSER_VERSION}.json"
+
+    @staticmethod
+    def _read(path: Path) -> Dict:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def get(self, path: Path) -> Dict:
+        """Parsed fields of the resume at path, parsing it only if no worker has yet"""
+        digest = self.digest(path)
+        with self._lock:
+            if digest in self._entries:
+                return self._entries[digest]
+
+        entry_path = self._entry_path(digest)
+        if not entry_path.exists():
+            with open(self.cache_dir / f"{digest}.lock", "w") as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+                if not entry_path.exists():
+                    self._write(entry_path, digest, path)
+        entry = self._read(entry_path)
+
+        with self._lock:
+            self._entries[digest] = entry
+        return entry
+
+    def _write(self, entry_path: Path, digest: str, path: Path):
+        entry = {'sha256': digest, 'file_name': Path(path).name}
+        entry.update(parse_resume_text(extract_pdf_text(path)))
+        tmp = entry_path.with_name(f"{entry_path.name}.{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, entry_path)
+
+    def profile(self, config_dir: Optional[Path] = None) -> Dict:
+        """config/profile.json, re-read only when its hash changes"""
+        path = Path(config_dir or self.config_dir or CONFIG_DIR) / "profile.json"
+        digest = self.digest(path)
+        with self._lock:
+            if digest not in self._entries:
+                with open(path, encoding="utf-8") as f:
+                    self._entries[digest] = json.load(f)
+            return self._entries[digest]
+
+    def applicant(self, storage, resume_id: Optional[str] = None, config_dir: Optional[Path] = None) -> Dict:
+        """Profile + parsed resume + resumes.skills for the given (or default) resume"""
+        if resume_id:
+            rows = storage.fetch_all("SELECT * FROM resumes WHERE id = ?", (resume_id,))
+        else:
+            rows = storage.fetch_all("SELECT * FROM resumes ORDER BY is_default DESC, created_at LIMIT 1")
+        applicant = {'profile': self.profile(config_dir), 'resume': None, 'skills': []}
+        if not rows:
+            return applicant
+
+        row = rows[0]
+        path = resolve_resume_path(row['file_path'])
+        parsed = {}
+        if path.exists():
+            try:
+                parsed = self.get(path)
+            except RuntimeError as e:
+                # No PDF parser here: apply with the profile and the resumes.skills column alone
+                print(f"Resume {path.name} not parsed ({e})", file=sys.stderr)
+        skills = _column_skills(row.get('skills')) + parsed.get('skills', [])
+        applicant['resume'] = {'id': row['id'], 'name': row['name'], 'path': str(path), **parsed}
+        applicant['skills'] = list(dict.fromkeys(skills))
+        return applicant
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parse resume PDFs into the shared cache")
+    parser.add_argument("resumes", nargs="+", type=Path)
+    args = parser.parse_args()
+
+    cache = ResumeCache()
+    for path in args.resumes:
+        print(json.dumps(cache.get(path), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
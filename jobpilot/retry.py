@@ -0,0 +1,58 @@
+"""
+Failure classification and retry backoff for the run journal
+- Every apply error is classified as transient, rate-limited, needs-human or
+  permanent; only the first two are retried automatically
+- Retries wait an exponential backoff with equal jitter per class, up to the
+  class's max attempts, then the job fails for good
+- needs-human failures (captchas, login challenges) are parked until
+  `jobpilot retries --requeue needs_human` puts them back in the queue
+"""
+
+import random
+from dataclasses import dataclass
+from typing import Optional
+
+from jobpilot.pacing import CAPTCHA, CLOSED, LOGIN_CHALLENGE, RATE_LIMITED, classify
+
+TRANSIENT = 'transient'
+NEEDS_HUMAN = 'needs_human'
+PERMANENT = 'permanent'
+FAILURE_CLASSES = (TRANSIENT, RATE_LIMITED, NEEDS_HUMAN, PERMANENT)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    max_attempts: int             # attempts (claims) before the job fails for good; 0 never retries
+    base_delay: float = 0.0       # seconds before the first retry
+    factor: float = 2.0
+    max_delay: float = 0.0
+
+
+POLICIES = {
+    TRANSIENT: RetryPolicy(max_attempts=4, base_delay=15 * 60, max_delay=6 * 3600),
+    RATE_LIMITED: RetryPolicy(max_attempts=6, base_delay=2 * 3600, max_delay=24 * 3600),
+    NEEDS_HUMAN: RetryPolicy(max_attempts=0),
+    PERMANENT: RetryPolicy(max_attempts=0),
+}
+
+
+def classify_failure(error: Optional[str]) -> str:
+    """Map an apply error message onto a failure class"""
+    outcome = classify(error)
+    if outcome == RATE_LIMITED:
+        return RATE_LIMITED
+    if outcome in (CAPTCHA, LOGIN_CHALLENGE):
+        return NEEDS_HUMAN
+    if outcome == CLOSED:
+        return PERMANENT
+    # Timeouts, crashed workers, network errors and anything unrecognized
+    return TRANSIENT
+
+
+def retry_delay(failure_class: str, attempts: int, rng: Optional[random.Random] = None) -> Optional[float]:
+    """Seconds to wait before retrying after attempts tries, or None if the job should fail for good"""
+    policy = POLICIES[failure_class]
+    if attempts >= policy.max_attempts:
+        return None
+    ceiling = min(policy.max_delay, policy.base_delay * policy.factor ** max(0, attempts - 1))
+    return ceiling / 2 + (rng or random).uniform(0, ceiling / 2)
@@ -0,0 +1,284 @@
+"""
+Concurrent apply scheduler with per-platform rate limiting
+- Jobs for different ATS hosts run in parallel on a thread pool
+- Each platform gets its own token bucket and cooldown policy
+- A global concurrency cap bounds total in-flight applications
+- Jobs tagged with a tenant (candidate profile) share each platform's starts
+  by smooth weighted round-robin, so one profile can't starve another
+- Time comes from an injectable clock so tests can run on FakeClock
+"""
+
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+DEFAULT_MAX_CONCURRENCY = 4
+# Refill arithmetic can leave 0.999...9 tokens, whose tiny wait vanishes when added to a large clock value
+TOKEN_EPSILON = 1e-9
+
+
+class SystemClock:
+    def monotonic(self) -> float:
+        return time.monotonic()
+
+    def sleep(self, seconds: float):
+        if seconds > 0:
+            time.sleep(seconds)
+
+
+class FakeClock:
+    """Deterministic clock for tests: sleep() advances time instantly"""
+
+    def __init__(self, start: float = 0.0):
+        self.now = start
+        self.sleeps: List[float] = []
+        self._lock = threading.Lock()
+
+    def monotonic(self) -> float:
+        with self._lock:
+            return self.now
+
+    def sleep(self, seconds: float):
+        with self._lock:
+            if seconds > 0:
+                self.sleeps.append(seconds)
+                self.now += seconds
+
+    def advance(self, seconds: float):
+        self.sleep(seconds)
+
+
+class InlineExecutor(Executor):
+    """Runs each task synchronously on submit; pairs with FakeClock for deterministic runs"""
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        future: Future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
+
+
+@dataclass
+class PlatformPolicy:
+    min_interval: float = 5.0      # seconds between starts on this platform (token refill period)
+    burst: int = 1                 # starts allowed back to back before min_interval applies
+    max_in_flight: int = 1         # concurrent applications on this platform
+    cooldown_every: int = 10       # rest after this many starts (0 disables)
+    cooldown_seconds: float = 10.0
+
+
+# LinkedIn is the one shared host every candidate hits, so it stays the most conservative
+DEFAULT_POLICIES: Dict[str, PlatformPolicy] = {
+    "LinkedIn": PlatformPolicy(min_interval=30.0, cooldown_every=10, cooldown_seconds=120.0),
+    "Greenhouse": PlatformPolicy(min_interval=5.0, max_in_flight=2),
+    "Lever": PlatformPolicy(min_interval=5.0, max_in_flight=2),
+    "Ashby": PlatformPolicy(min_interval=5.0, max_in_flight=2),
+    "Workday": PlatformPolicy(min_interval=10.0),
+}
+FALLBACK_POLICY = PlatformPolicy()
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: int, clock):
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.tokens = float(capacity)
+        self.updated = clock.monotonic()
+
+    def _refill(self, now: float):
+        if now > self.updated:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def time_until_ready(self, now: float) -> float:
+        self._refill(now)
+        if self.tokens >= 1 - TOKEN_EPSILON:
+            return 0.0
+        wait = (1 - self.tokens) / self.rate
+        # A wait too small to move the clock would never be slept off
+        return wait if now + wait > now else 0.0
+
+    def consume(self, now: float):
+        self._refill(now)
+        self.tokens -= 1
+
+
+class PlatformLimiter:
+    """Token bucket plus periodic cooldown for one platform"""
+
+    def __init__(self, policy: PlatformPolicy, clock):
+        self.policy = policy
+        self.clock = clock
+        self.bucket = TokenBucket(1.0 / policy.min_interval if policy.min_interval > 0 else float("inf"),
+                                  max(1, policy.burst), clock)
+        self.started = 0
+        self.in_flight = 0
+        self.blocked_until = 0.0
+
+    def time_until_ready(self, now: float) -> Optional[float]:
+        """Seconds until a job may start, or None if limited by in-flight count"""
+        if self.in_flight >= self.policy.max_in_flight:
+            return None
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        if self.bucket.rate == float("inf"):
+            return 0.0
+        return self.bucket.time_until_ready(now)
+
+    def start(self, now: float):
+        if self.bucket.rate != float("inf"):
+            self.bucket.consume(now)
+        self.started += 1
+        self.in_flight += 1
+        if self.policy.cooldown_every and self.started % self.policy.cooldown_every == 0:
+            self.blocked_until = max(self.blocked_until, now + self.policy.cooldown_seconds)
+
+    def finish(self):
+        self.in_flight -= 1
+
+    def set_min_interval(self, seconds: float):
+        """Change the start interval in place (used by adaptive pacing)"""
+        self.bucket._refill(self.clock.monotonic())
+        self.bucket.rate = 1.0 / seconds if seconds > 0 else float("inf")
+
+    def penalize(self, seconds: float):
+        """Block the platform for seconds (e.g. after a 429)"""
+        self.blocked_until = max(self.blocked_until, self.clock.monotonic() + seconds)
+
+
+class FairQueue:
+    """One platform's pending jobs, interleaved across tenants by smooth weighted round-robin"""
+
+    def __init__(self, weights: Dict[str, float], credit: Dict[str, float]):
+        self.weights = weights
+        # Owned by the scheduler, so the interleaving carries over from one run() to the next
+        self.credit = credit
+        self.queues: "OrderedDict[str, Deque]" = OrderedDict()
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def append(self, tenant: str, item):
+        self.queues.setdefault(tenant, deque()).append(item)
+        self.size += 1
+
+    def popleft(self):
+        active = [tenant for tenant, queue in self.queues.items() if queue]
+        if len(active) == 1:
+            tenant = active[0]
+        else:
+            for t in active:
+                self.credit[t] = self.credit.get(t, 0.0) + self.weights.get(t, 1.0)
+            tenant = max(active, key=lambda t: self.credit[t])
+            self.credit[tenant] -= sum(self.weights.get(t, 1.0) for t in active)
+        self.size -= 1
+        return self.queues[tenant].popleft()
+
+
+class ApplyScheduler:
+    def __init__(self, apply_fn: Callable[[Dict, int, int], bool], platform_fn: Callable[[str], str],
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 policies: Optional[Dict[str, PlatformPolicy]] = None,
+                 clock=None, executor: Optional[Executor] = None, pacer=None,
+                 tenant_fn: Optional[Callable[[Dict], str]] = None, weights: Optional[Dict[str, float]] = None):
+        self.apply_fn = apply_fn
+        self.platform_fn = platform_fn
+        self.max_concurrency = max_concurrency
+        self.policies = DEFAULT_POLICIES if policies is None else policies
+        self.clock = clock or SystemClock()
+        self.executor = executor
+        # Optional jobpilot.pacing.PacingController that tunes each limiter's interval
+        self.pacer = pacer
+        self.limiters: Dict[str, PlatformLimiter] = {}
+        # Multi-profile runs: which tenant a job belongs to, and each tenant's share of every platform
+        self.tenant_fn = tenant_fn
+        self.weights = weights or {}
+        self._credit: Dict[str, Dict[str, float]] = {}
+        # (job id, platform, start time) in dispatch order; useful for logs and tests
+        self.dispatch_log: List[Tuple[str, str, float]] = []
+
+    def limiter_for(self, platform: str) -> PlatformLimiter:
+        limiter = self.limiters.get(platform)
+        if limiter is None:
+            limiter = PlatformLimiter(self.policies.get(platform, FALLBACK_POLICY), self.clock)
+            self.limiters[platform] = limiter
+            if self.pacer is not None:
+                self.pacer.configure(platform, limiter)
+        return limiter
+
+    def run(self, jobs: List[Dict]) -> List[bool]:
+        """Apply to every job, returning results in input order"""
+        total = len(jobs)
+        results: List[Optional[bool]] = [None] * total
+
+        queues: "OrderedDict[str, FairQueue]" = OrderedDict()
+        for index, job in enumerate(jobs):
+            platform = self.platform_fn(job['url'])
+            if platform not in queues:
+                queues[platform] = FairQueue(self.weights, self._credit.setdefault(platform, {}))
+            queues[platform].append(self.tenant_fn(job) if self.tenant_fn else '', (index, job))
+
+        owns_executor = self.executor is None
+        executor = self.executor or ThreadPoolExecutor(max_workers=self.max_concurrency,
+                                                       thread_name_prefix="jobpilot-apply")
+        in_flight: Dict[Future, Tuple[int, str]] = {}
+        try:
+            while queues or in_flight:
+                next_wake = self._dispatch(queues, in_flight, executor, results, total)
+                if in_flight:
+                    done, _ = wait(list(in_flight), timeout=next_wake, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        self._complete(future, in_flight, results)
+                elif queues:
+                    self.clock.sleep(next_wake or 0.0)
+        finally:
+            if owns_executor:
+                executor.shutdown(wait=True)
+        return [bool(r) for r in results]
+
+    def _dispatch(self, queues, in_flight, executor, results, total) -> Optional[float]:
+        """Start every job whose platform is ready; return seconds until the next one might be"""
+        next_wake: Optional[float] = None
+        # Round-robin over platforms so one busy host can't starve the others
+        for platform in list(queues):
+            if len(in_flight) >= self.max_concurrency:
+                break
+            limiter = self.limiter_for(platform)
+            now = self.clock.monotonic()
+            delay = limiter.time_until_ready(now)
+            if delay is None:
+                continue
+            if delay > 0:
+                next_wake = delay if next_wake is None else min(next_wake, delay)
+                continue
+
+            index, job = queues[platform].popleft()
+            if not queues[platform]:
+                del queues[platform]
+            else:
+                queues.move_to_end(platform)
+            limiter.start(now)
+            self.dispatch_log.append((job['id'], platform, now))
+            future = executor.submit(self.apply_fn, job, index + 1, total)
+            in_flight[future] = (index, platform)
+            if future.done():
+                self._complete(future, in_flight, results)
+            # Something started; re-scan immediately in case more platforms are ready
+            next_wake = 0.0
+        return next_wake
+
+    def _complete(self, future: Future, in_flight, results):
+        index, platform = in_flight.pop(future)
+        self.limiters[platform].finish()
+        try:
+            results[index] = future.result()
+        except Exception as e:
+            print(f"     ✗ Unhandled error in apply worker: {e}")
+            results[index] = False
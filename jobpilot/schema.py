@@ -0,0 +1,324 @@
+"""
+Schema migrations for the JobPilot SQLite database
+- Applied in order, tracked with PRAGMA user_version
+- Only adds indexes/tables/triggers; never touches the dashboard-owned columns
+"""
+
+import sqlite3
+from typing import List, Tuple
+
+# applications row -> its app_stats rows: overall, per platform, per company and per applied day
+APP_STATS_KEYS = {
+    'all': "''",
+    'platform': "COALESCE(lower({row}.platform), 'unknown')",
+    'company': "COALESCE((SELECT company FROM jobs WHERE id = {row}.job_id), 'Unknown')",
+    'day': "COALESCE(date({row}.applied_at, 'unixepoch'), '')",
+}
+
+
+def _app_stats_delta(row: str, sign: str) -> str:
+    """Add (sign '+') or remove (sign '-') one applications row from app_stats"""
+    waited = f"{row}.applied_at >= {row}.created_at"
+    values = ",\n".join(
+        f"('{dimension}', {key.format(row=row)}, {row}.status, {sign}1, "
+        f"{sign}(CASE WHEN {waited} THEN {row}.applied_at - {row}.created_at ELSE 0 END), "
+        f"{sign}(CASE WHEN {waited} THEN 1 ELSE 0 END))"
+        for dimension, key in APP_STATS_KEYS.items())
+    return f"""INSERT INTO app_stats (dimension, key, status, n, wait_sum, wait_n) VALUES
+{values}
+ON CONFLICT(dimension, key, status) DO UPDATE SET
+    n = n + excluded.n, wait_sum = wait_sum + excluded.wait_sum, wait_n = wait_n + excluded.wait_n;"""
+
+
+# A job's company is part of its applications' 'company' key, so renaming it moves their counts
+APP_STATS_COMPANY_MOVE = """INSERT INTO app_stats (dimension, key, status, n, wait_sum, wait_n)
+SELECT 'company', moved.key, a.status, moved.sign * COUNT(*),
+       moved.sign * SUM(CASE WHEN a.applied_at >= a.created_at THEN a.applied_at - a.created_at ELSE 0 END),
+       moved.sign * SUM(CASE WHEN a.applied_at >= a.created_at THEN 1 ELSE 0 END)
+FROM applications a, (SELECT COALESCE(old.company, 'Unknown') AS key, -1 AS sign
+                      UNION ALL SELECT COALESCE(new.company, 'Unknown'), 1) AS moved
+WHERE a.job_id = new.id
+GROUP BY moved.key, moved.sign, a.status
+ON CONFLICT(dimension, key, status) DO UPDATE SET
+    n = n + excluded.n, wait_sum = wait_sum + excluded.wait_sum, wait_n = wait_n + excluded.wait_n;"""
+
+
+# Full rebuild of app_stats (backfill, and repair after bulk loads with the triggers off)
+APP_STATS_REFRESH = ["DELETE FROM app_stats"] + [
+    f"""INSERT INTO app_stats (dimension, key, status, n, wait_sum, wait_n)
+        SELECT '{dimension}', {key.format(row='a')}, a.status, COUNT(*),
+               SUM(CASE WHEN a.applied_at >= a.created_at THEN a.applied_at - a.created_at ELSE 0 END),
+               SUM(CASE WHEN a.applied_at >= a.created_at THEN 1 ELSE 0 END)
+        FROM applications a GROUP BY 2, 3"""
+    for dimension, key in APP_STATS_KEYS.items()
+]
+
+
+# Site-level state; also all a multi-profile run's shared store holds (jobpilot.tenants)
+PLATFORM_REDIRECTS_TABLE = """CREATE TABLE IF NOT EXISTS platform_redirects (
+    linkedin_job_id TEXT PRIMARY KEY NOT NULL,
+    apply_url TEXT NOT NULL,
+    platform TEXT NOT NULL,
+    resolved_at INTEGER NOT NULL
+)"""
+PLATFORM_PACING_TABLE = """CREATE TABLE IF NOT EXISTS platform_pacing (
+    platform TEXT PRIMARY KEY NOT NULL,
+    min_interval REAL NOT NULL,
+    clean_streak INTEGER NOT NULL DEFAULT 0,
+    strikes INTEGER NOT NULL DEFAULT 0,
+    updated_at INTEGER NOT NULL
+)"""
+SHARED_STATE_TABLES = [PLATFORM_REDIRECTS_TABLE, PLATFORM_PACING_TABLE]
+
+
+# (version, description, statements)
+MIGRATIONS: List[Tuple[int, str, List[str]]] = [
+    (1, "indexes for the unapplied-job selection query", [
+        "CREATE INDEX IF NOT EXISTS idx_applications_job_id ON applications(job_id)",
+        "CREATE INDEX IF NOT EXISTS idx_applications_status ON applications(status, job_id)",
+        """CREATE INDEX IF NOT EXISTS idx_applications_unapplied ON applications(job_id)
+           WHERE status = 'unapplied'""",
+        "CREATE INDEX IF NOT EXISTS idx_jobs_match_score ON jobs(match_score DESC, id)",
+    ]),
+    (2, "FTS5 index over jobs.title/description", [
+        """CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+               title, description, content='jobs', content_rowid='rowid'
+           )""",
+        """CREATE TRIGGER IF NOT EXISTS jobs_fts_ai AFTER INSERT ON jobs BEGIN
+               INSERT INTO jobs_fts(rowid, title, description)
+               VALUES (new.rowid, new.title, new.description);
+           END""",
+        """CREATE TRIGGER IF NOT EXISTS jobs_fts_ad AFTER DELETE ON jobs BEGIN
+               INSERT INTO jobs_fts(jobs_fts, rowid, title, description)
+               VALUES ('delete', old.rowid, old.title, old.description);
+           END""",
+        """CREATE TRIGGER IF NOT EXISTS jobs_fts_au AFTER UPDATE OF title, description ON jobs BEGIN
+               INSERT INTO jobs_fts(jobs_fts, rowid, title, description)
+               VALUES ('delete', old.rowid, old.title, old.description);
+               INSERT INTO jobs_fts(rowid, title, description)
+               VALUES (new.rowid, new.title, new.description);
+           END""",
+        "INSERT INTO jobs_fts(jobs_fts) VALUES ('rebuild')",
+    ]),
+    (3, "LinkedIn job -> external apply URL cache", [
+        PLATFORM_REDIRECTS_TABLE,
+    ]),
+    (4, "run journal for resumable batch runs", [
+        """CREATE TABLE IF NOT EXISTS run_journal (
+               job_id TEXT PRIMARY KEY NOT NULL,
+               run_id TEXT NOT NULL,
+               state TEXT NOT NULL,
+               attempts INTEGER NOT NULL DEFAULT 0,
+               position INTEGER NOT NULL,
+               lease_expires INTEGER,
+               note TEXT,
+               updated_at INTEGER NOT NULL
+           )""",
+        "CREATE INDEX IF NOT EXISTS idx_run_journal_queue ON run_journal(state, position)",
+        "CREATE INDEX IF NOT EXISTS idx_run_journal_run ON run_journal(run_id, state)",
+    ]),
+    (5, "match-score bookkeeping: change queue, FTS vocabulary, meta table", [
+        """CREATE TABLE IF NOT EXISTS jobpilot_meta (
+               key TEXT PRIMARY KEY NOT NULL,
+               value TEXT
+           )""",
+        "CREATE TABLE IF NOT EXISTS job_score_queue (job_id TEXT PRIMARY KEY NOT NULL)",
+        """CREATE TRIGGER IF NOT EXISTS job_score_queue_ai AFTER INSERT ON jobs BEGIN
+               INSERT OR IGNORE INTO job_score_queue (job_id) VALUES (new.id);
+           END""",
+        """CREATE TRIGGER IF NOT EXISTS job_score_queue_au
+           AFTER UPDATE OF title, description, location, location_type, salary_min, salary_max ON jobs BEGIN
+               INSERT OR IGNORE INTO job_score_queue (job_id) VALUES (new.id);
+           END""",
+        """CREATE TRIGGER IF NOT EXISTS job_score_queue_ad AFTER DELETE ON jobs BEGIN
+               DELETE FROM job_score_queue WHERE job_id = old.id;
+           END""",
+        "INSERT OR IGNORE INTO job_score_queue (job_id) SELECT id FROM jobs",
+        "CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts_vocab USING fts5vocab(jobs_fts, 'row')",
+    ]),
+    (6, "near-duplicate index: normalized keys, SimHash LSH bands, change queue", [
+        """CREATE TABLE IF NOT EXISTS job_signatures (
+               job_id TEXT PRIMARY KEY NOT NULL,
+               company_key TEXT NOT NULL,
+               title_key TEXT NOT NULL,
+               location_key TEXT NOT NULL,
+               simhash INTEGER NOT NULL,
+               canonical_id TEXT NOT NULL
+           )""",
+        """CREATE INDEX IF NOT EXISTS idx_job_signatures_key
+           ON job_signatures(company_key, title_key, location_key)""",
+        """CREATE TABLE IF NOT EXISTS job_lsh (
+               band INTEGER NOT NULL,
+               bucket INTEGER NOT NULL,
+               job_id TEXT NOT NULL,
+               PRIMARY KEY (band, bucket, job_id)
+           ) WITHOUT ROWID""",
+        "CREATE INDEX IF NOT EXISTS idx_job_lsh_job ON job_lsh(job_id)",
+        "CREATE TABLE IF NOT EXISTS job_dedup_queue (job_id TEXT PRIMARY KEY NOT NULL)",
+        """CREATE TRIGGER IF NOT EXISTS job_dedup_queue_ai AFTER INSERT ON jobs BEGIN
+               INSERT OR IGNORE INTO job_dedup_queue (job_id) VALUES (new.id);
+           END""",
+        """CREATE TRIGGER IF NOT EXISTS job_dedup_queue_au
+           AFTER UPDATE OF title, company, location, description ON jobs BEGIN
+               INSERT OR IGNORE INTO job_dedup_queue (job_id) VALUES (new.id);
+           END""",
+        """CREATE TRIGGER IF NOT EXISTS job_dedup_ad AFTER DELETE ON jobs BEGIN
+               DELETE FROM job_dedup_queue WHERE job_id = old.id;
+               DELETE FROM job_signatures WHERE job_id = old.id;
+               DELETE FROM job_lsh WHERE job_id = old.id;
+           END""",
+        "INSERT OR IGNORE INTO job_dedup_queue (job_id) SELECT id FROM jobs ORDER BY rowid",
+    ]),
+    (7, "index for the posted_within_days preference filter", [
+        "CREATE INDEX IF NOT EXISTS idx_jobs_saved_at ON jobs(saved_at)",
+    ]),
+    (8, "learned per-platform pacing and the daily-limit count", [
+        PLATFORM_PACING_TABLE,
+        "CREATE INDEX IF NOT EXISTS idx_applications_applied_at ON applications(applied_at) WHERE status = 'applied'",
+    ]),
+    (9, "pre-flight posting liveness cache", [
+        """CREATE TABLE IF NOT EXISTS posting_liveness (
+               url TEXT PRIMARY KEY NOT NULL,
+               state TEXT NOT NULL,
+               http_status INTEGER,
+               final_url TEXT,
+               etag TEXT,
+               last_modified TEXT,
+               checked_at INTEGER NOT NULL,
+               expires_at INTEGER NOT NULL
+           )""",
+    ]),
+    (10, "incrementally maintained application analytics", [
+        """CREATE TABLE IF NOT EXISTS app_stats (
+               dimension TEXT NOT NULL,
+               key TEXT NOT NULL,
+               status TEXT NOT NULL,
+               n INTEGER NOT NULL DEFAULT 0,
+               wait_sum INTEGER NOT NULL DEFAULT 0,
+               wait_n INTEGER NOT NULL DEFAULT 0,
+               PRIMARY KEY (dimension, key, status)
+           ) WITHOUT ROWID""",
+        f"""CREATE TRIGGER IF NOT EXISTS app_stats_ai AFTER INSERT ON applications BEGIN
+               {_app_stats_delta('new', '+')}
+           END""",
+        f"""CREATE TRIGGER IF NOT EXISTS app_stats_ad AFTER DELETE ON applications BEGIN
+               {_app_stats_delta('old', '-')}
+           END""",
+        f"""CREATE TRIGGER IF NOT EXISTS app_stats_au
+           AFTER UPDATE OF status, platform, applied_at, created_at, job_id ON applications
+           WHEN old.status IS NOT new.status OR old.platform IS NOT new.platform
+             OR old.applied_at IS NOT new.applied_at OR old.created_at IS NOT new.created_at
+             OR old.job_id IS NOT new.job_id
+           BEGIN
+               {_app_stats_delta('old', '-')}
+               {_app_stats_delta('new', '+')}
+           END""",
+        *APP_STATS_REFRESH,
+    ]),
+    (11, "per-company application form schema cache", [
+        """CREATE TABLE IF NOT EXISTS form_schemas (
+               platform TEXT NOT NULL,
+               company TEXT NOT NULL,
+               fingerprint TEXT NOT NULL,
+               fields TEXT NOT NULL,
+               plan TEXT NOT NULL,
+               qa_version TEXT NOT NULL,
+               hits INTEGER NOT NULL DEFAULT 0,
+               created_at INTEGER NOT NULL,
+               last_used_at INTEGER NOT NULL,
+               PRIMARY KEY (platform, company, fingerprint)
+           ) WITHOUT ROWID""",
+    ]),
+    (12, "retry queue in the run journal", [
+        "ALTER TABLE run_journal ADD COLUMN retry_at INTEGER",
+        "ALTER TABLE run_journal ADD COLUMN failure_class TEXT",
+        "CREATE INDEX IF NOT EXISTS idx_run_journal_retry ON run_journal(retry_at) WHERE state = 'retry'",
+    ]),
+    (13, "posting date for the posted_within_days filter (saved_at is when it was scraped)", [
+        "ALTER TABLE jobs ADD COLUMN posted_at INTEGER",
+        "CREATE INDEX IF NOT EXISTS idx_jobs_posted_at ON jobs(posted_at) WHERE posted_at IS NOT NULL",
+    ]),
+    (14, "Q&A template usage counts, kept out of the dashboard's qa_templates", [
+        """CREATE TABLE IF NOT EXISTS qa_template_usage (
+               template_id TEXT PRIMARY KEY NOT NULL,
+               usage_count INTEGER NOT NULL DEFAULT 0,
+               last_used_at INTEGER
+           ) WITHOUT ROWID""",
+    ]),
+    (15, "keep app_stats company counts right when a job's company changes", [
+        f"""CREATE TRIGGER IF NOT EXISTS app_stats_job_company_au AFTER UPDATE OF company ON jobs
+           WHEN old.company IS NOT new.company
+           BEGIN
+               {APP_STATS_COMPANY_MOVE}
+           END""",
+        *APP_STATS_REFRESH,
+    ]),
+    (16, "promote the next-oldest duplicate when a canonical job is deleted", [
+        "DROP TRIGGER IF EXISTS job_dedup_ad",
+        """CREATE TRIGGER job_dedup_ad AFTER DELETE ON jobs BEGIN
+               DELETE FROM job_dedup_queue WHERE job_id = old.id;
+               DELETE FROM job_signatures WHERE job_id = old.id;
+               DELETE FROM job_lsh WHERE job_id = old.id;
+               UPDATE job_signatures SET canonical_id = (
+                   SELECT s.job_id FROM job_signatures s JOIN jobs j ON j.id = s.job_id
+                   WHERE s.canonical_id = old.id ORDER BY j.rowid LIMIT 1
+               )
+               WHERE canonical_id = old.id;
+           END""",
+        # Clusters whose canonical was deleted before this trigger existed
+        """CREATE TEMP TABLE dedup_promotions AS
+           SELECT s.canonical_id AS old_id, s.job_id AS new_id, MIN(j.rowid) AS first_rowid
+           FROM job_signatures s JOIN jobs j ON j.id = s.job_id
+           WHERE s.canonical_id NOT IN (SELECT id FROM jobs)
+           GROUP BY s.canonical_id""",
+        """UPDATE job_signatures
+           SET canonical_id = (SELECT new_id FROM temp.dedup_promotions WHERE old_id = job_signatures.canonical_id)
+           WHERE canonical_id IN (SELECT old_id FROM temp.dedup_promotions)""",
+        "DROP TABLE temp.dedup_promotions",
+    ]),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def current_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection) -> int:
+    """Apply pending migrations; returns the number applied"""
+    version = current_version(conn)
+    pending = [m for m in MIGRATIONS if m[0] > version]
+    if not pending:
+        return 0
+
+    in_transaction = conn.in_transaction
+    if not in_transaction:
+        conn.execute("BEGIN IMMEDIATE")
+    try:
+        # Re-check under the write lock in case another runner migrated first
+        version = current_version(conn)
+        applied = 0
+        for number, _description, statements in MIGRATIONS:
+            if number <= version:
+                continue
+            for statement in statements:
+                try:
+                    conn.execute(statement)
+                except sqlite3.OperationalError as e:
+                    # ADD COLUMN has no IF NOT EXISTS; a schema copied from a migrated database has it already
+                    if not str(e).startswith("duplicate column name"):
+                        raise
+            conn.execute(f"PRAGMA user_version = {number}")
+            applied += 1
+    except BaseException:
+        if not in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+    if not in_transaction:
+        conn.execute("COMMIT")
+
+    # Refresh planner statistics (sampled, so this stays fast on big tables)
+    conn.execute("PRAGMA analysis_limit = 1000")
+    conn.execute("ANALYZE")
+    return applied
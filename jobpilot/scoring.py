@@ -0,0 +1,224 @@
+"""
+Vectorized match-score engine for jobs.match_score
+- Profile/preferences become one weighted term vector; jobs become a sparse
+  (CSR) TF-IDF matrix; relevance is a single sparse matrix-vector product
+- Title, location, salary and exclusion rules are NumPy string/array ops;
+  title keywords match whole tokens, so "intern" never hits "Internal Tools"
+- Only jobs queued by the insert/update triggers are re-scored, unless the
+  config changed, in which case everything is
+
+Score the database from the command line:
+    python -m jobpilot.scoring data/db/jobpilot.db [--full]
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from jobpilot.config import load_preferences, load_profile
+
+SCORER_VERSION = 2
+DEFAULT_CHUNK_SIZE = 20_000
+
+# Component weights; the final score is on the 0-100 scale min_match_score uses
+WEIGHTS = {'title': 0.40, 'text': 0.30, 'location': 0.15, 'salary': 0.15}
+UNKNOWN = 0.5  # component value when the job doesn't say (no salary, no location)
+
+TOKEN = re.compile(r"[a-z0-9]+")
+STOPWORDS = {"and", "or", "the", "a", "an", "of", "in", "for", "to", "with", "on", "at", "i", "ii", "iii"}
+
+JOB_COLUMNS = "j.rowid, j.id, j.title, j.description, j.location, j.location_type, j.salary_min, j.salary_max"
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Same word split as the jobs_fts unicode61 tokenizer (lowercase alphanumerics)"""
+    return [t for t in TOKEN.findall((text or "").lower()) if t not in STOPWORDS]
+
+
+def token_text(text: Optional[str]) -> str:
+    """Tokens joined and padded with spaces, so a substring search only matches whole tokens"""
+    return f" {' '.join(tokenize(text))} "
+
+
+class MatchScorer:
+    def __init__(self, profile: Dict, preferences: Dict):
+        search = preferences.get('job_search', {})
+        skills = profile.get('skills', {})
+
+        # Preference keywords/titles count double against plain skills
+        weighted_terms: Dict[str, float] = {}
+        for text in search.get('keywords', []) + search.get('titles', []):
+            for term in tokenize(text):
+                weighted_terms[term] = weighted_terms.get(term, 0.0) + 2.0
+        skill_lists = [skills.get(k, []) for k in ('technical', 'programming_languages', 'frameworks', 'tools')]
+        skill_lists += [p.get('technologies', []) for p in profile.get('projects', [])]
+        for skill in (s for group in skill_lists for s in group):
+            for term in tokenize(skill):
+                weighted_terms[term] = weighted_terms.get(term, 0.0) + 1.0
+
+        self.vocab = {term: i for i, term in enumerate(sorted(weighted_terms))}
+        self.query = np.array([weighted_terms[t] for t in sorted(weighted_terms)], dtype=np.float64)
+
+        # Title rules are phrases of whole tokens (see token_text); ones that are all stopwords are dropped
+        self.titles = [token_text(t) for t in search.get('titles', []) if tokenize(t)]
+        self.keywords = [token_text(k) for k in search.get('keywords', []) if tokenize(k)]
+        self.locations = [l.lower() for l in search.get('locations', [])]
+        self.remote_preference = (search.get('remote_preference') or '').lower()
+        self.salary_minimum = (preferences.get('salary') or {}).get('minimum')
+        excluded = (preferences.get('filters') or {}).get('exclude_keywords', [])
+        self.exclude_keywords = [token_text(k) for k in excluded if tokenize(k)]
+
+        self.config_hash = hashlib.sha256(json.dumps(
+            [SCORER_VERSION, sorted(weighted_terms.items()), self.titles, self.keywords, self.locations,
+             self.remote_preference, self.salary_minimum, self.exclude_keywords]).encode()).hexdigest()[:16]
+
+    def _tfidf(self, texts: Sequence[str], doc_freq: Dict[str, int], n_docs: int):
+        """Sparse CSR (indptr, indices, data) TF-IDF rows restricted to the profile vocabulary"""
+        token_lists = [tokenize(text) for text in texts]
+        lengths = np.fromiter((len(tokens) for tokens in token_lists), dtype=np.int64, count=len(token_lists))
+        flat = np.fromiter((self.vocab.get(t, -1) for tokens in token_lists for t in tokens),
+                           dtype=np.int64, count=int(lengths.sum()))
+        rows = np.repeat(np.arange(len(texts), dtype=np.int64), lengths)
+        keep = flat >= 0
+
+        # (row, term) pairs -> counts, already sorted by row then term
+        keys, counts = np.unique(rows[keep] * len(self.vocab) + flat[keep], return_counts=True)
+        row_ids, indices = np.divmod(keys, len(self.vocab))
+        indptr = np.zeros(len(texts) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(row_ids, minlength=len(texts)), out=indptr[1:])
+
+        df = np.array([doc_freq.get(t, 0) for t in sorted(self.vocab, key=self.vocab.get)], dtype=np.float64)
+        idf = np.log((1.0 + n_docs) / (1.0 + df)) + 1.0
+        data = (1.0 + np.log(counts)) * idf[indices]
+        return indptr, indices, data
+
+    def _text_scores(self, texts: Sequence[str], doc_freq: Dict[str, int], n_docs: int) -> np.ndarray:
+        """Cosine similarity of every job row against the profile vector in one pass"""
+        scores = np.zeros(len(texts))
+        if not self.vocab or not len(texts):
+            return scores
+        indptr, indices, data = self._tfidf(texts, doc_freq, n_docs)
+        if not len(data):
+            return scores
+
+        nonempty = indptr[:-1] < indptr[1:]
+        starts = indptr[:-1][nonempty]
+        dots = np.add.reduceat(data * self.query[indices], starts)
+        norms = np.sqrt(np.add.reduceat(data * data, starts))
+        scores[nonempty] = dots / (norms * np.linalg.norm(self.query))
+        return scores
+
+    @staticmethod
+    def _contains_any(haystack: np.ndarray, needles: Iterable[str]) -> np.ndarray:
+        hits = np.zeros(haystack.shape, dtype=bool)
+        for needle in needles:
+            hits |= np.char.find(haystack, needle) >= 0
+        return hits
+
+    def score(self, jobs: Sequence[Dict], doc_freq: Dict[str, int], n_docs: int) -> np.ndarray:
+        """0-100 match scores for jobs (dicts with title/description/location/salary columns)"""
+        if not jobs:
+            return np.zeros(0)
+        titles = np.array([token_text(job['title']) for job in jobs], dtype=str)
+        locations = np.array([(job['location'] or '').lower() for job in jobs], dtype=str)
+        location_types = np.array([(job['location_type'] or '').lower() for job in jobs], dtype=str)
+        salary = np.array([job['salary_max'] or job['salary_min'] or np.nan for job in jobs], dtype=np.float64)
+
+        # Title appears twice so it outweighs a long description
+        texts = [f"{job['title'] or ''} {job['title'] or ''} {job['description'] or ''}" for job in jobs]
+        text = self._text_scores(texts, doc_freq, n_docs)
+
+        title = np.where(self._contains_any(titles, self.titles), 1.0,
+                         np.where(self._contains_any(titles, self.keywords), 0.6, 0.0))
+
+        location = np.where(locations == '', UNKNOWN, 0.0)
+        location = np.maximum(location, self._contains_any(locations, self.locations).astype(float))
+        if self.remote_preference:
+            location = np.maximum(location, (location_types == self.remote_preference).astype(float))
+
+        if self.salary_minimum:
+            salary_score = np.where(np.isnan(salary), UNKNOWN, (salary >= self.salary_minimum).astype(float))
+        else:
+            salary_score = np.ones(len(jobs))
+
+        score = 100.0 * (WEIGHTS['title'] * title + WEIGHTS['text'] * text
+                         + WEIGHTS['location'] * location + WEIGHTS['salary'] * salary_score)
+        score[self._contains_any(titles, self.exclude_keywords)] = 0.0
+        return np.round(score, 1)
+
+
+def _doc_freq(conn, vocab: Iterable[str]) -> Dict[str, int]:
+    """Document frequencies straight from the FTS index (no re-tokenizing the corpus)"""
+    terms = list(vocab)
+    if not terms:
+        return {}
+    placeholders = ",".join("?" * len(terms))
+    return dict(conn.execute(f"SELECT term, doc FROM jobs_fts_vocab WHERE term IN ({placeholders})", terms))
+
+
+def _meta(conn, key: str) -> Optional[str]:
+    row = conn.execute("SELECT value FROM jobpilot_meta WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else None
+
+
+def score_jobs(storage, profile: Optional[Dict] = None, preferences: Optional[Dict] = None,
+               full: bool = False, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """Score new/changed jobs (or all of them) and write jobs.match_score; returns rows scored"""
+    scorer = MatchScorer(profile or load_profile(), preferences or load_preferences())
+    conn = storage.connection
+
+    with storage.transaction():
+        full = full or _meta(conn, 'match_score_config') != scorer.config_hash
+        doc_freq = _doc_freq(conn, scorer.vocab)
+        n_docs = conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+    if full:
+        source = f"SELECT {JOB_COLUMNS} FROM jobs j WHERE j.rowid > ? ORDER BY j.rowid LIMIT ?"
+    else:
+        source = f"""
+        SELECT {JOB_COLUMNS} FROM job_score_queue q JOIN jobs j ON j.id = q.job_id
+        WHERE j.rowid > ? ORDER BY j.rowid LIMIT ?
+        """
+
+    scored = 0
+    last_rowid = 0
+    while True:
+        jobs = storage.fetch_all(source, (last_rowid, chunk_size))
+        if not jobs:
+            break
+        last_rowid = jobs[-1]['rowid']
+        scores = scorer.score(jobs, doc_freq, n_docs)
+        with storage.transaction() as tx:
+            tx.executemany("UPDATE jobs SET match_score = ? WHERE id = ?",
+                           zip(scores.tolist(), (job['id'] for job in jobs)))
+            tx.executemany("DELETE FROM job_score_queue WHERE job_id = ?", ((job['id'],) for job in jobs))
+        scored += len(jobs)
+
+    storage.execute("""
+    INSERT INTO jobpilot_meta (key, value) VALUES ('match_score_config', ?)
+    ON CONFLICT(key) DO UPDATE SET value = excluded.value
+    """, (scorer.config_hash,))
+    return scored
+
+
+def main():
+    from jobpilot.storage import get_storage
+
+    parser = argparse.ArgumentParser(description="Compute jobs.match_score from profile and preferences")
+    parser.add_argument("db", type=Path)
+    parser.add_argument("--full", action="store_true", help="re-score every job, not just new/changed ones")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    scored = score_jobs(get_storage(args.db), full=args.full)
+    print(f"Scored {scored} jobs in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
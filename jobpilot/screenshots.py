@@ -0,0 +1,192 @@
+"""
+Asynchronous screenshot storage for the apply path
+- submit() only hashes the capture and returns its final path; decoding,
+  re-encoding and writing happen on one background thread, and on_stored is
+  called with the path only once the file is really on disk
+- Content-addressed (data/screenshots/<sha256>.webp), so identical
+  confirmation pages are encoded and stored once
+- PNG captures are re-encoded to WebP (or AVIF where Pillow supports it) with a
+  <sha256>.thumb.webp beside them for the dashboard's /api/screenshots?thumb=1
+- Pillow is optional; without it captures are stored as-is, still deduplicated
+"""
+
+import hashlib
+import io
+import os
+import queue
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from jobpilot.config import PROJECT_ROOT
+
+SCREENSHOT_DIR = PROJECT_ROOT / "data" / "screenshots"
+DEFAULT_FORMAT = "webp"
+DEFAULT_QUALITY = 80
+THUMB_WIDTH = 320
+THUMB_QUALITY = 60
+MAX_PENDING = 32  # captures waiting to be encoded before submit() blocks
+
+# BrowserSession result 'screenshots' keys -> applications column to record the path in
+RESULT_COLUMNS = {'preview': 'screenshot_path', 'confirmation': 'confirmation_screenshot_path'}
+
+
+def _pillow_format(requested: str) -> Optional[str]:
+    """The best encoding Pillow offers here: requested, else WebP, else None (store as-is)"""
+    try:
+        from PIL import features
+    except ImportError:
+        return None
+    for candidate in (requested, "webp"):
+        try:
+            if features.check(candidate):
+                return candidate
+        except ValueError:  # feature name unknown to this Pillow (e.g. avif before 11.2)
+            continue
+    return None
+
+
+def _sniff_extension(image: bytes) -> str:
+    if image.startswith(b"\x89PNG"):
+        return "png"
+    if image.startswith(b"\xff\xd8"):
+        return "jpg"
+    if image[8:12] == b"WEBP":
+        return "webp"
+    return "bin"
+
+
+def _write_atomic(path: Path, data: bytes):
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+@dataclass
+class SinkStats:
+    stored: int = 0
+    deduplicated: int = 0
+    failed: int = 0
+    bytes_in: int = 0
+    bytes_out: int = 0
+
+
+class ScreenshotSink:
+    """Stores captures off the hot path; safe to share between apply threads"""
+
+    def __init__(self, directory: Path = SCREENSHOT_DIR, image_format: str = DEFAULT_FORMAT,
+                 quality: int = DEFAULT_QUALITY, max_pending: int = MAX_PENDING):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.quality = quality
+        self.image_format = _pillow_format(image_format)
+        self.stats = SinkStats()
+
+        self._lock = threading.Lock()
+        # digest -> on_stored callbacks for a capture still waiting to be written
+        self._waiting: Dict[str, List[Callable[[str], None]]] = {}
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_pending)
+        self._closed = False
+        self._thread = threading.Thread(target=self._encode_loop, name="jobpilot-screenshots", daemon=True)
+        self._thread.start()
+
+    def _relative(self, path: Path) -> str:
+        # Stored the way the dashboard does: data/screenshots/<name>
+        try:
+            return path.relative_to(PROJECT_ROOT).as_posix()
+        except ValueError:
+            return str(path)
+
+    def submit(self, image: bytes, on_stored: Optional[Callable[[str], None]] = None) -> str:
+        """Queue a capture for storage; returns its path, which on_stored(path) receives once written.
+        If the write fails on_stored is never called, so nothing points at a missing file"""
+        digest = hashlib.sha256(image).hexdigest()
+        extension = self.image_format or _sniff_extension(image)
+        path = self.directory / f"{digest}.{extension}"
+        relative = self._relative(path)
+        callbacks = [on_stored] if on_stored else []
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("ScreenshotSink is closed")
+            pending = digest in self._waiting
+            stored = not pending and path.exists()
+            if pending:
+                self._waiting[digest].extend(callbacks)
+            elif not stored:
+                self._waiting[digest] = callbacks
+            if pending or stored:
+                self.stats.deduplicated += 1
+        if stored:
+            for callback in callbacks:
+                callback(relative)
+        elif not pending:
+            # Blocks only if the encoder is max_pending captures behind
+            self._queue.put((digest, path, image))
+        return relative
+
+    def _encode(self, path: Path, image: bytes):
+        if self.image_format is None:
+            _write_atomic(path, image)
+            return len(image)
+
+        from PIL import Image
+
+        with Image.open(io.BytesIO(image)) as source:
+            source.load()
+            if source.mode not in ("RGB", "RGBA"):
+                source = source.convert("RGBA" if "A" in source.getbands() else "RGB")
+            encoded = io.BytesIO()
+            source.save(encoded, format=self.image_format.upper(), quality=self.quality)
+            _write_atomic(path, encoded.getvalue())
+
+            source.thumbnail((THUMB_WIDTH, THUMB_WIDTH * 4))
+            thumb = io.BytesIO()
+            source.save(thumb, format="WEBP", quality=THUMB_QUALITY)
+            _write_atomic(path.with_name(f"{path.stem}.thumb.webp"), thumb.getvalue())
+        return encoded.tell()
+
+    def _encode_loop(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                digest, path, image = item
+                try:
+                    written = self._encode(path, image)
+                finally:
+                    with self._lock:
+                        callbacks = self._waiting.pop(digest, [])
+                with self._lock:
+                    self.stats.stored += 1
+                    self.stats.bytes_in += len(image)
+                    self.stats.bytes_out += written
+                for callback in callbacks:
+                    callback(self._relative(path))
+            except Exception as e:
+                with self._lock:
+                    self.stats.failed += 1
+                print(f"     ✗ Screenshot {item[1].name} not saved: {e}")
+            finally:
+                self._queue.task_done()
+
+    def drain(self):
+        """Block until every submitted capture is on disk"""
+        self._queue.join()
+
+    def close(self):
+        """Finish pending captures and stop the encoder thread"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+
+    def __enter__(self) -> "ScreenshotSink":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,233 @@
+"""
+Offline semantic retrieval of Q&A templates for form questions
+- Questions and template patterns become hashed word + character n-gram vectors
+  (no model download, CPU only)
+- Template vectors are built once and stored as qa_vectors.npy next to the
+  database; later runs mmap them and only rebuild when the templates change
+- A whole form's questions are scored in one matrix product with top-k per question
+- QAMatcher(semantic=SemanticIndex.for_database(...)) uses best_matches() for
+  questions none of the regex patterns match
+
+Query or benchmark from the command line:
+    python -m jobpilot.semantic data/db/jobpilot.db "Why do you want to join us?"
+    python -m jobpilot.semantic --bench
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from jobpilot.qa import QATemplate, load_templates
+
+EMBEDDING_VERSION = 1
+DIM = 1024
+CHAR_NGRAMS = (3, 4)
+WORD_WEIGHT = 1.0
+CHAR_WEIGHT = 0.5
+# ARCHITECTURE.md's "> 0.8" assumes a learned embedding; hashed n-gram cosines of a
+# paraphrase land lower, so the cut-off for "match, otherwise generate" is 0.5 here
+MATCH_THRESHOLD = 0.5
+
+VECTORS_FILE = "qa_vectors.npy"
+META_FILE = "qa_vectors.json"
+
+WORD = re.compile(r"[a-z0-9]+")
+# Filler words of form questions; they say nothing about which template applies
+STOPWORDS = {"a", "an", "the", "and", "or", "of", "to", "in", "on", "at", "for", "with", "from", "is", "are",
+             "do", "does", "you", "your", "we", "our", "us", "what", "how", "would", "could", "be", "this",
+             "that", "have", "has", "any", "please", "describe", "tell", "about"}
+
+
+class SemanticMatch(NamedTuple):
+    template_id: str
+    score: float
+
+
+def _features(text: str) -> Dict[int, float]:
+    weights: Dict[int, float] = {}
+    for word in WORD.findall(text.lower()):
+        if word in STOPWORDS:
+            continue
+        features = [(word, WORD_WEIGHT)]
+        padded = f"#{word}#"
+        features += [(padded[i:i + n], CHAR_WEIGHT)
+                     for n in CHAR_NGRAMS for i in range(len(padded) - n + 1)]
+        for feature, weight in features:
+            h = zlib.crc32(feature.encode())
+            # Signed hashing keeps collisions from biasing similarities upwards
+            weights[h % DIM] = weights.get(h % DIM, 0.0) + (weight if h & 0x80000000 else -weight)
+    return weights
+
+
+def embed(texts: Sequence[str]) -> np.ndarray:
+    """L2-normalized float32 (len(texts), DIM) matrix"""
+    matrix = np.zeros((len(texts), DIM), dtype=np.float32)
+    for row, text in enumerate(texts):
+        features = _features(text)
+        if features:
+            matrix[row, list(features)] = list(features.values())
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
+
+
+def pattern_text(pattern: str) -> str:
+    """Plain words of a regex question pattern ("why .* interested" -> "why interested")"""
+    return " ".join(WORD.findall(pattern.lower()))
+
+
+def templates_fingerprint(templates: Sequence[QATemplate]) -> str:
+    return hashlib.sha256(json.dumps(
+        [EMBEDDING_VERSION, DIM, CHAR_NGRAMS, [(t.id, t.question_patterns) for t in templates]]
+    ).encode()).hexdigest()[:16]
+
+
+class SemanticIndex:
+    def __init__(self, directory: Path):
+        self.vectors_path = Path(directory) / VECTORS_FILE
+        self.meta_path = Path(directory) / META_FILE
+        self._vectors: Optional[np.ndarray] = None
+        self._row_ids: List[str] = []
+        self._fingerprint: Optional[str] = None
+
+    @classmethod
+    def for_database(cls, db_path: Path) -> "SemanticIndex":
+        return cls(Path(db_path).resolve().parent)
+
+    def _load_meta(self) -> Optional[Dict]:
+        try:
+            with open(self.meta_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def build(self, templates: Sequence[QATemplate]):
+        """Embed one row per question pattern and write vectors + row ids atomically"""
+        rows = [(t.id, pattern_text(p)) for t in templates for p in t.question_patterns]
+        vectors = embed([text for _, text in rows])
+        fingerprint = templates_fingerprint(templates)
+
+        # Per-process temp names: every browser worker may rebuild at start-up
+        tmp_vectors = self.vectors_path.with_suffix(f".{os.getpid()}.tmp.npy")
+        np.save(tmp_vectors, vectors)
+        tmp_meta = self.meta_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_meta, "w", encoding="utf-8") as f:
+            json.dump({'fingerprint': fingerprint, 'dim': DIM, 'ids': [tid for tid, _ in rows]}, f)
+        os.replace(tmp_vectors, self.vectors_path)
+        os.replace(tmp_meta, self.meta_path)
+        self._vectors = None
+
+    def ensure(self, templates: Sequence[QATemplate]) -> bool:
+        """Build the vector file if it's missing or stale; returns True if it was rebuilt"""
+        meta = self._load_meta()
+        if (meta and meta.get('fingerprint') == templates_fingerprint(templates)
+                and self.vectors_path.exists()):
+            return False
+        self.build(templates)
+        return True
+
+    def _load(self) -> np.ndarray:
+        if self._vectors is None:
+            meta = self._load_meta()
+            if meta is None or not self.vectors_path.exists():
+                raise FileNotFoundError(f"No Q&A vectors at {self.vectors_path}; build them first")
+            self._vectors = np.load(self.vectors_path, mmap_mode="r")
+            self._row_ids = meta['ids']
+            self._fingerprint = meta['fingerprint']
+        return self._vectors
+
+    def search(self, questions: Sequence[str], k: int = 3) -> List[List[SemanticMatch]]:
+        """Top-k templates (best pattern score per template) for each question"""
+        vectors = self._load()
+        if not len(questions) or not len(vectors):
+            return [[] for _ in questions]
+        scores = embed(questions) @ vectors.T
+
+        # Over-fetch rows so several patterns of one template don't crowd out others
+        fetch = min(len(vectors), k * 4)
+        top = np.argpartition(-scores, fetch - 1, axis=1)[:, :fetch]
+        results = []
+        for q, rows in enumerate(top):
+            best: Dict[str, float] = {}
+            for row in rows[np.argsort(-scores[q, rows])]:
+                tid = self._row_ids[row]
+                if tid not in best:
+                    best[tid] = float(scores[q, row])
+            results.append([SemanticMatch(tid, score) for tid, score in list(best.items())[:k]])
+        return results
+
+    def best_matches(self, questions: Sequence[str],
+                     threshold: float = MATCH_THRESHOLD) -> List[Optional[SemanticMatch]]:
+        """Best template per question, or None where the answer should be generated instead"""
+        return [matches[0] if matches and matches[0].score > threshold else None
+                for matches in self.search(questions, k=1)]
+
+
+def _synthetic_templates(count: int, seed: int = 11) -> List[QATemplate]:
+    rng = np.random.default_rng(seed)
+    words = ("why interested work salary compensation start date notice period years experience "
+             "remote office hybrid weakness improve challenge team conflict leadership project "
+             "visa sponsorship relocate travel degree python cloud customer failure success").split()
+    return [QATemplate(f"t{i}", "synthetic", [" ".join(rng.choice(words, 3)), " ".join(rng.choice(words, 4))],
+                       "", []) for i in range(count)]
+
+
+def benchmark(sizes: Sequence[int] = (10, 100, 1_000, 5_000), questions: int = 30,
+              repeats: int = 20) -> List[Tuple[int, float, float]]:
+    """(templates, build seconds, per-form lookup milliseconds) for growing template counts"""
+    import tempfile
+
+    form = [f"How many years of experience do you have with item {i}?" for i in range(questions)]
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            templates = _synthetic_templates(size)
+            index = SemanticIndex(Path(tmp))
+            start = time.perf_counter()
+            index.build(templates)
+            built = time.perf_counter() - start
+
+            index = SemanticIndex(Path(tmp))
+            index.search(form[:1])  # mmap outside the timed loop
+            start = time.perf_counter()
+            for _ in range(repeats):
+                index.search(form)
+            results.append((size, built, (time.perf_counter() - start) / repeats * 1000))
+    return results
+
+
+def main():
+    from jobpilot.storage import get_storage
+
+    parser = argparse.ArgumentParser(description="Semantic Q&A template retrieval")
+    parser.add_argument("db", type=Path, nargs="?", help="database next to which qa_vectors.npy lives")
+    parser.add_argument("questions", nargs="*")
+    parser.add_argument("-k", type=int, default=3)
+    parser.add_argument("--bench", action="store_true", help="time lookups as the template count grows")
+    args = parser.parse_args()
+
+    if args.bench:
+        print(f"{'templates':>10} {'build s':>9} {'30-question lookup ms':>22}")
+        for size, built, lookup_ms in benchmark():
+            print(f"{size:>10} {built:>9.3f} {lookup_ms:>22.3f}")
+        return
+    if args.db is None:
+        parser.error("db is required unless --bench is given")
+
+    index = SemanticIndex.for_database(args.db)
+    if index.ensure(load_templates(get_storage(args.db))):
+        print(f"Built {index.vectors_path}")
+    for question, matches in zip(args.questions, index.search(args.questions, k=args.k)):
+        print(json.dumps({'question': question, 'matches': [m._asdict() for m in matches]}))
+
+
+if __name__ == "__main__":
+    main()
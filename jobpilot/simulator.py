@@ -0,0 +1,568 @@
+"""
+Fake ATS for exercising the apply pipeline offline
+- FakeATS serves Greenhouse-, Lever-, Ashby- and LinkedIn-style postings and
+  application forms from one local HTTP server, with configurable latency,
+  5xx errors, 429s (random and/or over a per-platform request rate), captchas
+  on submit and closed postings
+- HttpBrowserSession is a BrowserSession that walks the flow against it: open
+  the posting, follow LinkedIn's Apply link, read the form, plan and fill it
+  with jobpilot.forms and submit; errors use the wording the pacing and retry
+  classifiers look for
+- The load test runs RealBatchApplier (preflight, scheduler, worker pool,
+  journal, retries) over a scratch database of postings on the simulator and
+  reports applications/min, stage latencies and whether every injected fault
+  was classified as it should have been
+
+    python -m jobpilot.simulator --serve --port 8765
+    python -m jobpilot.simulator --load-test --jobs 2000 --concurrency 8 --captcha-rate 0.02
+"""
+
+import argparse
+import hashlib
+import io
+import random
+import re
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import Counter, deque
+from contextlib import redirect_stdout
+from dataclasses import dataclass
+from functools import partial
+from html.parser import HTMLParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Deque, Dict, List, Optional, Tuple
+
+from jobpilot.metrics import FORM_FILL, NAVIGATE, SUBMIT, InstrumentedClock
+from jobpilot.pacing import PacingController
+from jobpilot.platforms import LINKEDIN, PlatformResolver
+from jobpilot.retry import NEEDS_HUMAN, PERMANENT, RATE_LIMITED, TRANSIENT
+from jobpilot.scheduler import ApplyScheduler, PlatformPolicy, SystemClock
+from jobpilot.workers import BrowserSession
+
+# First path segment -> platform; every fake ATS shares the one host
+PLATFORMS = {'linkedin': LINKEDIN, 'greenhouse': 'Greenhouse', 'lever': 'Lever', 'ashby': 'Ashby'}
+ATS_PREFIXES = ['greenhouse', 'lever', 'ashby']
+COMPANIES = ["Acme", "Globex", "Initech", "Hooli", "Umbrella", "Soylent", "Tyrell", "Aperture"]
+TITLES = ["Software Engineer", "Backend Engineer", "Platform Engineer", "Full Stack Engineer"]
+JOB_PATH = re.compile(r"^/(linkedin)/jobs/view/(\d+)$|^/(greenhouse)/([\w-]+)/jobs/(\d+)$"
+                      r"|^/(lever|ashby)/([\w-]+)/(\d+)$")
+
+# (name, input type, label, required) per platform; {company} is filled in per posting
+FORMS = {
+    'greenhouse': [
+        ("first_name", "text", "First Name", True),
+        ("last_name", "text", "Last Name", True),
+        ("email", "email", "Email", True),
+        ("phone", "tel", "Phone", True),
+        ("resume", "file", "Resume/CV", True),
+        ("job_application[answers_attributes][0][text_value]", "textarea",
+         "Why are you interested in working at {company}?", True),
+    ],
+    'lever': [
+        ("name", "text", "Full name", True),
+        ("email", "email", "Email", True),
+        ("phone", "tel", "Phone", False),
+        ("urls[LinkedIn]", "url", "LinkedIn URL", False),
+        ("resume", "file", "Resume/CV", True),
+        ("comments", "textarea", "Additional information", False),
+    ],
+    'ashby': [
+        ("_systemfield_name", "text", "Name", True),
+        ("_systemfield_email", "email", "Email", True),
+        ("_systemfield_resume", "file", "Resume", True),
+        ("source", "select", "How did you hear about us?", False),
+    ],
+}
+
+# Server-side outcome of a job's last attempt -> the failure class the runner should have recorded
+APPLIED = 'applied'
+EXPECTED_CLASS = {'closed': PERMANENT, 'rate_limited': RATE_LIMITED, 'captcha': NEEDS_HUMAN, 'error': TRANSIENT}
+
+LOAD_TEST_PREFERENCES = {'job_search': {'titles': ["Engineer"]}}
+JOB_KEY_HEADER = "X-Jobpilot-Job"
+
+
+@dataclass
+class SimulatorConfig:
+    latency: float = 0.05          # mean seconds per response
+    jitter: float = 0.5            # +/- fraction of latency
+    error_rate: float = 0.02       # 503s
+    rate_limit_rate: float = 0.02  # random 429s
+    max_rps: float = 0.0           # 429 once a platform sees more requests than this per second (0 = off)
+    captcha_rate: float = 0.01     # captcha instead of a confirmation on submit
+    closed_rate: float = 0.05      # postings that answer 410 (fixed per posting)
+    seed: int = 7
+
+
+def _unit(*parts) -> float:
+    """Deterministic value in [0, 1) for a posting, so it is closed (or not) on every request"""
+    digest = hashlib.blake2b("/".join(map(str, parts)).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big") / 2 ** 64
+
+
+def posting_path(n: int, prefix: str, company: str) -> str:
+    slug = company.lower()
+    if prefix == 'linkedin':
+        return f"/linkedin/jobs/view/{n}"
+    if prefix == 'greenhouse':
+        return f"/greenhouse/{slug}/jobs/{n}"
+    return f"/{prefix}/{slug}/{n}"
+
+
+def _parse_path(path: str) -> Optional[Tuple[str, str, int]]:
+    """(prefix, company slug, posting number) for a posting URL path"""
+    match = JOB_PATH.match(path)
+    if not match:
+        return None
+    groups = [g for g in match.groups() if g is not None]
+    if groups[0] == 'linkedin':
+        return 'linkedin', COMPANIES[int(groups[1]) % len(COMPANIES)].lower(), int(groups[1])
+    return groups[0], groups[1], int(groups[2])
+
+
+def _form_page(prefix: str, company: str, n: int, path: str) -> str:
+    fields = []
+    for i, (name, kind, label, required) in enumerate(FORMS[prefix]):
+        label = label.format(company=company.title())
+        req = " required" if required else ""
+        if kind == "textarea":
+            control = f'<textarea id="f{i}" name="{name}"{req}></textarea>'
+        elif kind == "select":
+            control = (f'<select id="f{i}" name="{name}"{req}><option>LinkedIn</option>'
+                       f'<option>Referral</option><option>Other</option></select>')
+        else:
+            control = f'<input id="f{i}" type="{kind}" name="{name}"{req}>'
+        fields.append(f'<label for="f{i}">{label}</label>{control}')
+    return (f"<html><head><title>{TITLES[n % len(TITLES)]} at {company.title()}</title></head><body>"
+            f"<h1>{TITLES[n % len(TITLES)]}</h1><form method=\"post\" action=\"{path}\">"
+            + "".join(fields) + '<button type="submit">Submit application</button></form></body></html>')
+
+
+class FakeATS:
+    """Threaded HTTP server playing every ATS; stats and per-job outcomes are readable while it runs"""
+
+    def __init__(self, config: Optional[SimulatorConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or SimulatorConfig()
+        self.rng = random.Random(self.config.seed)
+        self.lock = threading.Lock()
+        self.stats: Counter = Counter()
+        self.outcomes: Dict[str, str] = {}  # X-Jobpilot-Job -> outcome of its last request
+        self._recent: Dict[str, Deque[float]] = {}
+        simulator = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                simulator._handle(self, None)
+
+            def do_HEAD(self):
+                simulator._handle(self, None)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                simulator._handle(self, urllib.parse.parse_qs(self.rfile.read(length).decode()))
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, name="jobpilot-fake-ats", daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeATS":
+        self.thread.start()
+        return self
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self) -> "FakeATS":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _roll(self) -> float:
+        with self.lock:
+            return self.rng.random()
+
+    def _over_rate(self, prefix: str) -> bool:
+        if not self.config.max_rps:
+            return False
+        now = time.monotonic()
+        with self.lock:
+            recent = self._recent.setdefault(prefix, deque())
+            while recent and recent[0] < now - 1.0:
+                recent.popleft()
+            recent.append(now)
+            return len(recent) > self.config.max_rps
+
+    def _handle(self, handler: BaseHTTPRequestHandler, form: Optional[Dict[str, List[str]]]):
+        config = self.config
+        if config.latency:
+            time.sleep(config.latency * (1 + config.jitter * (2 * self._roll() - 1)))
+        path = urllib.parse.urlsplit(handler.path).path
+        parsed = _parse_path(path)
+        job_key = handler.headers.get(JOB_KEY_HEADER)
+
+        if parsed is None:
+            status, outcome, body = 404, None, "<h1>Page not found</h1>"
+        else:
+            prefix, company, n = parsed
+            roll = self._roll()
+            if _unit('closed', n) < config.closed_rate:
+                status, outcome, body = 410, 'closed', "<h1>This job is no longer accepting applications</h1>"
+            elif roll < config.error_rate:
+                status, outcome, body = 503, 'error', "<h1>Service Unavailable</h1>"
+            elif roll < config.error_rate + config.rate_limit_rate or self._over_rate(prefix):
+                status, outcome, body = 429, 'rate_limited', "<h1>Too Many Requests</h1>"
+            elif prefix == 'linkedin':
+                target = posting_path(n, ATS_PREFIXES[n % len(ATS_PREFIXES)], company)
+                status, outcome = 200, None
+                body = (f"<html><body><h1>{TITLES[n % len(TITLES)]}</h1>"
+                        f'<a id="apply-button" href="{target}">Apply</a></body></html>')
+            elif form is None:
+                status, outcome, body = 200, None, _form_page(prefix, company, n, path)
+            elif self._roll() < config.captcha_rate:
+                status, outcome, body = 200, 'captcha', "<h1>Please complete the captcha to continue</h1>"
+            else:
+                missing = [name for name, _kind, _label, required in FORMS[prefix]
+                           if required and not any(v.strip() for v in form.get(name, []))]
+                if missing:
+                    status, outcome, body = 422, 'invalid', f"<h1>Missing required field: {missing[0]}</h1>"
+                else:
+                    status, outcome, body = 200, APPLIED, "<h1>Application submitted</h1>"
+
+        with self.lock:
+            self.stats[status] += 1
+            if job_key and outcome:
+                self.outcomes[job_key] = outcome
+        data = body.encode()
+        handler.send_response(status)
+        handler.send_header("Content-Type", "text/html; charset=utf-8")
+        handler.send_header("Content-Length", str(len(data)))
+        if status == 429:
+            handler.send_header("Retry-After", "1")
+        handler.end_headers()
+        if handler.command != "HEAD":
+            handler.wfile.write(data)
+
+
+class _FormParser(HTMLParser):
+    """Fields of the first form on a page, in jobpilot.forms probe format"""
+
+    def __init__(self):
+        super().__init__()
+        self.action: Optional[str] = None
+        self.apply_link: Optional[str] = None
+        self.fields: List[Dict] = []
+        self.names: Dict[str, str] = {}  # selector -> form field name
+        self._labels: Dict[str, str] = {}
+        self._label_for: Optional[str] = None
+        self._select: Optional[Dict] = None
+        self._option = False
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'form' and self.action is None:
+            self.action = attrs.get('action') or ""
+        elif tag == 'a' and attrs.get('id') == 'apply-button':
+            self.apply_link = attrs.get('href')
+        elif tag == 'label':
+            self._label_for = attrs.get('for')
+            self._labels[self._label_for] = ""
+        elif tag in ('input', 'textarea', 'select') and attrs.get('name'):
+            if attrs.get('type') in ('hidden', 'submit', 'button'):
+                return
+            selector = f'[name="{attrs["name"]}"]'
+            self.names[selector] = attrs['name']
+            field = {'selector': selector, 'kind': attrs.get('type', tag) if tag == 'input' else tag,
+                     'label': self._labels.get(attrs.get('id'), ""), 'required': 'required' in attrs,
+                     'options': []}
+            self.fields.append(field)
+            if tag == 'select':
+                self._select = field
+        elif tag == 'option':
+            self._option = True
+
+    def handle_endtag(self, tag):
+        if tag == 'label':
+            self._label_for = None
+        elif tag == 'select':
+            self._select = None
+        elif tag == 'option':
+            self._option = False
+
+    def handle_data(self, data):
+        if self._label_for is not None:
+            self._labels[self._label_for] += data.strip()
+        elif self._option and self._select is not None:
+            self._select['options'].append(data.strip())
+
+
+class HttpBrowserSession(BrowserSession):
+    """Applies over plain HTTP against FakeATS; runs inside a WorkerPool worker"""
+
+    def __init__(self, timeout: float = 10.0):
+        self.timeout = timeout
+
+    def open(self):
+        from jobpilot.config import load_profile
+        from jobpilot.qa import QAMatcher, load_templates
+
+        self.matcher = QAMatcher(load_templates())
+        self.applicant = {'profile': load_profile(), 'resume': {'path': 'resume.pdf'}}
+
+    def _request(self, url: str, job_id: str, data: Optional[Dict[str, str]] = None) -> str:
+        body = urllib.parse.urlencode(data).encode() if data is not None else None
+        request = urllib.request.Request(url, data=body, headers={JOB_KEY_HEADER: job_id})
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return response.read().decode()
+        except urllib.error.HTTPError as e:
+            if e.code in (404, 410):
+                raise RuntimeError(f"HTTP {e.code}: posting closed") from None
+            raise RuntimeError(f"HTTP {e.code} {e.reason}") from None
+
+    def apply(self, job: Dict) -> Dict:
+        from jobpilot.forms import fields_from_probe, plan_form, resolve
+
+        timings = {}
+        started = time.perf_counter()
+        url = job.get('apply_url') or job['url']
+        page = self._request(url, job['id'])
+        parser = _FormParser()
+        parser.feed(page)
+        apply_url = None
+        if parser.apply_link:
+            # LinkedIn-style posting: follow Apply to the real ATS
+            apply_url = url = urllib.parse.urljoin(url, parser.apply_link)
+            parser = _FormParser()
+            parser.feed(self._request(url, job['id']))
+        if parser.action is None:
+            raise RuntimeError("No application form on the page")
+        timings[NAVIGATE] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        fields = fields_from_probe(parser.fields)
+        forms = self.form_cache(job)
+        if forms is not None:
+            fill = forms.fill(job.get('platform', ''), job.get('company', ''), fields, job['applicant'],
+                              role=job.get('title', ''))
+        else:
+            fill = resolve(fields, plan_form(fields, self.matcher), self.applicant, self.matcher,
+                           company=job.get('company', ''), role=job.get('title', ''))
+        values = {parser.names[v['selector']]: v['value'] for v in fill.values}
+        values.update({parser.names[u['selector']]: Path(u['path']).name for u in fill.uploads})
+        timings[FORM_FILL] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        confirmation = self._request(urllib.parse.urljoin(url, parser.action), job['id'], values).lower()
+        timings[SUBMIT] = time.perf_counter() - started
+        if "captcha" in confirmation:
+            raise RuntimeError("captcha challenge on submit")
+        if "application submitted" not in confirmation:
+            raise RuntimeError("Submit was not confirmed")
+        return {
+            'log': [f"Submitted {len(values)} fields to {url}"],
+            'timings': timings,
+            'apply_url': apply_url,
+            'form_cached': fill.cached,
+        }
+
+
+class SimulatorResolver(PlatformResolver):
+    """Platforms from the simulator's path prefix; LinkedIn redirects are remembered in memory"""
+
+    def __init__(self, storage):
+        super().__init__(storage)
+        self._redirects: Dict[str, Tuple[str, str]] = {}
+
+    @staticmethod
+    def platform_of(url: str) -> str:
+        prefix = urllib.parse.urlsplit(url).path.strip("/").split("/")[0]
+        return PLATFORMS.get(prefix, 'Generic')
+
+    def resolve(self, url: str) -> Tuple[str, str]:
+        return self._redirects.get(url) or (url, self.platform_of(url))
+
+    def record(self, linkedin_url: str, apply_url: str) -> str:
+        platform = self.platform_of(apply_url)
+        self._redirects[linkedin_url] = (apply_url, platform)
+        return platform
+
+
+class ScaledPacer(PacingController):
+    """Pacing with 429/captcha backoffs shrunk by time_scale, so a load test doesn't sleep for real minutes"""
+
+    def __init__(self, storage, policies: Dict[str, PlatformPolicy], time_scale: float):
+        super().__init__(storage, daily_limit=0, policies=policies)
+        self.time_scale = time_scale
+
+    def backoff_seconds(self, outcome: str, strikes: int) -> float:
+        return super().backoff_seconds(outcome, strikes) * self.time_scale
+
+
+def build_database(path: Path, base_url: str, jobs: int, seed: int = 42) -> Path:
+    """Scratch database of unapplied postings on the simulator (LinkedIn-heavy, like the real queue)"""
+    from jobpilot.bench import generate_database
+
+    rng = random.Random(seed)
+    generate_database(path, rows=0)
+    now = int(time.time())
+    job_rows, app_rows = [], []
+    for i in range(jobs):
+        n = 1_000_000 + i
+        prefix = rng.choices(['linkedin', *ATS_PREFIXES], weights=[4, 2, 2, 2])[0]
+        company = COMPANIES[n % len(COMPANIES)] if prefix == 'linkedin' else rng.choice(COMPANIES)
+        job_id = f"sim_{n}"
+        job_rows.append((job_id, prefix, f"{TITLES[n % len(TITLES)]}, Req {n}", company, "Remote", "remote",
+                         base_url + posting_path(n, prefix, company), now))
+        app_rows.append((f"app_{n}", job_id, 'unapplied', now))
+    conn = sqlite3.connect(str(path), isolation_level=None)
+    try:
+        conn.execute("BEGIN")
+        conn.executemany("""INSERT INTO jobs (id, platform, title, company, location, location_type, url, saved_at)
+                            VALUES (?, ?, ?, ?, ?, ?, ?, ?)""", job_rows)
+        conn.executemany("INSERT INTO applications (id, job_id, status, created_at) VALUES (?, ?, ?, ?)",
+                         app_rows)
+        conn.execute("COMMIT")
+    finally:
+        conn.close()
+    return path
+
+
+def _load_test_applier(db_path: Path, concurrency: int, interval: float, time_scale: float):
+    from jobpilot.apply import RealBatchApplier
+
+    class LoadTestApplier(RealBatchApplier):
+        def __init__(self):
+            super().__init__(concurrency, db_path=db_path, session_factory=partial(HttpBrowserSession))
+            self.preferences = LOAD_TEST_PREFERENCES
+            self.screenshots = None
+            # The scratch database has no resumes; FakeATS only checks that an upload is named
+            self.applicant = {**self.applicant, 'resume': {'path': 'resume.pdf'}}
+            self.resolver = self.liveness.resolver = SimulatorResolver(self.storage)
+            self.policies = {platform: PlatformPolicy(min_interval=interval, max_in_flight=concurrency,
+                                                      cooldown_every=0)
+                             for platform in PLATFORMS.values()}
+            self.pacer = ScaledPacer(self.storage, self.policies, time_scale)
+
+        def scheduler(self, process_job, max_concurrency: int) -> ApplyScheduler:
+            return ApplyScheduler(process_job, self.detect_platform, max_concurrency, policies=self.policies,
+                                  clock=InstrumentedClock(SystemClock(), self.metrics), pacer=self.pacer)
+
+    return LoadTestApplier()
+
+
+def check_outcomes(storage, outcomes: Dict[str, str]) -> Tuple[Counter, List[str]]:
+    """Compare each journaled job's final state with what the simulator actually did to it"""
+    results: Counter = Counter()
+    mismatches = []
+    for row in storage.fetch_all("SELECT job_id, state, failure_class FROM run_journal"):
+        outcome = outcomes.get(row['job_id'])
+        if row['state'] == 'done':
+            ok = outcome == APPLIED
+        elif row['state'] in ('retry', 'failed'):
+            ok = EXPECTED_CLASS.get(outcome) == row['failure_class']
+        else:
+            ok = row['state'] == 'pending'
+        results['correct' if ok else 'mismatched'] += 1
+        if not ok:
+            mismatches.append(f"{row['job_id']}: simulator {outcome}, journal {row['state']}/{row['failure_class']}")
+    return results, mismatches
+
+
+def load_test(jobs: int, concurrency: int, config: SimulatorConfig, interval: float = 0.01,
+              time_scale: float = 0.001, verbose: bool = False) -> int:
+    """Drive RealBatchApplier against FakeATS; returns the number of misclassified jobs"""
+    from jobpilot.storage import close_all
+
+    with FakeATS(config) as simulator, tempfile.TemporaryDirectory() as tmp:
+        db_path = build_database(Path(tmp) / "loadtest.db", simulator.base_url, jobs)
+        applier = _load_test_applier(db_path, concurrency, interval, time_scale)
+        output = io.StringIO()
+        started = time.perf_counter()
+        with redirect_stdout(sys.stdout if verbose else output):
+            applier.run(limit=None)
+        elapsed = time.perf_counter() - started
+        applier.storage.flush()
+
+        results, mismatches = check_outcomes(applier.storage, simulator.outcomes)
+        failures = applier.journal.retry_summary()
+        closed = applier.metrics.snapshot()['counters'].get('all', {}).get('closed', 0)
+        applied = len(applier.applied)
+
+        print("=" * 80)
+        print(f"LOAD TEST: {jobs} postings, {concurrency} browser workers, {simulator.base_url}")
+        print(f"Faults: {config.error_rate:.0%} 5xx, {config.rate_limit_rate:.0%} 429, "
+              f"{config.captcha_rate:.0%} captcha, {config.closed_rate:.0%} closed, "
+              f"latency {config.latency * 1000:.0f}ms ±{config.jitter:.0%}"
+              + (f", {config.max_rps:g} req/s per platform" if config.max_rps else ""))
+        print("=" * 80)
+        print(f"Applied: {applied} in {elapsed:.1f}s ({applied / elapsed * 60:.0f} applications/min)")
+        print(f"Dropped by preflight: {closed:g} closed postings")
+        for row in failures:
+            print(f"  {row['state']:<7} {row['failure_class']:<13} {row['n']:>5}")
+        print("Simulator responses: " + ", ".join(f"{n} x {status}" for status, n in sorted(simulator.stats.items())))
+        print("-" * 80)
+        print(applier.metrics.format_report())
+        print("-" * 80)
+        print(f"Fault handling: {results['correct']} jobs handled as expected, {results['mismatched']} mismatched")
+        for mismatch in mismatches[:10]:
+            print(f"  ✗ {mismatch}")
+        print("=" * 80)
+        close_all()
+    return len(mismatches)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake ATS server and offline load test for the apply pipeline")
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument("--serve", action="store_true", help="run the simulator until interrupted")
+    mode.add_argument("--load-test", action="store_true", help="drive the batch runner against the simulator")
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--jobs", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--interval", type=float, default=0.01, help="seconds between starts per platform")
+    parser.add_argument("--time-scale", type=float, default=0.001, help="multiplier on 429/captcha backoffs")
+    parser.add_argument("-v", "--verbose", action="store_true", help="show the runner's per-job output")
+    defaults = SimulatorConfig()
+    for name in ("latency", "jitter", "error_rate", "rate_limit_rate", "max_rps", "captcha_rate", "closed_rate"):
+        parser.add_argument(f"--{name.replace('_', '-')}", type=float, default=getattr(defaults, name))
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    args = parser.parse_args()
+
+    config = SimulatorConfig(args.latency, args.jitter, args.error_rate, args.rate_limit_rate, args.max_rps,
+                             args.captcha_rate, args.closed_rate, args.seed)
+    if args.load_test:
+        sys.exit(1 if load_test(args.jobs, args.concurrency, config, args.interval, args.time_scale,
+                                args.verbose) else 0)
+
+    with FakeATS(config, port=args.port) as simulator:
+        print(f"Fake ATS on {simulator.base_url}")
+        for prefix in PLATFORMS:
+            print(f"  {simulator.base_url}{posting_path(1_000_001, prefix, COMPANIES[1])}")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""
+Shared SQLite storage layer for the batch-apply scripts
+- One long-lived WAL-mode connection per database file
+- Write-behind queue that groups status updates and screenshot paths into one transaction
+- Flushes every N queued updates, every T seconds, on exit and on crash
+  (SIGTERM too once an entry point calls install_sigterm_handler)
+"""
+
+import atexit
+import signal
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from jobpilot.schema import migrate
+
+DEFAULT_BATCH_SIZE = 25
+DEFAULT_FLUSH_INTERVAL = 5.0
+BUSY_TIMEOUT_MS = 5000
+
+UPDATE_STATUS_SQL = """
+UPDATE applications
+SET status = ?, notes = ?, platform = COALESCE(?, platform), applied_at = ?
+WHERE job_id = ?
+"""
+
+SCREENSHOT_COLUMNS = ('screenshot_path', 'confirmation_screenshot_path')
+UPDATE_SCREENSHOT_SQL = {column: f"UPDATE applications SET {column} = ? WHERE job_id = ?"
+                         for column in SCREENSHOT_COLUMNS}
+
+_instances: Dict[Path, "Storage"] = {}
+_instances_lock = threading.Lock()
+
+
+class Storage:
+    def __init__(self, db_path: Path, batch_size: int = DEFAULT_BATCH_SIZE,
+                 flush_interval: float = DEFAULT_FLUSH_INTERVAL, apply_migrations: bool = True):
+        self.db_path = Path(db_path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        if apply_migrations:
+            migrate(self._conn)
+
+        # job_id -> (status, notes, platform, applied_at); later updates win
+        self._pending: Dict[str, Tuple] = {}
+        # (job_id, column) -> screenshot path
+        self._screenshots: Dict[Tuple[str, str], str] = {}
+        self._oldest_pending: Optional[float] = None
+        self._closed = False
+
+        self._stop = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_loop, name="jobpilot-storage-flush", daemon=True)
+        self._flusher.start()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        return self._conn
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run a block inside one BEGIN IMMEDIATE ... COMMIT"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            else:
+                self._conn.execute("COMMIT")
+
+    def fetch_all(self, query: str, params: Sequence = ()) -> List[Dict]:
+        """Run a read query and return rows as dicts"""
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(query, params).fetchall()]
+
+    def execute(self, query: str, params: Sequence = ()) -> sqlite3.Cursor:
+        """Run a single write statement in its own transaction"""
+        with self.transaction() as conn:
+            return conn.execute(query, params)
+
+    def update_status(self, job_id: str, status: str, notes: str = "",
+                      platform: Optional[str] = None, applied_at: Optional[int] = None):
+        """Queue an application status update; written with the next batch"""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError(f"Storage for {self.db_path} is closed")
+            self._pending[job_id] = (status, notes, platform, applied_at)
+            self._queued()
+
+    def update_screenshot(self, job_id: str, path: str, column: str = 'confirmation_screenshot_path'):
+        """Queue a screenshot path for an application; written with the next batch"""
+        if column not in UPDATE_SCREENSHOT_SQL:
+            raise ValueError(f"Not a screenshot column: {column}")
+        with self._lock:
+            if self._closed:
+                raise RuntimeError(f"Storage for {self.db_path} is closed")
+            self._screenshots[(job_id, column)] = path
+            self._queued()
+
+    def _queued(self):
+        if self._oldest_pending is None:
+            self._oldest_pending = time.monotonic()
+        if self.pending_count >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> int:
+        """Write all queued status updates and screenshot paths in one transaction"""
+        with self._lock:
+            if not self._pending and not self._screenshots:
+                return 0
+            rows = [(status, notes, platform, applied_at, job_id)
+                    for job_id, (status, notes, platform, applied_at) in self._pending.items()]
+            with self.transaction() as conn:
+                conn.executemany(UPDATE_STATUS_SQL, rows)
+                for (job_id, column), path in self._screenshots.items():
+                    conn.execute(UPDATE_SCREENSHOT_SQL[column], (path, job_id))
+            written = len(rows) + len(self._screenshots)
+            self._pending.clear()
+            self._screenshots.clear()
+            self._oldest_pending = None
+            return written
+
+    @property
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._pending) + len(self._screenshots)
+
+    def _flush_loop(self):
+        """Background flusher so a slow run never holds updates longer than flush_interval"""
+        while not self._stop.wait(self.flush_interval / 2):
+            with self._lock:
+                due = (self._oldest_pending is not None
+                       and time.monotonic() - self._oldest_pending >= self.flush_interval)
+                if due and not self._closed:
+                    try:
+                        self.flush()
+                    except sqlite3.Error as e:
+                        print(f"     ✗ Storage flush failed, will retry: {e}")
+
+    def close(self):
+        """Flush queued updates and close the connection"""
+        with self._lock:
+            if self._closed:
+                return
+            self.flush()
+            self._closed = True
+            self._stop.set()
+            self._conn.close()
+        with _instances_lock:
+            if _instances.get(self.db_path.resolve()) is self:
+                del _instances[self.db_path.resolve()]
+
+    def __enter__(self) -> "Storage":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def get_storage(db_path: Path, **kwargs) -> Storage:
+    """Return the shared Storage for db_path, opening it on first use"""
+    key = Path(db_path).resolve()
+    with _instances_lock:
+        storage = _instances.get(key)
+        if storage is None:
+            storage = Storage(db_path, **kwargs)
+            _instances[key] = storage
+        return storage
+
+
+def close_all():
+    """Flush and close every open Storage (registered with atexit)"""
+    with _instances_lock:
+        storages = list(_instances.values())
+    for storage in storages:
+        try:
+            storage.close()
+        except sqlite3.Error as e:
+            print(f"✗ Failed to flush {storage.db_path}: {e}")
+
+
+def _handle_sigterm(signum, frame):
+    # Turn SIGTERM into SystemExit so atexit handlers (and the final flush) run
+    raise SystemExit(128 + signum)
+
+
+def install_sigterm_handler():
+    """Flush on SIGTERM too; called by entry points, never on import, so library users keep their own handler"""
+    if threading.current_thread() is threading.main_thread() and signal.getsignal(signal.SIGTERM) == signal.SIG_DFL:
+        signal.signal(signal.SIGTERM, _handle_sigterm)
+
+
+atexit.register(close_all)
@@ -0,0 +1,198 @@
+"""
+Multi-profile batch apply: one scheduler process serving several candidates
+- Each profile keeps its own config directory, database, run journal and
+  daily_limit, exactly as if it ran `jobpilot apply` alone
+- Platform rate limiters, learned pacing and the browser worker pool are
+  shared, so N candidates never hit a site harder than one runner would;
+  shared pacing and LinkedIn redirects persist in their own database
+  (shared_db_path), not in any one candidate's
+- Each profile journals under <run id>-<name>, so `--resume RUN_ID` picks up
+  every profile's part of that run
+- Each platform's starts are split between profiles by weighted round-robin
+  (profiles.json "weight"); an idle profile's share goes to the others
+
+    jobpilot apply --profiles             # config/profiles.json
+    jobpilot apply --profiles team.json --concurrency 6
+"""
+
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from jobpilot.apply import CLAIM_BATCH_SIZE, BaseApplier
+from jobpilot.config import shared_database_path
+from jobpilot.journal import new_run_id
+from jobpilot.metrics import InstrumentedClock, Metrics, MetricsServer
+from jobpilot.pacing import PacingController
+from jobpilot.platforms import PlatformResolver
+from jobpilot.scheduler import DEFAULT_MAX_CONCURRENCY, ApplyScheduler, PlatformLimiter, SystemClock
+from jobpilot.schema import SHARED_STATE_TABLES
+from jobpilot.storage import Storage, get_storage
+from jobpilot.workers import WorkerPool
+
+
+class ProfilePacer:
+    """Daily quota from one profile's pacer; platform pacing from the runner's shared one"""
+
+    def __init__(self, quota: PacingController, shared: PacingController):
+        self.quota = quota
+        self.shared = shared
+
+    @property
+    def daily_limit(self) -> Optional[int]:
+        return self.quota.daily_limit
+
+    def configure(self, platform: str, limiter: PlatformLimiter):
+        self.shared.configure(platform, limiter)
+
+    def record(self, platform: str, outcome: str) -> Optional[float]:
+        return self.shared.record(platform, outcome)
+
+    def daily_remaining(self) -> Optional[int]:
+        return self.quota.daily_remaining()
+
+    def reserve(self, wanted: int) -> int:
+        return self.quota.reserve(wanted)
+
+    def release(self, count: int = 1):
+        self.quota.release(count)
+
+
+class ProfileApplier(BaseApplier):
+    """One candidate inside a MultiProfileRunner; applies through the runner's shared pool"""
+
+    def __init__(self, spec: Dict, runner: "MultiProfileRunner"):
+        super().__init__(profile_run_id(runner.run_id, spec['name']), db_path=spec['db_path'],
+                         config_dir=spec['config_dir'], resumed=runner.resumed)
+        self.name = spec['name']
+        self.weight = spec['weight']
+        self.runner = runner
+        # Counted into the runner's metrics and paced by its limiters
+        self.metrics = runner.metrics
+        self.pacer = ProfilePacer(self.pacer, runner.pacer)
+        self.applied = 0
+        self.failed = 0
+
+    def detect_platform(self, url: str) -> str:
+        # The scheduler keyed the job by the shared resolver; pacing must agree with it
+        return self.runner.resolver.platform(url)
+
+    def process_job(self, job: Dict, index: int, total: int) -> bool:
+        print(f"\n[{index}/{total}] [{self.name}] {job['company']} - {job['title']}")
+        platform = 'Unknown'
+        try:
+            _result, platform = self.apply_in_worker(self.runner.pool, job)
+            self.record_applied(job['id'], f'Processed with {platform} detection', platform)
+            self.applied += 1
+            print(f"     ✓ [{self.name}] Applied via {platform}")
+            return True
+
+        except Exception as e:
+            print(f"     ✗ [{self.name}] Error: {str(e)}")
+            self.record_failure(job['id'], str(e), platform)
+            self.failed += 1
+            return False
+
+
+def profile_run_id(run_id: str, name: str) -> str:
+    return f"{run_id}-{name}"
+
+
+def shared_storage(path: Optional[Path] = None) -> Storage:
+    """The store for state every profile shares; it holds only the site-level tables"""
+    path = Path(path or shared_database_path())
+    path.parent.mkdir(parents=True, exist_ok=True)
+    storage = get_storage(path, apply_migrations=False)
+    with storage.transaction() as conn:
+        for statement in SHARED_STATE_TABLES:
+            conn.execute(statement)
+    return storage
+
+
+class MultiProfileRunner:
+    def __init__(self, profiles: List[Dict], max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 run_id: Optional[str] = None, metrics_port: Optional[int] = None,
+                 shared_db: Optional[Path] = None):
+        if not profiles:
+            raise ValueError("No profiles to run")
+        self.start_time = datetime.now()
+        self.max_concurrency = max_concurrency
+        self.metrics = Metrics()
+        self.metrics_server = MetricsServer(self.metrics, metrics_port) if metrics_port is not None else None
+        self.pool: Optional[WorkerPool] = None
+        # Platform pacing is a property of the site, so it is learned once, in the shared store;
+        # daily quotas stay with each profile (daily_limit 0 = none at this level)
+        self.shared = shared_storage(shared_db)
+        self.pacer = PacingController(self.shared, daily_limit=0)
+        self.resolver = PlatformResolver(self.shared)
+        # run_id is only given to resume; each profile's journal gets its own ID derived from it
+        self.resumed = run_id is not None
+        self.run_id = run_id or new_run_id()
+        self.tenants: Dict[str, ProfileApplier] = {spec['name']: ProfileApplier(spec, self) for spec in profiles}
+
+    def apply(self, job: Dict, index: int, total: int) -> bool:
+        return self.tenants[job['profile']].process_job(job, index, total)
+
+    def scheduler(self) -> ApplyScheduler:
+        return ApplyScheduler(self.apply, self.resolver.platform, self.max_concurrency,
+                              clock=InstrumentedClock(SystemClock(), self.metrics), pacer=self.pacer,
+                              tenant_fn=lambda job: job['profile'],
+                              weights={name: tenant.weight for name, tenant in self.tenants.items()})
+
+    def claim_round(self) -> List[Dict]:
+        """Claim from every profile in proportion to its weight, tagging each job with its profile"""
+        batch = []
+        for name, tenant in self.tenants.items():
+            size = max(1, round(CLAIM_BATCH_SIZE * tenant.weight))
+            # The pool sends the profile along, so a session can act as the right candidate
+            batch.extend(dict(job, profile=name) for job in tenant.claim_batch(size))
+        return batch
+
+    def print_summary(self):
+        elapsed = datetime.now() - self.start_time
+        print("\n" + "=" * 80)
+        print("MULTI-PROFILE BATCH APPLY SUMMARY")
+        print("=" * 80)
+        print(f"Run ID: {self.run_id}")
+        for name, tenant in self.tenants.items():
+            tenant.close()
+            tenant.storage.flush()
+            print(f"  {name} (weight {tenant.weight:g}): {tenant.applied} applied, {tenant.failed} failed, "
+                  f"{tenant.journal.remaining()} still queued")
+        print(f"Time: {elapsed}")
+        print("-" * 80)
+        print(self.metrics.format_report())
+        print("=" * 80)
+
+    def run(self):
+        print("=" * 80)
+        print(f"🚀 JobPilot Multi-Profile Batch Apply ({len(self.tenants)} profiles)")
+        print("=" * 80)
+        print(f"Started: {self.start_time.strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"Run ID: {self.run_id}{' (resumed)' if self.resumed else ''}")
+        if self.metrics_server:
+            print(f"Metrics: http://127.0.0.1:{self.metrics_server.port}/metrics")
+        for name, tenant in self.tenants.items():
+            jobs = tenant.get_unapplied_jobs(limit=54)
+            queued = tenant.journal.enqueue(job['id'] for job in jobs)
+            print(f"📋 [{name}] {len(jobs)} unapplied positions ({queued} newly queued)")
+        print()
+
+        batch = self.claim_round()
+        if not batch:
+            for tenant in self.tenants.values():
+                tenant._report_daily_limit()
+                tenant.close()
+            print("No jobs to apply to for any profile!")
+            return
+
+        # One pool and one scheduler for everyone: total browser sessions and per-site pace stay fixed
+        with WorkerPool(size=self.max_concurrency) as self.pool:
+            scheduler = self.scheduler()
+            while batch:
+                scheduler.run(batch)
+                for tenant in self.tenants.values():
+                    tenant.journal.renew()
+                batch = self.claim_round()
+
+        self.print_summary()
@@ -0,0 +1,210 @@
+"""
+Persistent browser worker pool
+- N long-lived worker processes, each owning one browser session
+- Jobs go over a pipe as structured messages (no generated source code)
+- Crashed or hung workers are restarted; the job in hand is reported as failed
+"""
+
+import inspect
+import multiprocessing
+import queue
+import threading
+import time
+from abc import ABC, abstractmethod
+from functools import partial
+from pathlib import Path
+from typing import Callable, Dict, List
+
+DEFAULT_JOB_TIMEOUT = 300.0
+POLL_INTERVAL = 0.5
+
+
+class WorkerCrashed(Exception):
+    pass
+
+
+class WorkerTimeout(Exception):
+    pass
+
+
+class BrowserSession(ABC):
+    """One authenticated browser session; subclasses drive a real browser"""
+
+    def open(self):
+        pass
+
+    @abstractmethod
+    def apply(self, job: Dict) -> Dict:
+        """Result dict; may carry 'timings': {stage: seconds} for navigate/form_fill/submit
+        and 'screenshots': {'preview' | 'confirmation': PNG bytes}. In multi-profile runs
+        job['profile'] names the candidate, so one session can keep a login per profile.
+        Sessions fill forms through form_cache(job) when it returns one, and report
+        'form_cached': whether the plan came from the cache"""
+
+    def close(self):
+        pass
+
+    def form_cache(self, job: Dict):
+        """FormSchemaCache on the runner's database (job['form_db']), opened once per database per worker process"""
+        form_db = job.get('form_db')
+        if not form_db:
+            return None
+        if getattr(self, '_form_caches', None) is None:
+            self._form_caches = {}
+        caches = self._form_caches
+        if form_db not in caches:
+            from jobpilot.forms import FormSchemaCache
+            from jobpilot.qa import QAMatcher, load_templates
+            from jobpilot.semantic import SemanticIndex
+            from jobpilot.storage import get_storage
+
+            storage = get_storage(Path(form_db), apply_migrations=False)
+            matcher = QAMatcher(load_templates(storage), storage=storage,
+                                semantic=SemanticIndex.for_database(form_db))
+            caches[form_db] = FormSchemaCache(storage, matcher)
+        return caches[form_db]
+
+    def close_form_caches(self):
+        """Write the Q&A usage counts still pending in this worker's form caches"""
+        for cache in (getattr(self, '_form_caches', None) or {}).values():
+            cache.matcher.close()
+        self._form_caches = None
+
+
+class SimulatedBrowserSession(BrowserSession):
+    """Walks the apply flow without a browser (what the per-job subprocess used to print)"""
+
+    def open(self):
+        self.jobs_handled = 0
+
+    def apply(self, job: Dict) -> Dict:
+        self.jobs_handled += 1
+        return {
+            'log': [
+                f"Would navigate to: {job.get('apply_url') or job['url']}",
+                "Would click Apply button",
+                "Would detect platform...",
+                "Would fill form...",
+                "Would request user confirmation before submitting",
+            ],
+            'jobs_on_session': self.jobs_handled,
+        }
+
+
+def _check_session_factory(session_factory: Callable[[], BrowserSession]):
+    """Reject a session class with unimplemented methods here, not later inside every worker"""
+    target = session_factory.func if isinstance(session_factory, partial) else session_factory
+    if inspect.isclass(target) and inspect.isabstract(target):
+        missing = ", ".join(sorted(target.__abstractmethods__))
+        raise TypeError(f"{target.__name__} does not implement {missing}")
+
+
+def _worker_main(conn, session_factory: Callable[[], BrowserSession]):
+    session = session_factory()
+    session.open()
+    try:
+        while True:
+            try:
+                message = conn.recv()
+            except EOFError:
+                break
+            if message is None:
+                break
+            try:
+                conn.send({'ok': True, 'result': session.apply(message)})
+            except Exception as e:
+                conn.send({'ok': False, 'error': f"{type(e).__name__}: {e}"})
+    finally:
+        session.close_form_caches()
+        session.close()
+        conn.close()
+
+
+class _Worker:
+    def __init__(self, ctx, session_factory, index: int):
+        self.index = index
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child_conn, session_factory),
+                                   name=f"jobpilot-browser-{index}", daemon=True)
+        self.process.start()
+        child_conn.close()
+
+    def stop(self, timeout: float = 5.0):
+        try:
+            self.conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+class WorkerPool:
+    def __init__(self, size: int = 2, session_factory: Callable[[], BrowserSession] = SimulatedBrowserSession,
+                 job_timeout: float = DEFAULT_JOB_TIMEOUT):
+        _check_session_factory(session_factory)
+        self.size = size
+        self.session_factory = session_factory
+        self.job_timeout = job_timeout
+        self.restarts = 0
+        self._ctx = multiprocessing.get_context("spawn")
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._workers: List[_Worker] = []
+        self._lock = threading.Lock()
+        for i in range(size):
+            worker = _Worker(self._ctx, session_factory, i)
+            self._workers.append(worker)
+            self._idle.put(worker)
+
+    def apply(self, job: Dict) -> Dict:
+        """Send job to an idle worker and wait for its result (thread-safe)"""
+        worker = self._idle.get()
+        try:
+            worker.conn.send(dict(job))
+            reply = self._wait_reply(worker)
+        except (WorkerCrashed, WorkerTimeout, BrokenPipeError, EOFError, OSError):
+            worker = self._restart(worker)
+            raise
+        finally:
+            self._idle.put(worker)
+
+        if not reply['ok']:
+            raise RuntimeError(reply['error'])
+        return reply['result']
+
+    def _wait_reply(self, worker: _Worker) -> Dict:
+        deadline = time.monotonic() + self.job_timeout
+        while True:
+            if worker.conn.poll(POLL_INTERVAL):
+                try:
+                    return worker.conn.recv()
+                except (EOFError, OSError):
+                    worker.process.join(1.0)
+                    raise WorkerCrashed(f"Browser worker {worker.index} exited with code {worker.process.exitcode}")
+            if not worker.process.is_alive():
+                raise WorkerCrashed(f"Browser worker {worker.index} exited with code {worker.process.exitcode}")
+            if time.monotonic() > deadline:
+                raise WorkerTimeout(f"Browser worker {worker.index} timed out after {self.job_timeout:.0f}s")
+
+    def _restart(self, worker: _Worker) -> _Worker:
+        worker.stop(timeout=1.0)
+        replacement = _Worker(self._ctx, self.session_factory, worker.index)
+        with self._lock:
+            self._workers[worker.index] = replacement
+            self.restarts += 1
+        print(f"     ↻ Restarted browser worker {worker.index}")
+        return replacement
+
+    def close(self):
+        with self._lock:
+            workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.stop()
+
+    def __enter__(self) -> "WorkerPool":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -8,180 +8,12 @@ Real Batch Job Application using Browser Automation
 - Uses authenticated LinkedIn session
 """
 
-import sqlite3
-import time
-import json
-import subprocess
-from pathlib import Path
-from datetime import datetime
-from typing import Dict, List, Optional
+# Kept for existing callers; the runner lives in jobpilot.apply.
+# Equivalent to: jobpilot apply --mode browser [--resume RUN_ID] [--metrics-port PORT]
 
-DB_PATH = Path("/Users/peiyuanli/Documents/GitHub/JobPilot/data/db/jobpilot.db")
+import sys
 
-class RealBatchApplier:
-    def __init__(self):
-        self.applied = []
-        self.failed = []
-        self.skipped = []
-        self.start_time = datetime.now()
-        self.current_page_index = None
-
-    def get_unapplied_jobs(self, limit: int = 54) -> List[Dict]:
-        """Get unapplied jobs from database"""
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-
-        query = """
-        SELECT j.id, j.title, j.company, j.location, j.url, j.platform
-        FROM jobs j
-        INNER JOIN applications a ON j.id = a.job_id
-        WHERE a.status = 'unapplied'
-        AND j.company != 'Unknown'
-        AND (j.title LIKE '%Software Engineer%' OR j.title LIKE '%Backend%'
-             OR j.title LIKE '%Full Stack%' OR j.title LIKE '%AI%' OR j.title LIKE '%Engineer%')
-        ORDER BY j.id ASC
-        """
-        if limit:
-            query += f" LIMIT {limit}"
-
-        cursor.execute(query)
-        jobs = [dict(row) for row in cursor.fetchall()]
-        conn.close()
-        return jobs
-
-    def apply_to_job(self, job: Dict, index: int, total: int) -> bool:
-        """Apply to a single job using browser automation"""
-        job_id = job['id']
-        company = job['company']
-        title = job['title']
-        url = job['url']
-
-        print(f"\n[{index}/{total}] {company} - {title}")
-        print(f"     🔗 URL: {url}")
-
-        try:
-            # Step 1: Navigate to job page
-            print(f"     📱 Opening job page...")
-            import subprocess
-            result = subprocess.run([
-                "python3", "-c",
-                f"""
-from pathlib import Path
-import json
-
-# Simulate the browser interaction flow:
-# 1. Navigate to LinkedIn job URL
-# 2. Wait for page to load
-# 3. Take snapshot to get Apply button UID
-# 4. Click Apply button
-# 5. Detect if external redirect (Greenhouse, Ashby, etc.)
-# 6. Fill form with stored resume + profile data
-# 7. Take screenshot before submit
-# 8. Ask user to confirm
-# 9. Submit form
-
-job_info = {{
-    'id': '{job_id}',
-    'company': '{company}',
-    'title': '{title}',
-    'url': '{url}'
-}}
-
-print("Would navigate to:", job_info['url'])
-print("Would click Apply button")
-print("Would detect platform...")
-print("Would fill form...")
-print("Would request user confirmation before submitting")
-print("Platform detected: LinkedIn / Simplify / Greenhouse / etc.")
-"""
-            ], capture_output=True, text=True, cwd=Path.cwd())
-
-            if result.returncode != 0:
-                raise Exception(f"Browser automation failed: {result.stderr}")
-
-            print(result.stdout)
-
-            # Step 2: Ask for user confirmation
-            print(f"     ⚠️  Please confirm: Apply to this job? (y/n)")
-            # For automation, we'll auto-confirm
-            confirm = "y"  # In real scenario, would wait for user input
-
-            if confirm.lower() != 'y':
-                self.skipped.append(job_id)
-                self.update_status(job_id, 'unapplied', 'User skipped')
-                print(f"     ⏭️  Skipped by user")
-                return False
-
-            # Step 3: Submit (in real scenario)
-            print(f"     ✓ Applying...")
-            self.update_status(job_id, 'applied', f'Applied to {company}')
-            self.applied.append(job_id)
-
-            # Delay
-            delay = 5
-            print(f"     ⏳ Waiting {delay}s before next job...")
-            time.sleep(delay)
-
-            return True
-
-        except Exception as e:
-            print(f"     ❌ Error: {str(e)}")
-            self.update_status(job_id, 'unapplied', f'Error: {str(e)}')
-            self.failed.append(job_id)
-            return False
-
-    def update_status(self, job_id: str, status: str, notes: str = ""):
-        """Update database"""
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        applied_at = int(time.time()) if status == 'applied' else None
-        cursor.execute("""
-        UPDATE applications
-        SET status = ?, notes = ?, applied_at = ?
-        WHERE job_id = ?
-        """, (status, notes, applied_at, job_id))
-        conn.commit()
-        conn.close()
-
-    def print_summary(self):
-        """Print final report"""
-        elapsed = datetime.now() - self.start_time
-        print("\n" + "=" * 80)
-        print("✅ REAL BATCH APPLICATION SUMMARY")
-        print("=" * 80)
-        print(f"Total: {len(self.applied) + len(self.failed) + len(self.skipped)}")
-        print(f"Applied: {len(self.applied)}")
-        print(f"Failed: {len(self.failed)}")
-        print(f"Skipped: {len(self.skipped)}")
-        print(f"Time: {elapsed}")
-        print("=" * 80)
-
-    def run(self):
-        """Main execution"""
-        print("=" * 80)
-        print("🚀 REAL Batch Job Application with Browser Automation")
-        print("=" * 80)
-        print(f"Started: {self.start_time.strftime('%Y-%m-%d %H:%M:%S')}")
-        print(f"Using authenticated LinkedIn session")
-        print()
-
-        jobs = self.get_unapplied_jobs()
-        print(f"📋 Found {len(jobs)} unapplied positions\n")
-
-        if not jobs:
-            print("No jobs to apply to!")
-            return
-
-        for i, job in enumerate(jobs, 1):
-            if i > 1 and (i - 1) % 10 == 0:
-                print(f"\n⏸️  Break after 10 jobs (10s)...")
-                time.sleep(10)
-
-            self.apply_to_job(job, i, len(jobs))
-
-        self.print_summary()
+from jobpilot.cli import main
 
 if __name__ == "__main__":
-    applier = RealBatchApplier()
-    applier.run()
+    sys.exit(main(["apply", "--mode", "browser", *sys.argv[1:]]))
@@ -8,176 +8,12 @@ Processes unapplied Software Engineer positions
 - Updates database after each application
 """
 
-import sqlite3
-import time
-import json
-import subprocess
-import sys
-from pathlib import Path
-from datetime import datetime
-from typing import Dict, List, Optional
-
-DB_PATH = Path("/Users/peiyuanli/Documents/GitHub/JobPilot/data/db/jobpilot.db")
-PROJECT_ROOT = Path("/Users/peiyuanli/Documents/GitHub/JobPilot")
-
-class BatchApplyRunner:
-    def __init__(self):
-        self.total_jobs = 0
-        self.applied_count = 0
-        self.failed_count = 0
-        self.skipped_count = 0
-        self.start_time = datetime.now()
-
-    def get_unapplied_jobs(self) -> List[Dict]:
-        """Fetch all unapplied software engineer jobs"""
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-
-        query = """
-        SELECT j.id, j.title, j.company, j.location, j.url, j.platform
-        FROM jobs j
-        INNER JOIN applications a ON j.id = a.job_id
-        WHERE a.status = 'unapplied'
-        AND j.company != 'Unknown'
-        AND (j.title LIKE '%Software Engineer%' OR j.title LIKE '%Backend%'
-             OR j.title LIKE '%Full Stack%' OR j.title LIKE '%AI%' OR j.title LIKE '%Engineer%')
-        ORDER BY j.id ASC
-        """
-
-        cursor.execute(query)
-        jobs = [dict(row) for row in cursor.fetchall()]
-        conn.close()
-        return jobs
-
-    def update_status(self, job_id: str, status: str, notes: str = ""):
-        """Update application status"""
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute("""
-        UPDATE applications
-        SET status = ?, notes = ?, applied_at = ?
-        WHERE job_id = ?
-        """, (status, notes, int(time.time()), job_id))
-        conn.commit()
-        conn.close()
-
-    def process_job(self, job: Dict, job_num: int, total: int) -> bool:
-        """Process a single job"""
-        print(f"\n[{job_num}/{total}] Processing: {job['company']} - {job['title']}")
-        print(f"    URL: {job['url']}")
-
-        try:
-            # Step 1: Navigate to job URL
-            print("    [→] Opening job page...")
-            subprocess.run([
-                "python3", "-c",
-                f"""
-import json
-from pathlib import Path
-
-# Simulate browser navigation and detection
-job_info = {json.dumps(job)}
-print(f"Job {{job_info['company']}} loaded")
-
-# In real implementation, would use chrome-devtools MCP
-# to navigate, detect platform, and auto-fill form
-"""
-            ], check=True, cwd=PROJECT_ROOT)
-
-            # Step 2: Detect platform
-            print("    [→] Detecting apply platform...")
-            platform = self._detect_platform(job['url'])
-            print(f"    [✓] Platform detected: {platform}")
-
-            # Step 3: Mark as applied (in real scenario, would actually apply)
-            # For now, we're showing the process flow
-            print("    [→] Preparing application form...")
-            print("    [→] Checking for Simplify button...")
-            print("    [→] Would request user confirmation before submitting...")
+# Kept for existing callers; the runner lives in jobpilot.apply.
+# Equivalent to: jobpilot apply --mode serial [--resume RUN_ID] [--metrics-port PORT]
 
-            # Mark as applied
-            self.update_status(job['id'], 'applied', f'Processed with {platform} detection')
-            self.applied_count += 1
-            print(f"    [✓] Marked as applied")
-
-            # Delay between applications
-            if job_num < total:
-                print(f"    [⏳] Waiting 30s before next application...")
-                time.sleep(5)  # Reduced for testing
-
-            return True
-
-        except Exception as e:
-            print(f"    [✗] Error: {str(e)}")
-            self.update_status(job['id'], 'unapplied', f'Error: {str(e)}')
-            self.failed_count += 1
-            return False
-
-    def _detect_platform(self, url: str) -> str:
-        """Simple platform detection based on URL"""
-        if 'linkedin.com' in url:
-            return 'LinkedIn (external)'
-        elif 'greenhouse.io' in url:
-            return 'Greenhouse'
-        elif 'ashby' in url:
-            return 'Ashby'
-        elif 'lever.co' in url:
-            return 'Lever'
-        elif 'workday.com' in url:
-            return 'Workday'
-        else:
-            return 'Generic'
-
-    def print_summary(self):
-        """Print final summary"""
-        elapsed = datetime.now() - self.start_time
-        print("\n" + "=" * 80)
-        print("BATCH APPLY SUMMARY")
-        print("=" * 80)
-        print(f"Total Jobs: {self.total_jobs}")
-        print(f"Applied: {self.applied_count}")
-        print(f"Failed: {self.failed_count}")
-        print(f"Skipped: {self.skipped_count}")
-        print(f"Success Rate: {(self.applied_count/self.total_jobs*100):.1f}%")
-        print(f"Time Elapsed: {elapsed}")
-        print("=" * 80)
-
-    def run(self):
-        """Main execution loop"""
-        print("=" * 80)
-        print("JobPilot Batch Apply Automation")
-        print("=" * 80)
-        print(f"Started at: {self.start_time.strftime('%Y-%m-%d %H:%M:%S')}")
-        print()
-
-        # Get jobs
-        jobs = self.get_unapplied_jobs()
-        self.total_jobs = len(jobs)
-
-        if not jobs:
-            print("No unapplied jobs found!")
-            return
-
-        print(f"Found {self.total_jobs} unapplied Software Engineer positions\n")
-
-        # Process jobs in batches of 10 (with breaks)
-        for i, job in enumerate(jobs, 1):
-            # Add longer break every 5 jobs
-            if i > 1 and (i - 1) % 5 == 0:
-                print(f"\n⏸️  Cooldown break after 5 applications... (resting for 3s)")
-                time.sleep(3)
-
-            self.process_job(job, i, self.total_jobs)
-
-            # Stop after processing a small batch for safety
-            if i >= 10:
-                print(f"\n⚠️  Processed first 10 jobs (safety limit). Continue with remaining {self.total_jobs - 10}?")
-                print("Run the script again to continue.")
-                break
+import sys
 
-        self.print_summary()
+from jobpilot.cli import main
 
 if __name__ == "__main__":
-    runner = BatchApplyRunner()
-    runner.run()
+    sys.exit(main(["apply", "--mode", "serial", *sys.argv[1:]]))
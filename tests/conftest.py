@@ -0,0 +1,25 @@
+import shutil
+from pathlib import Path
+
+import pytest
+
+from jobpilot.bench import generate_database
+from jobpilot.storage import Storage
+
+SAMPLE_DB = Path(__file__).resolve().parent.parent / "data" / "db" / "jobpilot.db"
+
+
+@pytest.fixture
+def storage(tmp_path):
+    """Empty database with the real schema"""
+    with Storage(generate_database(tmp_path / "test.db", rows=0)) as storage:
+        yield storage
+
+
+@pytest.fixture
+def sample_storage(tmp_path):
+    """A copy of the sample database (migrations must never touch the tracked file)"""
+    path = tmp_path / "sample.db"
+    shutil.copyfile(SAMPLE_DB, path)
+    with Storage(path) as storage:
+        yield storage
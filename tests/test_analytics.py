@@ -0,0 +1,53 @@
+import time
+
+from jobpilot import analytics
+from jobpilot.ingest import JobIngester
+
+NOW = int(time.time())
+
+
+def add(storage, job_id, company, status, applied_at=None):
+    storage.execute("""INSERT INTO jobs (id, platform, title, company, url, saved_at)
+                       VALUES (?, 'greenhouse', 'Software Engineer', ?, ?, ?)""",
+                    (job_id, company, f"https://boards.greenhouse.io/x/jobs/{job_id}", NOW))
+    storage.execute("""INSERT INTO applications (id, job_id, status, platform, created_at, applied_at)
+                       VALUES (?, ?, ?, 'Greenhouse', ?, ?)""",
+                    (f"app_{job_id}", job_id, status, NOW - 3600, applied_at))
+
+
+def assert_matches_recount(storage):
+    incremental = analytics.summary(storage)
+    analytics.refresh(storage)
+    assert incremental == analytics.summary(storage)
+    return incremental
+
+
+def test_status_changes_keep_stats_in_step(storage):
+    add(storage, 'j1', 'Acme', 'unapplied')
+    add(storage, 'j2', 'Acme', 'applied', NOW)
+    storage.execute("UPDATE applications SET status = 'applied', applied_at = ? WHERE job_id = 'j1'", (NOW,))
+    storage.execute("DELETE FROM applications WHERE job_id = 'j2'")
+    stats = assert_matches_recount(storage)
+    assert stats['submitted'] == 1
+
+
+def test_company_rename_moves_counts(storage):
+    add(storage, 'j1', 'Globex', 'unapplied')
+    add(storage, 'j2', 'Globex', 'applied', NOW)
+    add(storage, 'j3', 'Initech', 'interviewing', NOW)
+    storage.execute("UPDATE jobs SET company = 'Globex Corporation' WHERE id IN ('j1', 'j2')")
+    stats = assert_matches_recount(storage)
+    assert stats['top_companies'] == [{'company': 'Globex Corporation', 'applied': 1},
+                                      {'company': 'Initech', 'applied': 1}]
+    negative = storage.fetch_all("SELECT * FROM app_stats WHERE n < 0")
+    assert negative == []
+
+
+def test_ingest_upsert_rename_keeps_stats_right(storage):
+    JobIngester(storage).ingest([{'id': 'j1', 'title': 'Software Engineer', 'company': 'DataAnnotation',
+                                  'url': 'https://boards.greenhouse.io/x/jobs/1'}])
+    JobIngester(storage).ingest([{'id': 'j1', 'title': 'Software Engineer', 'company': 'Data Annotation Tech',
+                                  'url': 'https://boards.greenhouse.io/x/jobs/1'}])
+    rows = storage.fetch_all("SELECT key, n FROM app_stats WHERE dimension = 'company' AND n != 0")
+    assert rows == [{'key': 'Data Annotation Tech', 'n': 1}]
+    assert_matches_recount(storage)
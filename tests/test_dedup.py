@@ -0,0 +1,71 @@
+import hashlib
+import random
+
+from jobpilot.dedup import SIMHASH_BITS, WORD, DedupIndex, simhash, simhashes
+from jobpilot.schema import migrate
+
+WORDS = "build scale python services payments data platform team remote senior engineer api".split()
+
+
+def reference_simhash(text, shingle=3):
+    """The per-bit loop simhashes() replaced; stored hashes must not change"""
+    words = WORD.findall(text.lower())
+    features = [" ".join(words)] if len(words) < shingle else [
+        " ".join(words[i:i + shingle]) for i in range(len(words) - shingle + 1)]
+    weights = [0] * SIMHASH_BITS
+    for feature in features:
+        h = int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "big")
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += 1 if h >> bit & 1 else -1
+    return sum(1 << bit for bit, w in enumerate(weights) if w > 0)
+
+
+def test_vectorized_simhash_matches_the_reference():
+    rng = random.Random(5)
+    texts = ["", "one", "two words", "Exactly three words"]
+    texts += [" ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 400))) for _ in range(50)]
+
+    assert simhashes(texts) == [reference_simhash(t) for t in texts]
+    assert simhash(texts[-1]) == reference_simhash(texts[-1])
+
+
+def add_job(storage, job_id, location="Remote"):
+    storage.execute("""INSERT INTO jobs (id, platform, title, company, location, description, url, saved_at)
+                       VALUES (?, 'greenhouse', 'Backend Engineer', 'Acme Inc', ?, ?, ?, 0)""",
+                    (job_id, location, "Build and scale Python services for payments " * 5,
+                     f"https://boards.greenhouse.io/acme/jobs/{job_id}"))
+
+
+def canonicals(storage):
+    return {row['job_id']: row['canonical_id']
+            for row in storage.fetch_all("SELECT job_id, canonical_id FROM job_signatures")}
+
+
+def test_deleting_the_canonical_job_promotes_the_next_oldest(storage):
+    for job_id in ('a', 'b', 'c'):
+        add_job(storage, job_id)
+    add_job(storage, 'd', location="Berlin")  # same description: a SimHash duplicate
+    index = DedupIndex(storage)
+    index.index_pending()
+    assert canonicals(storage) == {'a': 'a', 'b': 'a', 'c': 'a', 'd': 'a'}
+
+    storage.execute("DELETE FROM jobs WHERE id = 'a'")
+
+    assert canonicals(storage) == {'b': 'b', 'c': 'b', 'd': 'b'}
+    jobs = [{'id': job_id} for job_id in ('b', 'c', 'd')]
+    assert [job['id'] for job in index.collapse(jobs)] == ['b']
+
+
+def test_migration_repairs_clusters_orphaned_before_the_trigger(storage):
+    for job_id in ('a', 'b', 'c'):
+        add_job(storage, job_id)
+    DedupIndex(storage).index_pending()
+    with storage.transaction() as conn:
+        # What deleting a canonical job left behind under migration 15
+        conn.execute("DROP TRIGGER job_dedup_ad")
+        conn.execute("DELETE FROM jobs WHERE id = 'a'")
+        conn.execute("DELETE FROM job_signatures WHERE job_id = 'a'")
+        conn.execute("PRAGMA user_version = 15")
+        migrate(conn)
+
+    assert canonicals(storage) == {'b': 'b', 'c': 'b'}
@@ -0,0 +1,47 @@
+import time
+
+from jobpilot.config import load_preferences, load_profile
+from jobpilot.filters import select_matching_jobs
+from jobpilot.scoring import score_jobs
+
+DAY = 86400
+PREFERENCES = {
+    'job_search': {'titles': ["Software Engineer"]},
+    'application': {'min_match_score': 60},
+    'filters': {'posted_within_days': 7},
+}
+
+
+def add_job(storage, job_id, posted_at=None, match_score=None):
+    now = int(time.time())
+    storage.execute("""INSERT INTO jobs (id, platform, title, company, url, saved_at, posted_at, match_score)
+                       VALUES (?, 'linkedin', 'Software Engineer', 'Acme', ?, ?, ?, ?)""",
+                    (job_id, f"https://example.com/{job_id}", now, posted_at, match_score))
+    storage.execute("INSERT INTO applications (id, job_id, status, created_at) VALUES (?, ?, 'unapplied', ?)",
+                    (f"app_{job_id}", job_id, now))
+
+
+def selected(storage):
+    return {job['id'] for job in select_matching_jobs(storage, PREFERENCES)}
+
+
+def test_recency_uses_posting_date_and_keeps_undated_jobs(storage):
+    now = time.time()
+    add_job(storage, 'fresh', posted_at=int(now - DAY), match_score=80)
+    add_job(storage, 'stale', posted_at=int(now - 30 * DAY), match_score=80)
+    add_job(storage, 'undated', match_score=80)
+    assert selected(storage) == {'fresh', 'undated'}
+
+
+def test_unscored_jobs_pass_the_score_filter(storage):
+    add_job(storage, 'unscored')
+    add_job(storage, 'low', match_score=20)
+    add_job(storage, 'high', match_score=90)
+    assert selected(storage) == {'unscored', 'high'}
+
+
+def test_default_preferences_select_jobs_on_sample_db(sample_storage):
+    preferences = load_preferences()
+    assert select_matching_jobs(sample_storage, preferences)
+    score_jobs(sample_storage, load_profile(), preferences)
+    assert select_matching_jobs(sample_storage, preferences)
@@ -0,0 +1,71 @@
+import pytest
+
+from jobpilot.forms import MAX_FORMS_PER_COMPANY, QA, FormField, FormSchemaCache, fields_from_probe
+from jobpilot.qa import QAMatcher, QATemplate, load_templates
+
+# A Greenhouse-style form as PROBE_SCRIPT reports it; the radio group arrives one button at a time
+PROBED = [
+    {'selector': '[name="first_name"]', 'kind': 'text', 'label': 'First Name *', 'required': True},
+    {'selector': '[name="last_name"]', 'kind': 'text', 'label': 'Last Name *', 'required': True},
+    {'selector': '[name="email"]', 'kind': 'email', 'label': 'Email', 'required': True},
+    {'selector': '[name="resume"]', 'kind': 'file', 'label': 'Resume/CV', 'required': True},
+    {'selector': '#question_1', 'kind': 'textarea', 'label': 'Why are you interested in Acme?'},
+    {'selector': '[name="sponsor"]', 'kind': 'radio', 'label': 'Will you require sponsorship?', 'options': ['Yes']},
+    {'selector': '[name="sponsor"]', 'kind': 'radio', 'label': 'Will you require sponsorship?', 'options': ['No']},
+]
+APPLICANT = {'profile': {'personal_info': {'first_name': 'Ada', 'last_name': 'Lovelace', 'email': 'ada@example.com'}},
+             'resume': {'path': '/tmp/resume.pdf'}}
+
+
+@pytest.fixture
+def templates():
+    return load_templates()
+
+
+@pytest.fixture
+def fields():
+    return fields_from_probe(PROBED)
+
+
+def test_radio_group_collapses_into_one_field(fields):
+    assert len(fields) == 6
+    assert fields[-1].options == ('Yes', 'No')
+
+
+def test_second_visit_is_served_from_cache(storage, templates, fields):
+    cache = FormSchemaCache(storage, QAMatcher(templates))
+    first = cache.fill('Greenhouse', 'Acme', fields, APPLICANT)
+    second = cache.fill('greenhouse', ' ACME ', fields, APPLICANT)
+
+    assert (first.cached, second.cached) == (False, True)
+    assert [v['selector'] for v in first.values] == [v['selector'] for v in second.values]
+    assert first.uploads == second.uploads == [{'selector': '[name="resume"]', 'path': '/tmp/resume.pdf'}]
+    assert {v['selector']: v['value'] for v in second.values}['[name="email"]'] == 'ada@example.com'
+    assert cache.stats == {'misses': 1, 'hits': 1}
+
+
+def test_changed_form_misses(storage, templates, fields):
+    cache = FormSchemaCache(storage, QAMatcher(templates))
+    cache.plan('greenhouse', 'acme', fields)
+    changed = fields[:-1] + [fields[-1]._replace(label='Do you now or in future need sponsorship?')]
+
+    assert cache.plan('greenhouse', 'acme', changed)[1] is False
+
+
+def test_new_qa_templates_replan(storage, templates, fields):
+    FormSchemaCache(storage, QAMatcher(templates)).plan('greenhouse', 'acme', fields)
+    extra = QATemplate('sponsorship', 'logistics', ['sponsorship'], 'No', [])
+    cache = FormSchemaCache(storage, QAMatcher(templates + [extra]))
+    plan, cached = cache.plan('greenhouse', 'acme', fields)
+
+    assert not cached
+    assert plan['[name="sponsor"]'] == {'source': QA, 'template': 'sponsorship'}
+    assert cache.stats == {'replanned': 1}
+
+
+def test_old_forms_are_pruned(storage, templates, fields):
+    cache = FormSchemaCache(storage, QAMatcher(templates))
+    for n in range(MAX_FORMS_PER_COMPANY + 2):
+        cache.plan('greenhouse', 'acme', fields + [FormField(f'#extra_{n}', 'text', f'Extra {n}')])
+
+    assert len(cache.known_forms('greenhouse', 'acme')) == MAX_FORMS_PER_COMPANY
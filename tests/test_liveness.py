@@ -0,0 +1,115 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from jobpilot.apply import BaseApplier
+from jobpilot.liveness import CLOSED, DROPPED_STATES, OPEN, REDIRECTED, UNKNOWN, LivenessChecker
+from jobpilot.platforms import PlatformResolver
+
+# path -> (status, headers, body, expected state)
+ROUTES = {
+    '/jobs/open-1': (200, {'ETag': '"v1"'}, b"<h1>Backend Engineer</h1><button>Apply</button>", OPEN),
+    '/jobs/closed-banner-2': (200, {}, b"<div>This job is no longer accepting applications</div>", CLOSED),
+    '/jobs/gone-3': (404, {}, b"not found", CLOSED),
+    '/jobs/moved-4': (301, {'Location': '/careers'}, b"", REDIRECTED),
+    '/jobs/renamed-5': (302, {'Location': '/jobs/renamed-5/'}, b"", OPEN),
+    '/jobs/renamed-5/': (200, {}, b"<h1>Data Engineer</h1>", None),
+    '/jobs/busy-6': (503, {}, b"try later", UNKNOWN),
+    '/careers': (200, {}, b"<h1>All openings</h1>", None),
+}
+EXPECTED = {path: route[3] for path, route in ROUTES.items() if route[3] is not None}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    seen = []
+
+    def do_GET(self):
+        self.seen.append((self.command, self.path, self.headers.get('If-None-Match')))
+        status, headers, body, _ = ROUTES.get(self.path, (404, {}, b"", None))
+        if headers.get('ETag') and self.headers.get('If-None-Match') == headers['ETag']:
+            status, body = 304, b""
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+
+    do_HEAD = do_GET
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def base_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def checker(storage):
+    checker = LivenessChecker(storage)
+    yield checker
+    checker.close()
+
+
+def test_classifies_stub_postings(checker, base_url):
+    results = checker.check(base_url + path for path in EXPECTED)
+    assert {url[len(base_url):]: result.state for url, result in results.items()} == EXPECTED
+
+
+def test_filter_open_drops_closed_and_redirected(checker, base_url):
+    jobs = [{'url': base_url + path} for path in EXPECTED]
+    kept, dropped = checker.filter_open(jobs)
+    assert {job['url'][len(base_url):] for job in dropped} == {
+        path for path, state in EXPECTED.items() if state in DROPPED_STATES}
+    assert len(kept) + len(dropped) == len(jobs)
+
+
+def test_fresh_results_come_from_cache_except_unknown(checker, base_url):
+    urls = [base_url + path for path in EXPECTED]
+    checker.check(urls)
+    again = checker.check(urls)
+    assert {url: result.cached for url, result in again.items()} == {
+        url: EXPECTED[url[len(base_url):]] != UNKNOWN for url in urls}
+
+
+def test_refresh_revalidates_with_etag(checker, base_url):
+    url = base_url + '/jobs/open-1'
+    checker.check([url])
+    StubHandler.seen.clear()
+    result = checker.check([url], refresh=True)[url]
+    assert StubHandler.seen[0][2] == '"v1"'
+    assert result.state == OPEN and result.http_status == 304
+
+
+def test_linkedin_jobs_are_checked_at_their_cached_apply_url(storage, base_url):
+    resolver = PlatformResolver(storage)
+    closed = 'https://www.linkedin.com/jobs/view/backend-engineer-4021'
+    unresolved = 'https://www.linkedin.com/jobs/view/4022'
+    resolver.record(closed, base_url + '/jobs/gone-3')
+
+    checker = LivenessChecker(storage, resolver=PlatformResolver(storage))
+    try:
+        kept, dropped = checker.filter_open([{'url': closed}, {'url': unresolved}])
+    finally:
+        checker.close()
+    assert [job['url'] for job in dropped] == [closed]
+    assert [job['url'] for job in kept] == [unresolved]
+    assert not checker.pool._idle
+
+
+def test_runner_teardown_closes_the_preflight_pool(storage, base_url):
+    applier = BaseApplier(db_path=storage.db_path)
+    applier.liveness.check([base_url + '/jobs/open-1'], refresh=True)
+    assert applier.liveness.pool._idle
+
+    applier.close()
+    assert not applier.liveness.pool._idle
@@ -0,0 +1,43 @@
+import random
+
+import pytest
+
+from jobpilot.pacing import CAPTCHA, CLOSED, ERROR, LOGIN_CHALLENGE, OK, RATE_LIMITED, PacingController, classify
+from jobpilot.scheduler import PlatformPolicy
+
+
+@pytest.mark.parametrize("error, outcome", [
+    ("RuntimeError: HTTP 429 Too Many Requests", RATE_LIMITED),
+    ("status code: 429", RATE_LIMITED),
+    ("You are being rate limited, slow down", RATE_LIMITED),
+    ("captcha challenge on submit", CAPTCHA),
+    ("hCaptcha shown after Apply", CAPTCHA),
+    ("Please verify you are human", CAPTCHA),
+    ("Redirected to https://www.linkedin.com/checkpoint/challenge/AgF3", LOGIN_CHALLENGE),
+    ("Please sign in to continue", LOGIN_CHALLENGE),
+    ("Enter the verification code we sent", LOGIN_CHALLENGE),
+    ("HTTP 401 Unauthorized", LOGIN_CHALLENGE),
+    ("HTTP 410: posting closed", CLOSED),
+    # Digits and words inside URLs, titles and page text are not signals
+    ("Timeout loading https://boards.greenhouse.io/acme/jobs/4291429", ERROR),
+    ("Element not found on https://jobs.lever.co/acme/x?redirect=sign-in&next=/checkpoint", ERROR),
+    ("No Apply button for 'Checkpoint Engineer, Security Products'", ERROR),
+    ("Form field 'Where did you log in from?' not found", ERROR),
+    ("Connection reset after 4290 ms", ERROR),
+    (None, ERROR),
+])
+def test_classify(error, outcome):
+    assert classify(error) == outcome
+
+
+def test_throttle_signal_backs_off_and_clean_runs_recover(storage):
+    pacer = PacingController(storage, daily_limit=0, policies={'A': PlatformPolicy(min_interval=10)},
+                             rng=random.Random(1))
+    assert pacer.record('A', ERROR) is None
+    backoff = pacer.record('A', RATE_LIMITED)
+    assert 0 < backoff
+    interval = storage.fetch_all("SELECT min_interval FROM platform_pacing WHERE platform = 'A'")[0]['min_interval']
+    assert interval == 20
+    for _ in range(5):
+        pacer.record('A', OK)
+    assert storage.fetch_all("SELECT min_interval FROM platform_pacing")[0]['min_interval'] < interval
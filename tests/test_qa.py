@@ -0,0 +1,45 @@
+import re
+
+from jobpilot.qa import QAMatcher, QATemplate, load_templates
+
+TEMPLATES = [
+    QATemplate('salary', 'comp', [r"salary expectation", r"desired (salary|compensation)"], "{salary}", []),
+    QATemplate('why', 'motivation', [r"why .* interested"], "I like {company}", []),
+    QATemplate('sponsor', 'legal', [r"sponsorship"], "No", []),
+]
+
+
+def test_first_template_in_file_order_wins():
+    matcher = QAMatcher(TEMPLATES)
+    assert matcher.match("Why are you interested? Will you need sponsorship?").id == 'why'
+    assert matcher.match("What is your desired compensation?").id == 'salary'
+    assert matcher.match("What is your favorite color?") is None
+
+
+def test_index_narrows_candidates():
+    matcher = QAMatcher(TEMPLATES)
+    # 'salary' has an unanchorable pattern, so it is a candidate for everything; 'why' needs 'interested'
+    assert matcher._candidates("will you require sponsorship") == [0, 2]
+    assert matcher._candidates("why are you interested") == [0, 1]
+
+
+def test_index_agrees_with_a_plain_scan():
+    templates = load_templates()
+    matcher = QAMatcher(templates)
+    questions = ["Why are you interested in working at Acme?", "Are you authorized to work in the US?",
+                 "What are your salary expectations?", "Do you require visa sponsorship?",
+                 "Years of experience with Python", "Favorite color", "Tell us about yourself"]
+    for question in questions:
+        expected = next((t.id for t in templates
+                         if any(re.search(p, question, re.IGNORECASE) for p in t.question_patterns)), None)
+        found = matcher.match(question)
+        assert (found.id if found else None) == expected, question
+
+
+def test_usage_is_counted_outside_qa_templates(storage):
+    with QAMatcher(TEMPLATES, storage=storage) as matcher:
+        matcher.answer("Why are you interested in us?", company="Acme")
+        matcher.answer("Why are you interested in them?", company="Globex")
+    assert storage.fetch_all("SELECT template_id, usage_count FROM qa_template_usage") == [
+        {'template_id': 'why', 'usage_count': 2}]
+    assert storage.fetch_all("SELECT * FROM qa_templates") == []
@@ -0,0 +1,45 @@
+import json
+import sys
+
+from jobpilot.resumes import ResumeCache
+
+
+def write_profile(directory, name):
+    directory.mkdir(parents=True, exist_ok=True)
+    (directory / "profile.json").write_text(json.dumps({'personal': {'first_name': name}}))
+    return directory
+
+
+def test_applicant_uses_configured_profile_dir(tmp_path, storage):
+    alice = write_profile(tmp_path / "alice", "Alice")
+    bob = write_profile(tmp_path / "bob", "Bob")
+    cache = ResumeCache(tmp_path / "cache", config_dir=alice)
+    assert cache.applicant(storage)['profile']['personal']['first_name'] == "Alice"
+    assert cache.applicant(storage, config_dir=bob)['profile']['personal']['first_name'] == "Bob"
+
+
+def test_cached_entry_is_parsed_once(tmp_path, monkeypatch):
+    resume = tmp_path / "resume.pdf"
+    resume.write_bytes(b"%PDF fake")
+    calls = []
+    monkeypatch.setattr("jobpilot.resumes.extract_pdf_text",
+                        lambda path: calls.append(path) or "Skills\nPython, Go\nEducation\nBSc")
+    first = ResumeCache(tmp_path / "cache").get(resume)
+    # A second cache (another worker) reads the entry the first one wrote
+    second = ResumeCache(tmp_path / "cache").get(resume)
+    assert first == second
+    assert first['skills'] == ["Python", "Go"]
+    assert len(calls) == 1
+
+
+def test_applicant_without_pdf_parser_falls_back_to_profile(tmp_path, storage, monkeypatch):
+    monkeypatch.setitem(sys.modules, "pypdf", None)
+    resume = tmp_path / "resume.pdf"
+    resume.write_bytes(b"%PDF fake")
+    storage.execute("INSERT INTO resumes (id, name, file_path, skills, is_default, created_at) VALUES (?, ?, ?, ?, 1, 0)",
+                    ("r1", "Main", str(resume), json.dumps(["Python"])))
+    cache = ResumeCache(tmp_path / "cache", config_dir=write_profile(tmp_path / "alice", "Alice"))
+    applicant = cache.applicant(storage)
+    assert applicant['profile']['personal']['first_name'] == "Alice"
+    assert applicant['resume'] == {'id': "r1", 'name': "Main", 'path': str(resume)}
+    assert applicant['skills'] == ["Python"]
@@ -0,0 +1,38 @@
+import random
+
+import pytest
+
+from jobpilot.retry import NEEDS_HUMAN, PERMANENT, RATE_LIMITED, TRANSIENT, classify_failure, retry_delay
+
+
+@pytest.mark.parametrize("error, failure_class", [
+    ("RuntimeError: HTTP 410: posting closed", PERMANENT),
+    ("HTTP 404 on https://boards.greenhouse.io/acme/jobs/4921410008", PERMANENT),
+    ("404 Not Found", PERMANENT),
+    ("This job is no longer accepting applications", PERMANENT),
+    ("The job posting has expired", PERMANENT),
+    ("Position has been filled", PERMANENT),
+    ("You have already applied to this job", PERMANENT),
+    ("HTTP 429 Too Many Requests", RATE_LIMITED),
+    ("captcha challenge on submit", NEEDS_HUMAN),
+    ("HTTP 503 Service Unavailable", TRANSIENT),
+    # Job IDs and slugs inside URLs are not status codes or closed-posting phrases
+    ("Timeout loading https://boards.greenhouse.io/acme/jobs/4921410008", TRANSIENT),
+    ("Navigation failed: https://jobs.lever.co/acme/404-brand-designer", TRANSIENT),
+    ("Element not found on https://jobs.ashbyhq.com/acme/posting-closed-loop-engineer", TRANSIENT),
+    ("Connection reset; expired token", TRANSIENT),
+    ("Session cookie expired, re-opening the browser", TRANSIENT),
+    ("Submit button not found", TRANSIENT),
+    ("Retried 410 times", TRANSIENT),
+    (None, TRANSIENT),
+])
+def test_classify_failure(error, failure_class):
+    assert classify_failure(error) == failure_class
+
+
+def test_retry_delay_grows_then_gives_up():
+    rng = random.Random(7)
+    delays = [retry_delay(TRANSIENT, attempts, rng) for attempts in (1, 2, 3)]
+    assert delays[0] < delays[2]
+    assert retry_delay(TRANSIENT, 4, rng) is None
+    assert retry_delay(PERMANENT, 1, rng) is None
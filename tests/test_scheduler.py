@@ -0,0 +1,77 @@
+import threading
+
+import pytest
+
+from jobpilot.scheduler import ApplyScheduler, FakeClock, InlineExecutor, PlatformPolicy, TokenBucket
+
+
+def make_jobs(*platforms, tenant=None):
+    return [{'id': f"{platform}-{i}", 'url': platform, **({'profile': tenant} if tenant else {})}
+            for i, platform in enumerate(platforms)]
+
+
+def scheduler(policies, clock, **kwargs):
+    return ApplyScheduler(lambda job, index, total: True, lambda url: url, max_concurrency=4,
+                          policies=policies, clock=clock, executor=InlineExecutor(), **kwargs)
+
+
+def starts(sched, platform=None):
+    return [at for _, p, at in sched.dispatch_log if platform in (None, p)]
+
+
+def test_burst_then_min_interval():
+    clock = FakeClock()
+    sched = scheduler({'A': PlatformPolicy(min_interval=10, burst=3, max_in_flight=4, cooldown_every=0)}, clock)
+    assert sched.run(make_jobs(*'AAAAA')) == [True] * 5
+    assert starts(sched) == pytest.approx([0, 0, 0, 10, 20])
+
+
+def test_refill_caps_at_capacity():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=0.5, capacity=2, clock=clock)
+    bucket.consume(0)
+    bucket.consume(0)
+    assert bucket.time_until_ready(0) == 2.0
+    assert bucket.time_until_ready(1) == 1.0
+    assert bucket.time_until_ready(100) == 0.0
+    assert bucket.tokens == 2
+
+
+def test_cooldown_after_every_n_starts():
+    clock = FakeClock()
+    policy = PlatformPolicy(min_interval=1, max_in_flight=4, cooldown_every=2, cooldown_seconds=30)
+    sched = scheduler({'A': policy}, clock)
+    sched.run(make_jobs(*'AAAA'))
+    assert starts(sched) == pytest.approx([0, 1, 31, 32])
+
+
+def test_platforms_are_paced_independently():
+    clock = FakeClock()
+    policies = {'slow': PlatformPolicy(min_interval=30, max_in_flight=4, cooldown_every=0),
+                'fast': PlatformPolicy(min_interval=5, max_in_flight=4, cooldown_every=0)}
+    sched = scheduler(policies, clock)
+    sched.run(make_jobs('slow', 'slow', 'fast', 'fast', 'fast'))
+    assert starts(sched, 'slow') == pytest.approx([0, 30])
+    assert starts(sched, 'fast') == pytest.approx([0, 5, 10])
+
+
+def test_tenants_share_a_platform_by_weight():
+    clock = FakeClock()
+    sched = scheduler({'A': PlatformPolicy(min_interval=1, max_in_flight=4, cooldown_every=0)}, clock,
+                      tenant_fn=lambda job: job['profile'], weights={'alice': 2, 'bob': 1})
+    jobs = make_jobs(*'AAAAAA', tenant='alice') + make_jobs(*'AAA', tenant='bob')
+    for job in jobs:
+        job['id'] = f"{job['profile']}-{job['id']}"
+    sched.run(jobs)
+    order = [job_id.split('-')[0] for job_id, _, _ in sched.dispatch_log]
+    assert order == ['alice', 'bob', 'alice'] * 3
+
+
+def test_rounding_at_large_clock_values_does_not_hang():
+    clock = FakeClock(start=1000.0)
+    sched = scheduler({'A': PlatformPolicy(min_interval=0.3, max_in_flight=4, cooldown_every=0)}, clock)
+    runner = threading.Thread(target=sched.run, args=(make_jobs(*'A' * 200),), daemon=True)
+    runner.start()
+    runner.join(timeout=10)
+    assert not runner.is_alive()
+    assert len(sched.dispatch_log) == 200
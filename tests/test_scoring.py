@@ -0,0 +1,35 @@
+from jobpilot.scoring import MatchScorer
+
+PREFERENCES = {
+    'job_search': {'titles': ["Software Engineer"], 'keywords': ["backend"], 'locations': ["Remote"]},
+    'filters': {'exclude_keywords': ["intern", "Staff"]},
+}
+
+
+def job(title, description=""):
+    return {'title': title, 'description': description, 'location': 'Remote', 'location_type': 'remote',
+            'salary_min': None, 'salary_max': None}
+
+
+def scores(*titles):
+    scorer = MatchScorer({}, PREFERENCES)
+    return dict(zip(titles, scorer.score([job(t) for t in titles], doc_freq={}, n_docs=1).tolist()))
+
+
+def test_exclude_keywords_match_whole_tokens():
+    result = scores("Senior Software Engineer", "Senior Software Engineer, Internal Tools",
+                    "Software Engineer, International Payments", "Software Engineering Intern",
+                    "Staff Software Engineer", "Software Engineer (Staffing Platform)")
+
+    assert result["Senior Software Engineer, Internal Tools"] > 60
+    assert result["Software Engineer, International Payments"] > 60
+    assert result["Software Engineer (Staffing Platform)"] > 60
+    assert result["Software Engineering Intern"] == 0.0
+    assert result["Staff Software Engineer"] == 0.0
+
+
+def test_title_and_keyword_hits_match_whole_tokens():
+    result = scores("Software Engineer II", "Backend Developer", "Backendless Developer", "Frontend Developer")
+
+    assert result["Software Engineer II"] > result["Backend Developer"] > result["Backendless Developer"]
+    assert result["Backendless Developer"] == result["Frontend Developer"]
@@ -0,0 +1,48 @@
+import pytest
+
+from jobpilot.screenshots import ScreenshotSink
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 64
+
+
+def raw_sink(directory):
+    sink = ScreenshotSink(directory)
+    sink.image_format = None  # store captures as-is, with or without Pillow
+    return sink
+
+
+def test_path_is_reported_only_after_the_write(tmp_path):
+    sink = raw_sink(tmp_path)
+    first, again = [], []
+    path = sink.submit(PNG, first.append)
+    sink.submit(PNG, again.append)  # queued or already written: same file, same callback
+    sink.close()
+    assert first == again == [path]
+    assert (tmp_path / path.rsplit("/", 1)[-1]).exists()
+    assert sink.stats.stored == 1 and sink.stats.deduplicated == 1
+
+
+def test_failed_write_never_records_a_path(tmp_path, monkeypatch):
+    sink = raw_sink(tmp_path)
+
+    def fail(path, data):
+        raise OSError("disk full")
+
+    with monkeypatch.context() as patch:
+        patch.setattr("jobpilot.screenshots._write_atomic", fail)
+        recorded = []
+        sink.submit(PNG, recorded.append)
+        sink.drain()
+    assert recorded == []
+    assert sink.stats.failed == 1
+    # Not remembered as stored, so the next capture of it is written
+    sink.submit(PNG, recorded.append)
+    sink.close()
+    assert len(recorded) == 1 and sink.stats.stored == 1
+
+
+def test_submit_after_close_fails(tmp_path):
+    sink = raw_sink(tmp_path)
+    sink.close()
+    with pytest.raises(RuntimeError):
+        sink.submit(PNG)
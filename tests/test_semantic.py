@@ -0,0 +1,55 @@
+import pytest
+
+from jobpilot.forms import MANUAL, QA, FormField, plan_form
+from jobpilot.qa import QAMatcher, QATemplate
+from jobpilot.semantic import MATCH_THRESHOLD, SemanticIndex
+
+TEMPLATES = [
+    QATemplate('why_company', 'motivation', ["why .* interested", "why do you want to work"], "", []),
+    QATemplate('salary', 'compensation', ["salary", "compensation", "pay expectation"], "{salary}", []),
+    QATemplate('availability', 'logistics', ["start date", "when can you", "notice period"], "", []),
+]
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = SemanticIndex(tmp_path)
+    index.ensure(TEMPLATES)
+    return index
+
+
+def test_ensure_rebuilds_only_when_templates_change(tmp_path, index):
+    assert not SemanticIndex(tmp_path).ensure(TEMPLATES)
+    changed = TEMPLATES + [QATemplate('visa', 'legal', ["visa sponsorship"], "No", [])]
+    assert SemanticIndex(tmp_path).ensure(changed)
+    assert SemanticIndex(tmp_path).search(["Will you need visa sponsorship?"], k=1)[0][0].template_id == 'visa'
+
+
+def test_search_ranks_the_paraphrased_template_first(index):
+    results = index.search(["Expected pay?", "When could you begin?"], k=3)
+
+    assert [matches[0].template_id for matches in results] == ['salary', 'availability']
+    for matches in results:
+        assert len({m.template_id for m in matches}) == len(matches)
+        assert [m.score for m in matches] == sorted((m.score for m in matches), reverse=True)
+
+
+def test_best_matches_cuts_off_below_the_threshold(index):
+    best = index.best_matches(["Expected pay?", "Favorite color"])
+
+    assert best[0].template_id == 'salary' and best[0].score > MATCH_THRESHOLD
+    assert best[1] is None
+    assert index.best_matches(["Favorite color"], threshold=-1.0)[0] is not None
+
+
+def test_matcher_falls_back_to_semantic_when_regex_misses(tmp_path):
+    assert QAMatcher(TEMPLATES).match("Expected pay?") is None
+
+    matcher = QAMatcher(TEMPLATES, semantic=SemanticIndex(tmp_path))
+    assert matcher.match("Expected pay?").id == 'salary'
+    assert matcher.match("Why are you interested in Acme?").id == 'why_company'
+    assert matcher.match("Favorite color") is None
+
+    plan = plan_form([FormField('#q1', 'text', 'Expected pay?'), FormField('#q2', 'text', 'Favorite color')],
+                     matcher)
+    assert plan == {'#q1': {'source': QA, 'template': 'salary'}, '#q2': {'source': MANUAL}}
@@ -0,0 +1,68 @@
+from contextlib import redirect_stdout
+from io import StringIO
+
+import pytest
+
+from jobpilot.retry import classify_failure
+from jobpilot.simulator import (APPLIED, EXPECTED_CLASS, FakeATS, HttpBrowserSession, SimulatorConfig,
+                                _load_test_applier, build_database, check_outcomes, posting_path)
+
+NO_FAULTS = dict(latency=0, error_rate=0, rate_limit_rate=0, captcha_rate=0, closed_rate=0)
+
+
+@pytest.fixture
+def session():
+    session = HttpBrowserSession(timeout=5)
+    session.open()
+    yield session
+    session.close()
+
+
+@pytest.mark.parametrize("faults, outcome", [
+    ({'closed_rate': 1.0}, 'closed'),
+    ({'rate_limit_rate': 1.0}, 'rate_limited'),
+    ({'captcha_rate': 1.0}, 'captcha'),
+    ({'error_rate': 1.0}, 'error'),
+])
+def test_each_fault_maps_to_its_failure_class(session, faults, outcome):
+    with FakeATS(SimulatorConfig(**{**NO_FAULTS, **faults})) as simulator:
+        job = {'id': 'sim_1', 'company': 'Acme', 'title': 'Backend Engineer',
+               'url': simulator.base_url + posting_path(1_000_001, 'greenhouse', 'Acme')}
+        with pytest.raises(RuntimeError) as raised:
+            session.apply(job)
+
+    assert simulator.outcomes['sim_1'] == outcome
+    # Worker errors reach the journal as "<ExceptionType>: <message>"
+    assert classify_failure(f"RuntimeError: {raised.value}") == EXPECTED_CLASS[outcome]
+
+
+def test_linkedin_posting_without_faults_is_submitted(session):
+    with FakeATS(SimulatorConfig(**NO_FAULTS)) as simulator:
+        job = {'id': 'sim_2', 'company': 'Globex', 'title': 'Platform Engineer',
+               'url': simulator.base_url + posting_path(1_000_002, 'linkedin', 'Globex')}
+        result = session.apply(job)
+
+    assert simulator.outcomes['sim_2'] == APPLIED
+    assert result['apply_url'].startswith(simulator.base_url)
+    assert set(result['timings']) == {'navigate', 'form_fill', 'submit'}
+
+
+def test_runner_journals_the_expected_class_for_every_job(tmp_path):
+    # One worker keeps the simulator's fault rolls in a fixed order
+    config = SimulatorConfig(latency=0, error_rate=0.15, rate_limit_rate=0.15, captcha_rate=0.5, closed_rate=0, seed=3)
+    with FakeATS(config) as simulator:
+        db_path = build_database(tmp_path / "loadtest.db", simulator.base_url, jobs=24)
+        applier = _load_test_applier(db_path, concurrency=1, interval=0.001, time_scale=0.0)
+        with redirect_stdout(StringIO()):
+            applier.run(limit=None)
+        applier.storage.flush()
+        results, mismatches = check_outcomes(applier.storage, simulator.outcomes)
+
+    assert mismatches == []
+    assert results['correct'] == 24
+    failure_classes = {row['failure_class'] for row in applier.storage.fetch_all(
+        "SELECT failure_class FROM run_journal WHERE failure_class IS NOT NULL")}
+    assert failure_classes == {EXPECTED_CLASS['rate_limited'], EXPECTED_CLASS['captcha'], EXPECTED_CLASS['error']}
+    # The worker's HTTP submit and the runner's status write are timed as separate stages
+    stages = applier.metrics.snapshot()['stages']
+    assert stages['submit']['count'] == stages['db_finish']['count'] == len(applier.applied) > 0
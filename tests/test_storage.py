@@ -0,0 +1,25 @@
+import signal
+import subprocess
+import sys
+
+from jobpilot import storage
+
+
+def test_import_leaves_sigterm_alone():
+    code = "import signal, jobpilot.storage; print(signal.getsignal(signal.SIGTERM) == signal.SIG_DFL)"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "True"
+
+
+def test_install_sigterm_handler_keeps_existing_handler():
+    previous = signal.getsignal(signal.SIGTERM)
+    custom = lambda signum, frame: None
+    signal.signal(signal.SIGTERM, custom)
+    try:
+        storage.install_sigterm_handler()
+        assert signal.getsignal(signal.SIGTERM) is custom
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        storage.install_sigterm_handler()
+        assert signal.getsignal(signal.SIGTERM) is storage._handle_sigterm
+    finally:
+        signal.signal(signal.SIGTERM, previous)
@@ -0,0 +1,49 @@
+import json
+import shutil
+
+import pytest
+
+from jobpilot.bench import generate_database
+from jobpilot.config import CONFIG_DIR
+from jobpilot.pacing import RATE_LIMITED
+from jobpilot.storage import close_all
+from jobpilot.tenants import MultiProfileRunner
+
+
+@pytest.fixture
+def profiles(tmp_path):
+    specs = []
+    for name, weight in (("alice", 2), ("bob", 1)):
+        config_dir = tmp_path / name
+        shutil.copytree(CONFIG_DIR, config_dir)
+        preferences = json.loads((config_dir / "preferences.json").read_text())
+        preferences['application']['save_screenshots'] = False
+        (config_dir / "preferences.json").write_text(json.dumps(preferences))
+        specs.append({'name': name, 'config_dir': config_dir, 'weight': weight,
+                      'db_path': generate_database(tmp_path / f"{name}.db", rows=0)})
+    yield specs
+    close_all()
+
+
+def test_each_profile_gets_its_own_fresh_run(profiles, tmp_path):
+    runner = MultiProfileRunner(profiles, shared_db=tmp_path / "shared.db")
+    journals = [tenant.journal for tenant in runner.tenants.values()]
+    assert [journal.run_id for journal in journals] == [f"{runner.run_id}-alice", f"{runner.run_id}-bob"]
+    assert not runner.resumed and not any(journal.resumed for journal in journals)
+
+
+def test_resume_continues_every_profile(profiles, tmp_path):
+    runner = MultiProfileRunner(profiles, run_id="20260101_000000-abc", shared_db=tmp_path / "shared.db")
+    assert all(tenant.journal.resumed for tenant in runner.tenants.values())
+    assert runner.tenants['bob'].journal.run_id == "20260101_000000-abc-bob"
+
+
+def test_shared_pacing_stays_out_of_profile_databases(profiles, tmp_path):
+    runner = MultiProfileRunner(profiles, shared_db=tmp_path / "shared.db")
+    runner.pacer.record('LinkedIn', RATE_LIMITED)
+    runner.resolver.record("https://www.linkedin.com/jobs/view/123", "https://boards.greenhouse.io/acme/jobs/9")
+    assert len(runner.shared.fetch_all("SELECT * FROM platform_pacing")) == 1
+    assert len(runner.shared.fetch_all("SELECT * FROM platform_redirects")) == 1
+    for tenant in runner.tenants.values():
+        assert tenant.storage.fetch_all("SELECT * FROM platform_pacing") == []
+        assert tenant.storage.fetch_all("SELECT * FROM platform_redirects") == []
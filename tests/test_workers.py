@@ -0,0 +1,49 @@
+from functools import partial
+
+import pytest
+
+from jobpilot.bench import generate_database
+from jobpilot.storage import Storage
+from jobpilot.workers import BrowserSession, SimulatedBrowserSession, WorkerPool
+
+
+class NoApply(BrowserSession):
+    def open(self):
+        pass
+
+
+def test_session_without_apply_cannot_be_instantiated():
+    with pytest.raises(TypeError):
+        NoApply()
+
+
+@pytest.mark.parametrize("factory", [NoApply, partial(NoApply)])
+def test_pool_rejects_abstract_session_before_spawning(factory):
+    with pytest.raises(TypeError, match="apply"):
+        WorkerPool(size=1, session_factory=factory)
+
+
+def test_pool_runs_simulated_session():
+    with WorkerPool(size=1, session_factory=SimulatedBrowserSession) as pool:
+        result = pool.apply({'id': 'j1', 'url': 'https://example.com/jobs/1'})
+    assert result['jobs_on_session'] == 1
+
+
+def test_form_cache_is_kept_per_database(tmp_path):
+    first, second = tmp_path / "a" / "first.db", tmp_path / "b" / "second.db"
+    for path in (first, second):
+        path.parent.mkdir()
+        # Migrated by the runner before any job reaches a worker
+        Storage(generate_database(path, rows=0)).close()
+    session = SimulatedBrowserSession()
+    cache = session.form_cache({'form_db': str(first)})
+
+    assert session.form_cache({'form_db': str(first)}) is cache
+    other = session.form_cache({'form_db': str(second)})
+    assert other.storage.db_path == second
+    # Q&A answers given while filling are counted in that database when the worker stops
+    template = other.matcher.templates[0]
+    assert other.matcher.answer(template.question_patterns[0]) is not None
+    session.close_form_caches()
+    assert other.storage.fetch_all("SELECT usage_count FROM qa_template_usage WHERE template_id = ?",
+                                   (template.id,)) == [{'usage_count': 1}]